@@ -0,0 +1,396 @@
+#!/usr/bin/env python3
+"""
+Headless batch mode for the cover letter generator.
+
+Streams job posting URLs from a list (text or CSV), an RSS/Atom feed or a
+sitemap (local file, URL or stdin), generates the letters with worker
+processes, and writes one JSON record per job (url, language, title,
+path, timings, tokens, error). With --journal, progress is checkpointed and
+an interrupted run can be continued with --resume. With --manifest, letters
+whose CV, posting, model and prompt are unchanged since the last run are
+skipped; --watch keeps running and regenerates what changed whenever the URL
+list or the CV is edited (and every --refresh seconds, for edited postings).
+With --batch, the prompts are submitted as one offline batch to the
+provider's batch API (no per-minute rate limits, discounted tokens), which
+is polled until the letters are ready.
+Exits with status 1 when any job failed, so it can run under cron or a
+scheduler.
+
+Usage:
+    python app/cli.py --input urls.txt --output results.jsonl --processes 4
+    cat urls.txt | python app/cli.py --cv cv.pdf --llm-concurrency 2 > results.jsonl
+    python app/cli.py --input urls.txt --journal nightly.journal --resume
+    python app/cli.py --input urls.txt --cv cv.pdf --manifest letters.json --watch
+    python app/cli.py --input urls.txt --cv data.pdf --cv backend.pdf --cv management.pdf
+    python app/cli.py --input https://example.com/sitemap.xml --match "/jobs/" --processes 4
+    python app/cli.py --input urls.txt --batch batches/nightly --batch-poll 60
+"""
+
+import argparse
+import contextlib
+import json
+import os
+import sys
+import time
+from pathlib import Path
+from concurrent.futures import FIRST_COMPLETED, ProcessPoolExecutor, wait
+from concurrent.futures.process import BrokenProcessPool
+from functools import partial
+from itertools import chain, islice
+from typing import Callable, Iterable, List, Optional, TextIO, Tuple
+from config import DESTINATION_PATH, MAX_WORKERS, LLM_CONCURRENCY, MODEL, PROMPT_VARIANT, RESULTS_DB_PATH, \
+    BATCH_POLL_INTERVAL
+from schema.event_schema import EventType, GenerationEvent
+
+# Event elapsed times reported in the `timings` of a record
+TIMED_EVENTS = {
+    EventType.SCRAPE_DONE: "scrape",
+    EventType.LANGUAGE_DETECTED: "language",
+    EventType.LLM_FINISHED: "llm",
+    EventType.FILE_WRITTEN: "render",
+    EventType.JOB_DONE: "total",
+    EventType.JOB_FAILED: "total",
+}
+
+
+class JobRecorder:
+    """
+    Generator event callback building one record per job.
+
+    Records are handed to `sink` as soon as their job is done or failed.
+    """
+
+    def __init__(self, sink: Callable[[dict], None]):
+        self.sink = sink
+        self._records = {}
+
+    def __call__(self, event: GenerationEvent) -> None:
+        if event.job_index is None:
+            return
+        record = self._records.setdefault(event.job_index, {
+            "url": event.url,
+            "language": None,
+            "title": None,
+            "path": None,
+            "timings": {},
+            "tokens": None,
+            "profile": None,
+            "quality": None,
+            "error": None,
+            "skipped": False,
+        })
+        stage = TIMED_EVENTS.get(event.type)
+        if stage:
+            record["timings"][stage] = round(event.elapsed, 4)
+        if event.type == EventType.CV_SELECTED:
+            record["profile"] = event.data.get("profile")
+        elif event.type == EventType.LANGUAGE_DETECTED:
+            record["language"] = event.data.get("language")
+        elif event.type == EventType.LLM_FINISHED:
+            record["title"] = event.data.get("title")
+            record["tokens"] = event.data.get("usage")
+            if "issues" in event.data:
+                record["quality"] = {key: event.data[key] for key in ("repairs", "retries", "issues")}
+        elif event.type == EventType.FILE_WRITTEN:
+            record["path"] = event.data.get("path")
+        elif event.type == EventType.JOB_SKIPPED:
+            record.update(title=event.data.get("title"), path=event.data.get("path"), skipped=True)
+            self.sink(self._records.pop(event.job_index))
+        elif event.type in (EventType.JOB_DONE, EventType.JOB_FAILED):
+            if event.type == EventType.JOB_FAILED:
+                record["error"] = event.data.get("error")
+            self.sink(self._records.pop(event.job_index))
+
+
+def run_urls(urls: Iterable[str], options: dict, sink: Callable[[dict], None]) -> None:
+    """
+    Generate the letters of `urls` in this process, passing each job record to `sink`.
+
+    Args:
+        urls: Job posting URLs
+        options: Generator settings (see `build_options`)
+        sink: Called with each job record as soon as it is complete
+    """
+    from generator.generator import Generator
+    from tools.checkpoint import CheckpointJournal
+    from tools.manifest import LetterManifest
+    from tools.results_db import ResultsDB
+
+    # Worker processes append to the same journal; each group is one O_APPEND write
+    journal = CheckpointJournal(options["journal"]) if options["journal"] else None
+    # ...and merge their entries into the same manifest when saving it
+    manifest = LetterManifest(options["manifest"]) if options["manifest"] else None
+    results_db = ResultsDB(options["results_db"]) if options["results_db"] else None
+    cv_profiles = None
+    if options["profiles"]:
+        from utils.cv_profiles import CVProfiles
+        cv_profiles = CVProfiles(options["profiles"])
+    if options["batch"]:
+        from generator.batch import BatchGenerator
+        generator_class = partial(BatchGenerator, batch_dir=options["batch"], poll_interval=options["batch_poll"])
+    else:
+        generator_class = Generator
+    generator = generator_class(
+        urls,
+        cv_content=options["cv"],
+        cv_profiles=cv_profiles,
+        destination_path=options["destination"],
+        model_name=options["model"],
+        prompt_variant=options["prompt"],
+        save_files=options["save"],
+        max_workers=options["workers"],
+        stage_limits=options["stage_limits"],
+        on_event=JobRecorder(sink),
+        checkpoint=journal,
+        resume=options["resume"],
+        manifest=manifest,
+        results_db=results_db
+    )
+    try:
+        for _ in generator.iter_run():
+            pass
+    finally:
+        if journal is not None:
+            journal.close()
+        if results_db is not None:
+            results_db.close()
+
+
+def run_chunk(urls: List[str], options: dict) -> List[dict]:
+    """Worker process entry point: generate a chunk of URLs and return its records."""
+    records = []
+    # Progress output goes to stderr, so stdout stays clean JSONL
+    with contextlib.redirect_stdout(sys.stderr):
+        run_urls(urls, options, records.append)
+    return records
+
+
+def chunked(items: Iterable[str], size: int) -> Iterable[List[str]]:
+    """Split `items` in consecutive chunks of at most `size` items, reading them lazily."""
+    items = iter(items)
+    while True:
+        chunk = list(islice(items, size))
+        if not chunk:
+            return
+        yield chunk
+
+
+def build_options(args: argparse.Namespace) -> dict:
+    """Picklable Generator settings shared by every worker process."""
+    from config import CV_PATH
+    from tools.file_manager import PdfManager
+
+    # Extracted once here rather than in every worker process
+    cvs = {Path(path).stem: PdfManager(path).run() for path in args.cv or [CV_PATH]}
+    return {
+        "cv": next(iter(cvs.values())) if len(cvs) == 1 else None,
+        "profiles": cvs if len(cvs) > 1 else None,
+        "destination": args.destination,
+        "model": args.model,
+        "prompt": args.prompt,
+        "save": not args.no_save,
+        "workers": args.workers,
+        "journal": args.journal,
+        "resume": args.resume,
+        "manifest": args.manifest,
+        "results_db": args.results_db,
+        "batch": args.batch,
+        "batch_poll": args.batch_poll,
+        "stage_limits": {
+            "scrape": args.scrape_concurrency,
+            "llm": args.llm_concurrency,
+            "render": args.render_concurrency,
+        },
+    }
+
+
+def run(urls: Iterable[str], options: dict, output: TextIO, processes: int, chunk_size: int) -> Tuple[int, int]:
+    """
+    Generate every URL and write the JSONL records to `output` as jobs complete.
+
+    URLs are read as workers free up (at most two chunks per process are queued),
+    so streamed sources are never materialized.
+
+    Returns:
+        tuple[int, int]: Number of succeeded and failed jobs.
+    """
+    counts = {"succeeded": 0, "failed": 0}
+
+    def write(record: dict) -> None:
+        counts["failed" if record["error"] else "succeeded"] += 1
+        output.write(json.dumps(record, ensure_ascii=False) + "\n")
+        output.flush()
+
+    if processes <= 1:
+        with contextlib.redirect_stdout(sys.stderr):
+            run_urls(urls, options, write)
+        return counts["succeeded"], counts["failed"]
+
+    def fail_chunk(chunk: List[str], error: Exception) -> None:
+        # A crashed chunk fails all of its jobs
+        for url in chunk:
+            write({"url": url, "language": None, "title": None, "path": None, "timings": {}, "tokens": None,
+                   "profile": None, "quality": None, "error": f"worker failed: {error}", "skipped": False})
+
+    chunks = chunked(urls, chunk_size)
+    broken = None
+    with ProcessPoolExecutor(max_workers=processes) as pool:
+        futures = {}
+        for chunk in islice(chunks, processes * 2):
+            futures[pool.submit(run_chunk, chunk, options)] = chunk
+        while futures:
+            done, _ = wait(futures, return_when=FIRST_COMPLETED)
+            for future in done:
+                chunk = futures.pop(future)
+                # Collected before submitting more: a dead worker process breaks the pool, and
+                # every chunk still pending then fails with BrokenProcessPool
+                try:
+                    records = future.result()
+                except BrokenProcessPool as e:
+                    broken = e
+                    fail_chunk(chunk, e)
+                    continue
+                except Exception as e:
+                    fail_chunk(chunk, e)
+                    continue
+                for record in records:
+                    write(record)
+                if broken is None:
+                    for next_chunk in islice(chunks, 1):
+                        try:
+                            futures[pool.submit(run_chunk, next_chunk, options)] = next_chunk
+                        except BrokenProcessPool as e:
+                            broken = e
+                            fail_chunk(next_chunk, e)
+    if broken is not None:
+        # Every input URL still gets its record, including those never submitted
+        for chunk in chunks:
+            fail_chunk(chunk, broken)
+        print(f"A worker process died ({broken}); the remaining URLs were not processed", file=sys.stderr)
+    return counts["succeeded"], counts["failed"]
+
+
+def parse_args(argv: Optional[List[str]] = None) -> argparse.Namespace:
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("-i", "--input", default="-",
+                        help="URL list (text or CSV), RSS/Atom feed or sitemap: file, http(s) URL or '-' for stdin")
+    parser.add_argument("--format", choices=("auto", "text", "csv", "xml"), default="auto",
+                        help="Format of --input (guessed from its name and content by default)")
+    parser.add_argument("--column", help="URL column of a CSV input (defaults to a column named url, link...)")
+    parser.add_argument("--match", help="Only keep URLs matching this regular expression (e.g. '/jobs/')")
+    parser.add_argument("-o", "--output", default="-", help="JSONL file receiving one record per job ('-' for stdout)")
+    parser.add_argument("--cv", action="append",
+                        help="CV PDF (defaults to CV_PATH); repeat to pick the best-matching CV for each job")
+    parser.add_argument("--destination", default=DESTINATION_PATH, help="Folder receiving the letters")
+    parser.add_argument("--model", default=MODEL, help="Model used for generation")
+    parser.add_argument("--prompt", choices=("full", "compact"), default=PROMPT_VARIANT,
+                        help="Letter prompt variant (compare them with benchmarks/prompt_compare.py)")
+    parser.add_argument("--no-save", action="store_true", help="Do not render or write the letters")
+    parser.add_argument("--journal", help="Checkpoint journal recording each job's progress")
+    parser.add_argument("--resume", action="store_true",
+                        help="Skip jobs finished according to --journal and reuse partial work of the others")
+    parser.add_argument("--results-db", default=RESULTS_DB_PATH,
+                        help="SQLite history receiving every generated letter ('' to disable)")
+    parser.add_argument("--manifest", help="Manifest of generated letters; skip letters whose inputs are unchanged")
+    parser.add_argument("--watch", action="store_true",
+                        help="Keep running and regenerate what changed (requires --input FILE and --manifest)")
+    parser.add_argument("--poll", type=float, default=5.0, help="Seconds between checks of the input and CV in --watch")
+    parser.add_argument("--refresh", type=float, default=3600.0,
+                        help="Seconds after which --watch re-checks every posting even if nothing was edited")
+    parser.add_argument("--batch", metavar="DIR",
+                        help="Submit the prompts as one offline batch; DIR keeps its request, state and result files "
+                             "(an interrupted run re-attaches to the submitted batch)")
+    parser.add_argument("--batch-poll", type=float, default=BATCH_POLL_INTERVAL,
+                        help="Seconds between status checks of a --batch")
+    parser.add_argument("--processes", type=int, default=1, help="Worker processes")
+    parser.add_argument("--chunk-size", type=int, default=20, help="URLs handed to a worker process at once")
+    parser.add_argument("--workers", type=int, default=MAX_WORKERS, help="Jobs in flight per process")
+    parser.add_argument("--scrape-concurrency", type=int, default=0, help="Concurrent scrapes per process (0: no limit)")
+    parser.add_argument("--llm-concurrency", type=int, default=LLM_CONCURRENCY, help="Concurrent LLM calls per process")
+    parser.add_argument("--render-concurrency", type=int, default=0, help="Concurrent renders per process (0: no limit)")
+    return parser.parse_args(argv)
+
+
+def input_mtimes(args: argparse.Namespace) -> Tuple[Optional[float], ...]:
+    """Modification times of the URL list and the CVs (None if missing)."""
+    from config import CV_PATH
+
+    def mtime(path: Optional[str]) -> Optional[float]:
+        try:
+            return os.stat(path).st_mtime if path else None
+        except OSError:
+            return None
+
+    return (mtime(args.input), *(mtime(path) for path in args.cv or [CV_PATH]))
+
+
+def run_once(args: argparse.Namespace, output: TextIO) -> int:
+    """
+    Stream the URLs, read the CV and generate every letter once.
+
+    Returns:
+        int: Exit status (1 when a job failed or there was nothing to do).
+    """
+    from tools.ingest import iter_urls
+
+    source = sys.stdin.buffer if args.input == "-" else args.input
+    urls = iter_urls(source, kind=None if args.format == "auto" else args.format,
+                     column=args.column, match=args.match)
+    first = next(urls, None)
+    if first is None:
+        print("No URLs to process", file=sys.stderr)
+        return 1
+
+    options = build_options(args)
+    succeeded, failed = run(chain([first], urls), options, output, args.processes, max(1, args.chunk_size))
+    print(f"{succeeded} succeeded, {failed} failed out of {succeeded + failed} job(s)", file=sys.stderr)
+    return 1 if failed else 0
+
+
+def watch(args: argparse.Namespace, output: TextIO) -> int:
+    """
+    Run again whenever the URL list or the CV is modified, or every `--refresh` seconds.
+
+    The manifest makes each run regenerate only the letters whose inputs changed.
+    Stops on Ctrl+C with the status of the last run.
+    """
+    status = 0
+    last_mtimes, last_run = None, 0.0
+    try:
+        while True:
+            mtimes = input_mtimes(args)
+            if mtimes != last_mtimes or time.monotonic() - last_run >= args.refresh:
+                last_mtimes, last_run = mtimes, time.monotonic()
+                try:
+                    status = run_once(args, output)
+                except Exception as e:
+                    # A bad edit (missing CV, unreadable list) must not stop the watcher
+                    print(f"Run failed: {e}", file=sys.stderr)
+                    status = 1
+            time.sleep(args.poll)
+    except KeyboardInterrupt:
+        return status
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    args = parse_args(argv)
+    if args.resume and not args.journal:
+        print("--resume requires --journal", file=sys.stderr)
+        return 2
+    if args.batch and args.processes > 1:
+        print("--batch runs in a single process (the provider processes the batch)", file=sys.stderr)
+        return 2
+    if args.watch and (args.input == "-" or not args.manifest):
+        print("--watch requires --input FILE and --manifest", file=sys.stderr)
+        return 2
+
+    output = sys.stdout if args.output == "-" else open(args.output, "a", encoding="utf-8")
+    try:
+        return watch(args, output) if args.watch else run_once(args, output)
+    finally:
+        if output is not sys.stdout:
+            output.close()
+
+
+if __name__ == "__main__":
+    sys.exit(main())
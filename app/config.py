@@ -4,15 +4,9 @@ Supports both local .env files and Streamlit secrets.
 """
 
 import os
+import sys
 from pathlib import Path
 
-# Try to import streamlit for secrets
-try:
-    import streamlit as st
-    HAS_STREAMLIT = True
-except ImportError:
-    HAS_STREAMLIT = False
-
 # Try to load dotenv for local development
 try:
     from dotenv import load_dotenv
@@ -25,8 +19,10 @@ except ImportError:
 
 def get_api_key():
     """Get API key from environment or Streamlit secrets."""
-    # Try Streamlit secrets first (for deployment)
-    if HAS_STREAMLIT:
+    # Try Streamlit secrets first (for deployment). Streamlit is only consulted
+    # when the app already imported it, so CLI runs never pay for importing it.
+    st = sys.modules.get("streamlit")
+    if st is not None:
         try:
             # Check if we're in a Streamlit app context
             if hasattr(st, 'secrets') and "GROQ_API_KEY" in st.secrets:
@@ -41,6 +37,34 @@ def get_api_key():
 CV_PATH = os.getenv("CV_PATH", "")
 DESTINATION_PATH = os.getenv("DESTINATION_PATH", str(Path.home() / "Documents" / "CoverLetters"))
 MODEL = os.getenv("MODEL", "llama-3.3-70b-versatile")
+MAX_WORKERS = int(os.getenv("MAX_WORKERS", "4"))
+
+# Shared scheduling limits for the hosted app (all sessions combined)
+LLM_CONCURRENCY = int(os.getenv("LLM_CONCURRENCY", "4"))
+SESSION_CONCURRENCY = int(os.getenv("SESSION_CONCURRENCY", "2"))
+LLM_REQUESTS_PER_MINUTE = int(os.getenv("LLM_REQUESTS_PER_MINUTE", "0"))
+# Groq-compatible API endpoint, e.g. a local stub for load tests (empty for the Groq cloud)
+GROQ_BASE_URL = os.getenv("GROQ_BASE_URL", "")
+# Pooled HTTP connections shared by every model instance
+HTTP_MAX_CONNECTIONS = int(os.getenv("HTTP_MAX_CONNECTIONS", "20"))
+HTTP_KEEPALIVE_CONNECTIONS = int(os.getenv("HTTP_KEEPALIVE_CONNECTIONS", "10"))
+# Open API connections when the app starts instead of on the first letter
+WARM_UP_MODELS = os.getenv("WARM_UP_MODELS", "true").lower() in ("1", "true", "yes")
+# Folder receiving one JSONL trace per batch (disabled when empty), "native" or "otel" format
+TRACE_PATH = os.getenv("TRACE_PATH", "")
+TRACE_FORMAT = os.getenv("TRACE_FORMAT", "native")
+# Letter-generation prompt variant: "full" or "compact" (see utils.prompts.Prompt)
+PROMPT_VARIANT = os.getenv("PROMPT_VARIANT", "full")
+# Targeted LLM fixes allowed per letter when local repairs are not enough (0 disables them)
+LETTER_REPAIR_RETRIES = int(os.getenv("LETTER_REPAIR_RETRIES", "1"))
+# Offline batch mode (cli.py --batch): seconds between status checks, provider completion window,
+# and price of batch tokens relative to MODEL_PRICING
+BATCH_POLL_INTERVAL = float(os.getenv("BATCH_POLL_INTERVAL", "30"))
+BATCH_COMPLETION_WINDOW = os.getenv("BATCH_COMPLETION_WINDOW", "24h")
+BATCH_COST_FACTOR = float(os.getenv("BATCH_COST_FACTOR", "0.5"))
+CACHE_PATH = os.getenv("CACHE_PATH", str(Path.home() / ".cache" / "cover_letter_generator"))
+# SQLite history of every generated letter (disabled when empty)
+RESULTS_DB_PATH = os.getenv("RESULTS_DB_PATH", str(Path(CACHE_PATH) / "results.sqlite3"))
 GROQ_API_KEY = get_api_key()
 
 # Available models for the UI
@@ -50,6 +74,13 @@ AVAILABLE_MODELS = [
     "gemma2-9b-it"
 ]
 
+# Price per million tokens in USD (input, output), used for cost estimates
+MODEL_PRICING = {
+    "llama-3.3-70b-versatile": (0.59, 0.79),
+    "llama-3.1-8b-instant": (0.05, 0.08),
+    "gemma2-9b-it": (0.20, 0.20),
+}
+
 # Only validate GROQ_API_KEY as it's always required
 def validate_api_key():
     """Validate that GROQ_API_KEY is set."""
@@ -0,0 +1,419 @@
+import json
+import os
+import queue
+import tempfile
+import time
+from concurrent.futures import ThreadPoolExecutor, wait, FIRST_COMPLETED
+from contextlib import nullcontext
+from pathlib import Path
+from typing import Callable, Iterable, Iterator, Optional, Tuple, Union
+from generator.generator import Generator
+from tools.batch_api import BatchClient, TERMINAL_STATUSES, chat_request, iter_results, response_letter, \
+    response_usage
+from tools.checkpoint import JobStage
+from tools.file_manager import CoverLetterManager
+from tools.manifest import text_hash
+from schema.letter_schema import CoverLetterSchema
+from schema.event_schema import EventType
+from utils.models import Models
+from config import BATCH_POLL_INTERVAL, BATCH_COMPLETION_WINDOW
+
+
+class BatchGenerator(Generator):
+    """
+    Generator sending every letter request of a run as one offline batch,
+    instead of one real-time call per job, for large unattended runs.
+
+    A run has three phases, reported through the usual events and trace:
+
+    1. prepare: jobs are scraped, matched to a CV profile, checked against the
+       manifest and language-detected concurrently, as in `Generator`; their
+       prompts are written to `requests.jsonl` in `batch_dir` instead of being sent;
+    2. submit and wait: the file is uploaded to the provider's batch API, which
+       is polled every `poll_interval` seconds until the batch is over;
+    3. ingest: the result lines are parsed, repaired locally (LetterValidator)
+       and saved through the normal path (files, journal, history, manifest, bundle).
+
+    The submitted batch is recorded in `batch_dir/state.json`, so a run stopped
+    while waiting re-attaches to it instead of submitting the prompts again.
+    No targeted LLM fix is made in this mode: letters still failing the checks
+    report their issues.
+    """
+
+    REQUESTS_FILE = "requests.jsonl"
+    JOBS_FILE = "jobs.jsonl"
+    STATE_FILE = "state.json"
+    RESULTS_FILE = "results.jsonl"
+    ERRORS_FILE = "errors.jsonl"
+    # custom_ids of the results already stored, appended as they are, so an interrupted ingest resumes
+    INGESTED_FILE = "ingested.txt"
+
+    # Consecutive failed status checks tolerated while waiting (network hiccups during a long batch)
+    MAX_POLL_ERRORS = 5
+
+    def __init__(self, urls: Iterable[str], batch_dir: str, client: BatchClient = None,
+                 poll_interval: float = None, completion_window: str = None, **kwargs):
+        """
+        Initializes the batch generator.
+
+        Args:
+            urls (Iterable[str]): Job offer URLs to process.
+            batch_dir (str): Folder holding the request, job, state and result files of the batch.
+            client (BatchClient, optional): Batch API client. Defaults to one for GROQ_BASE_URL.
+            poll_interval (float, optional): Seconds between status checks. Falls back to BATCH_POLL_INTERVAL.
+            completion_window (str, optional): Provider deadline of the batch (e.g. "24h").
+                Falls back to BATCH_COMPLETION_WINDOW.
+            **kwargs: Generator options.
+        """
+        super().__init__(urls, **kwargs)
+        self.batch_dir = Path(batch_dir)
+        self.batch_dir.mkdir(parents=True, exist_ok=True)
+        self.client = client or BatchClient()
+        self.poll_interval = BATCH_POLL_INTERVAL if poll_interval is None else poll_interval
+        self.completion_window = completion_window or BATCH_COMPLETION_WINDOW
+        self._state = None
+        self._tool = None
+        self._sampling = {}
+        self._counts = {}
+
+    def _load_state(self) -> Optional[dict]:
+        """The batch submitted by an earlier run and not ingested yet, if any."""
+        try:
+            state = json.loads((self.batch_dir / self.STATE_FILE).read_text(encoding="utf-8"))
+        except (OSError, ValueError):
+            return None
+        return None if state.get("ingested") else state
+
+    def _save_state(self, state: dict) -> None:
+        """Write the batch state atomically."""
+        fd, tmp_name = tempfile.mkstemp(dir=self.batch_dir, prefix=".tmp-", suffix=".json")
+        with os.fdopen(fd, "w", encoding="utf-8") as f:
+            json.dump(state, f, indent=2)
+        os.replace(tmp_name, self.batch_dir / self.STATE_FILE)
+
+    def _run_bounded(self, fn: Callable, items: Iterable[tuple]) -> Iterator[Tuple[tuple, object, float]]:
+        """
+        Run `fn(*item)` for each item on the worker pool, at most `max_workers` at a time.
+
+        Items are read lazily, events are relayed and cancellation is honoured as in
+        `Generator.iter_run`.
+
+        Yields:
+            tuple: The item, its result (or the exception it raised) and its duration, in completion order.
+        """
+        items = iter(items)
+        pending = {}
+        pool_context = nullcontext(self.executor) if self.executor else ThreadPoolExecutor(max_workers=self.max_workers)
+        with pool_context as pool:
+
+            def submit_next() -> None:
+                if self._cancelled.is_set():
+                    return
+                for item in items:
+                    pending[pool.submit(fn, *item)] = (item, time.perf_counter())
+                    return
+
+            for _ in range(self.max_workers):
+                submit_next()
+
+            while pending:
+                done, _ = wait(pending, timeout=0.1, return_when=FIRST_COMPLETED)
+                if self._events is not None:
+                    self._relay_events()
+
+                if self._cancelled.is_set():
+                    for future in [future for future in pending if future not in done]:
+                        if future.cancel():
+                            del pending[future]
+
+                for future in done:
+                    item, start = pending.pop(future)
+                    submit_next()
+                    try:
+                        outcome = future.result()
+                    except Exception as e:
+                        outcome = e
+                    yield item, outcome, time.perf_counter() - start
+
+    def _collect(self, index: int, url: str, outcome, elapsed: float
+                 ) -> Iterator[Tuple[int, str, Union[CoverLetterSchema, Exception]]]:
+        """Count a job outcome and yield it the way `_iter_outcomes` reports it."""
+        if isinstance(outcome, Exception):
+            print(f"❌ Error generating letter: {outcome}")
+            self._counts["failed"] += 1
+            self._journal(url, JobStage.FAILED, error=str(outcome))
+            self._emit(EventType.JOB_FAILED, index, url, elapsed, error=str(outcome))
+            if self._events is not None:
+                self._relay_events()
+            yield index, url, outcome
+        elif outcome is None:
+            # Up to date according to the manifest
+            self._counts["skipped"] += 1
+        else:
+            if self.bundle:
+                with self.tracer.span("bundle.add", job_index=index, parent=self._batch_span):
+                    self.bundle.add(outcome.title, outcome.content)
+            self._counts["succeeded"] += 1
+            yield index, url, outcome
+
+    def _pending_jobs(self, resume_state: dict, letter_manager) -> Iterator[tuple]:
+        """Jobs to prepare, skipping those finished according to the journal."""
+        for index, url in self._iter_jobs():
+            prior = resume_state.get(url)
+            if prior and prior.get("stage") == JobStage.DONE:
+                self._counts["skipped"] += 1
+                self._emit(EventType.JOB_SKIPPED, index, url, title=prior.get("title"),
+                           path=prior.get("path"), reason="resumed")
+                continue
+            yield index, url, prior, letter_manager
+
+    def _prepare_request(self, index: int, url: str, prior: Optional[dict],
+                         letter_manager: Optional[CoverLetterManager]):
+        """
+        Prepare one job and build its batch request. Executed in a worker thread.
+
+        Returns:
+            The letter when an earlier attempt already generated it, else the job context
+            and its request line; None if the manifest shows the letter is up to date.
+        """
+        prior = prior or {}
+        with self.tracer.span("job.prepare", job_index=index, parent=self._batch_span, url=url) as job_span:
+            job = self._prepare(index, url, prior)
+            if job is None:
+                return None
+            if not prior.get("content"):
+                inputs, saved_tokens = self._letter_inputs(job)
+                request = chat_request(f"job-{index}", self.prompt.invoke(inputs).to_messages(),
+                                       self.model_name, self._tool, **self._sampling)
+                context = {
+                    "custom_id": request["custom_id"],
+                    "index": index,
+                    "url": url,
+                    "saved_tokens": saved_tokens,
+                    **{key: job[key] for key in ("profile", "candidate_name", "dependencies",
+                                                 "language", "language_name")},
+                }
+                return context, request
+            letter, usage = self._resumed_letter(index, url, prior)
+            self._store(index, url, job, letter, usage, letter_manager)
+
+        print(f"✅ Cover letter generated in {job['language_name']}")
+        self._emit(EventType.JOB_DONE, index, url, job_span.duration,
+                   letter=letter, language=job["language"], usage=usage.model_dump())
+        return letter
+
+    def _write_requests(self, resume_state: dict,
+                        letter_manager) -> Iterator[Tuple[int, str, Union[CoverLetterSchema, Exception]]]:
+        """
+        Prepare every job and write the batch request and job files.
+
+        Jobs failing to prepare, and letters already generated by an earlier
+        attempt, are reported right away.
+
+        Returns:
+            int: Number of requests written (as the generator's return value).
+        """
+        from langchain_core.utils.function_calling import convert_to_openai_tool
+
+        # Same forced tool call as the structured output of the real-time mode
+        self._tool = convert_to_openai_tool(CoverLetterSchema)
+        settings = Models.get_model(self.model_name)
+        self._sampling = {key: getattr(settings, key, None) for key in ("temperature", "max_tokens")}
+
+        # custom_ids restart at job-0 with every batch
+        (self.batch_dir / self.INGESTED_FILE).unlink(missing_ok=True)
+        count = 0
+        with open(self.batch_dir / self.REQUESTS_FILE, "w", encoding="utf-8") as requests_file, \
+                open(self.batch_dir / self.JOBS_FILE, "w", encoding="utf-8") as jobs_file:
+            jobs = self._pending_jobs(resume_state, letter_manager)
+            for (index, url, _, _), outcome, elapsed in self._run_bounded(self._prepare_request, jobs):
+                if isinstance(outcome, tuple):
+                    context, request = outcome
+                    requests_file.write(json.dumps(request, ensure_ascii=False) + "\n")
+                    jobs_file.write(json.dumps(context, ensure_ascii=False) + "\n")
+                    count += 1
+                else:
+                    yield from self._collect(index, url, outcome, elapsed)
+        return count
+
+    def _submit(self, count: int) -> dict:
+        """Upload the request file and start the batch."""
+        with self.tracer.span("batch.submit", parent=self._batch_span, requests=count) as span:
+            file_id = self.client.upload(self.batch_dir / self.REQUESTS_FILE)
+            batch = self.client.create(file_id, self.completion_window)
+            span.set(batch_id=batch["id"])
+        state = {
+            "id": batch["id"],
+            "input_file_id": file_id,
+            "requests": count,
+            "model": self.model_name,
+            "status": batch.get("status"),
+            "submitted_at": time.time(),
+        }
+        self._save_state(state)
+        print(f"📤 Submitted batch {batch['id']} with {count} request(s)")
+        self._emit(EventType.BATCH_SUBMITTED, batch_id=batch["id"], requests=count)
+        return state
+
+    def _wait(self, state: dict) -> dict:
+        """
+        Poll the batch until it is over, or until the run is cancelled (the batch then
+        keeps running and is collected by the next run).
+        """
+        last, poll_errors = None, 0
+        with self.tracer.span("batch.wait", parent=self._batch_span, batch_id=state["id"]) as span:
+            while True:
+                try:
+                    batch = self.client.get(state["id"])
+                    poll_errors = 0
+                except Exception as e:
+                    # The state file is kept, so a run stopped here can still collect the batch
+                    poll_errors += 1
+                    if poll_errors > self.MAX_POLL_ERRORS:
+                        raise
+                    print(f"⚠️ Could not check batch {state['id']}: {e}")
+                    if self._cancelled.wait(self.poll_interval):
+                        break
+                    continue
+                completed, failed, total = BatchClient.counts(batch)
+                progress = (batch["status"], completed, failed)
+                if progress != last:
+                    last = progress
+                    print(f"⏳ Batch {state['id']}: {batch['status']} "
+                          f"({completed + failed}/{total or state['requests']} processed)")
+                    self._emit(EventType.BATCH_PROGRESS, batch_id=state["id"], status=batch["status"],
+                               completed=completed, failed=failed, requests=total or state["requests"])
+                    if self._events is not None:
+                        self._relay_events()
+                if batch["status"] in TERMINAL_STATUSES:
+                    break
+                if self._cancelled.wait(self.poll_interval):
+                    print(f"⏸️ Stopped waiting; batch {state['id']} keeps running and is collected by the next run")
+                    break
+            span.set(status=state["status"] if poll_errors else batch["status"])
+        if poll_errors:
+            return state
+
+        errors = (batch.get("errors") or {}).get("data") or []
+        state.update(status=batch["status"], output_file_id=batch.get("output_file_id"),
+                     error_file_id=batch.get("error_file_id"),
+                     error="; ".join(error.get("message", "") for error in errors) or None)
+        self._save_state(state)
+        return state
+
+    def _results(self, state: dict) -> Iterator[tuple]:
+        """
+        Download the output and error files, and pair each result line with its job.
+
+        Jobs without a result line (expired, cancelled or failed batch) come last, with None.
+        Jobs already stored by an interrupted ingest are reported as skipped instead.
+        """
+        contexts = {context["custom_id"]: context for context in iter_results(self.batch_dir / self.JOBS_FILE)}
+        ingested_path = self.batch_dir / self.INGESTED_FILE
+        if ingested_path.exists():
+            for custom_id in ingested_path.read_text(encoding="utf-8").split():
+                context = contexts.pop(custom_id, None)
+                if context is not None:
+                    self._counts["skipped"] += 1
+                    self._emit(EventType.JOB_SKIPPED, context["index"], context["url"], reason="resumed")
+        for key, name in (("output_file_id", self.RESULTS_FILE), ("error_file_id", self.ERRORS_FILE)):
+            if not state.get(key):
+                continue
+            with self.tracer.span("batch.download", parent=self._batch_span, file=name):
+                self.client.download(state[key], self.batch_dir / name)
+            for result in iter_results(self.batch_dir / name):
+                context = contexts.pop(result.get("custom_id"), None)
+                if context is not None:
+                    yield context, result
+        for context in list(contexts.values()):
+            yield context, None
+
+    def _ingest_result(self, context: dict, result: Optional[dict],
+                       letter_manager: Optional[CoverLetterManager]) -> CoverLetterSchema:
+        """
+        Turn one result line into a saved letter. Executed in a worker thread.
+
+        Raises:
+            RuntimeError: When the request failed or got no result.
+            ValueError: When the response holds no letter.
+        """
+        index, url = context["index"], context["url"]
+        with self.tracer.span("job.ingest", job_index=index, parent=self._batch_span, url=url) as job_span:
+            if result is None:
+                reason = self._state.get("error") or f"batch {self._state['status']}"
+                raise RuntimeError(f"No result for this job ({reason})")
+            response = result.get("response") or {}
+            body = response.get("body") or {}
+            error = result.get("error") or body.get("error")
+            if error or response.get("status_code") != 200:
+                message = error.get("message") if isinstance(error, dict) else error
+                raise RuntimeError(f"Batch request failed: {message or response.get('status_code')}")
+
+            fields = response_letter(body)
+            if fields is None:
+                raise ValueError("Could not parse the model response")
+            letter = CoverLetterSchema(title=fields.get("title") or "Cover Letter", content=fields["content"],
+                                       company=fields.get("company") or None)
+            usage = response_usage(body, self.model_name)
+            usage.saved_tokens = context["saved_tokens"]
+            letter, repairs, issues = self._repair(letter, context["language"], context["candidate_name"])
+            self._record_letter(index, url, context, letter, usage, 0.0,
+                                repairs=sorted(set(repairs)), retries=0, issues=issues, batch_id=self._state["id"])
+            self._store(index, url, context, letter, usage, letter_manager)
+
+        print(f"✅ Cover letter generated in {context['language_name']}")
+        self._emit(EventType.JOB_DONE, index, url, job_span.duration,
+                   letter=letter, language=context["language"], usage=usage.model_dump())
+        return letter
+
+    def _iter_outcomes(self) -> Iterator[Tuple[int, str, Union[CoverLetterSchema, Exception]]]:
+        """
+        Prepares every job, submits their prompts as one batch, waits for it and
+        yields the letters as they are ingested.
+
+        Yields:
+            tuple[int, str, CoverLetterSchema | Exception]: The job index, URL and
+            either its letter or the error that stopped it.
+        """
+        letter_manager = CoverLetterManager(destination_path=self.destination_path) if self.save_files else None
+
+        self._counts = {"succeeded": 0, "failed": 0, "skipped": 0}
+        resume_state = self.checkpoint.load() if self.checkpoint is not None and self.resume else {}
+        self._cv_hash = text_hash(self.cv) if self.cv is not None else None
+        batch_start = time.perf_counter()
+        self._batch_span = self.tracer.start_span("batch", model=self.model_name, mode="offline")
+        self._events = queue.Queue() if self.on_event else None
+        self._emit(EventType.BATCH_STARTED)
+
+        try:
+            self._state = self._load_state()
+            if self._state is None:
+                count = yield from self._write_requests(resume_state, letter_manager)
+                if count and not self.cancelled:
+                    try:
+                        self._state = self._submit(count)
+                    except Exception as e:
+                        # Every prepared job fails with the submission error
+                        print(f"❌ Could not submit the batch: {e}")
+                        self._state = {"id": None, "status": "failed", "error": f"submission failed: {e}"}
+            else:
+                print(f"🔁 Collecting batch {self._state['id']} submitted by an earlier run (new URLs are ignored)")
+
+            if self._state is not None and self._state.get("status") not in TERMINAL_STATUSES and not self.cancelled:
+                self._state = self._wait(self._state)
+
+            if self._state is not None and self._state["status"] in TERMINAL_STATUSES:
+                results = ((context, result, letter_manager) for context, result in self._results(self._state))
+                with open(self.batch_dir / self.INGESTED_FILE, "a", encoding="utf-8") as ingested:
+                    for (context, _, _), outcome, elapsed in self._run_bounded(self._ingest_result, results):
+                        if isinstance(outcome, CoverLetterSchema):
+                            ingested.write(context["custom_id"] + "\n")
+                            ingested.flush()
+                        yield from self._collect(context["index"], context["url"], outcome, elapsed)
+                if not self.cancelled:
+                    self._state["ingested"] = True
+                    self._save_state(self._state)
+
+            self._report_batch(batch_start, self._counts["succeeded"], self._counts["failed"], self._counts["skipped"])
+        finally:
+            self._close_batch(self._counts["succeeded"], self._counts["failed"])
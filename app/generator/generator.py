@@ -1,101 +1,654 @@
+import queue
+import threading
+import time
+from pathlib import Path
+from contextlib import nullcontext
+from concurrent.futures import Executor, ThreadPoolExecutor, wait, FIRST_COMPLETED
+from typing import TYPE_CHECKING, Callable, Dict, Iterable, Iterator, Optional, Tuple, Union
 from utils.prompts import Prompt
 from utils.models import Models
 from utils.text_processor import TextProcessor
 from utils.language_detector import LanguageDetector
-from tools.file_manager import CoverLetterManager, ApplicationManager
+from tools.file_manager import CoverLetterManager
+from tools.scraper import Scraper
+from tools.bundle_exporter import BundleExporter
+from tools.checkpoint import CheckpointJournal, JobStage
+from tools.manifest import LetterManifest, text_hash
+from tools.results_db import ResultsDB
 from schema.letter_schema import CoverLetterSchema
-from pathlib import Path
+from schema.event_schema import EventType, GenerationEvent
+from schema.usage_schema import TokenUsage
+from utils.tracing import Tracer
+from utils.usage import UsageTracker, add_usage, extract_usage
+from utils.letter_validator import LetterValidator, parse_letter_json
+from config import MODEL, MAX_WORKERS, PROMPT_VARIANT, LETTER_REPAIR_RETRIES, TRACE_PATH, TRACE_FORMAT
+
+if TYPE_CHECKING:
+    from utils.cv_profiles import CVProfiles
 
 class Generator:
     """
-    Class responsible for generating personalized cover letters 
+    Class responsible for generating personalized cover letters
     based on a given CV and a list of job descriptions.
-    
-    It uses a language model with structured output to produce 
+
+    It uses a language model with structured output to produce
     tailored letters and delegates saving to a file manager.
+    Progress is reported through structured GenerationEvent callbacks,
+    and every stage is timed as a span of the batch trace (`tracer`).
     """
 
-    def __init__(self, urls: list[str], cv_content: str = None, 
-                 destination_path: str = None, model_name: str = None):
+    def __init__(self, urls: Iterable[str], cv_content: str = None,
+                 destination_path: str = None, model_name: str = None,
+                 save_files: bool = True, bundle: BundleExporter = None,
+                 on_event: Optional[Callable[[GenerationEvent], None]] = None,
+                 max_workers: int = None, executor: Executor = None, model=None,
+                 tracer: Tracer = None, stage_limits: Optional[Dict[str, int]] = None,
+                 checkpoint: CheckpointJournal = None, resume: bool = False,
+                 manifest: LetterManifest = None, results_db: ResultsDB = None,
+                 cv_profiles: "CVProfiles" = None, prompt_variant: str = None, repair_retries: int = None):
         """
         Initializes the Generator with a list of job posting URLs.
 
         Args:
-            urls (list[str]): List of job offer URLs to process.
+            urls (Iterable[str]): Job offer URLs to process. Any iterable works, e.g. a
+                streaming import (see tools.ingest); it is read lazily, as workers free up.
             cv_content (str, optional): CV content as text. If not provided, uses PdfManager.
             destination_path (str, optional): Path to save cover letters.
             model_name (str, optional): Name of the model to use.
+            save_files (bool, optional): Write each letter to `destination_path`.
+                Disable to keep results in memory only (e.g. on read-only hosts).
+            bundle (BundleExporter, optional): Bundle receiving every letter as soon
+                as it is generated (single ZIP or merged PDF for the whole batch).
+            on_event (Callable, optional): Called with a GenerationEvent after each stage
+                of each job (scrape, language detection, LLM call, file write).
+                Always invoked from the thread consuming `iter_run`/`run`.
+            max_workers (int, optional): Jobs processed concurrently. Falls back to MAX_WORKERS from config.
+            executor (Executor, optional): Shared executor running the jobs (e.g. a FairScheduler
+                session executor). `max_workers` then only bounds the jobs in flight.
+            model (optional): Prebuilt structured-output model from `build_model`, e.g. a cached one.
+            tracer (Tracer, optional): Collector of the stage spans. A new trace is started if omitted;
+                it is written to TRACE_PATH after each batch when configured.
+            stage_limits (dict, optional): Maximum concurrent calls per stage ("scrape", "llm",
+                "render"), on top of `max_workers`, e.g. to keep scraping ahead of a rate-limited LLM.
+            checkpoint (CheckpointJournal, optional): Journal recording each job's stage outputs.
+            resume (bool, optional): Replay `checkpoint` first: finished jobs are skipped, and failed
+                or incomplete ones reuse their scraped text and generated letter when available.
+            manifest (LetterManifest, optional): Dependencies of previously generated letters. Jobs whose
+                CV, posting content, model and prompt version are unchanged are skipped after scraping.
+            results_db (ResultsDB, optional): History receiving a record of every generated letter.
+            cv_profiles (CVProfiles, optional): Several tailored CVs; each job uses the one closest to
+                its posting instead of `cv_content`.
+            prompt_variant (str, optional): Letter prompt, "full" or "compact". Falls back to
+                PROMPT_VARIANT from config.
+            repair_retries (int, optional): Targeted LLM fixes per letter when the local checks still
+                fail after local repairs. Falls back to LETTER_REPAIR_RETRIES from config.
         """
+        self.model_name = model_name or MODEL
+
         # Language model configured to return structured output following CoverLetterSchema
-        self.model = Models.get_model(model_name).with_structured_output(CoverLetterSchema)
+        self.model = model or self.build_model(self.model_name)
 
         # Prompt template guiding the letter generation
-        self.prompt = Prompt.GENERATE_MOTIVATION
+        self.prompt_variant = prompt_variant or PROMPT_VARIANT
+        self.prompt, self.prompt_version = Prompt.generate_motivation(self.prompt_variant)
+        self.repair_retries = LETTER_REPAIR_RETRIES if repair_retries is None else repair_retries
+        self._repair_chain = None
 
-        # Use provided CV content or extract from PDF
+        # Use provided CV content or extract from PDF (unless a profile is picked per job)
+        self.cv_profiles = cv_profiles
         if cv_content:
             self.cv = cv_content
+        elif cv_profiles is not None:
+            self.cv = None
         else:
             from tools.file_manager import PdfManager
             self.cv = PdfManager().run()
 
-        # Store the list of URLs to process
+        # Store the URLs to process (the total is only known up front for sized collections)
         self.urls = urls
-        
+        self.total = len(urls) if hasattr(urls, "__len__") else None
+
         # Store destination path if provided
         self.destination_path = destination_path
+        self.save_files = save_files
+        self.bundle = bundle
+        self.on_event = on_event
+        self.max_workers = max(1, max_workers or MAX_WORKERS)
+        self.executor = executor
 
-    def run(self):
+        self.scraper = Scraper()
+        self.tracer = tracer or Tracer()
+        self.usage = UsageTracker()
+        self._batch_span = None
+
+        # Per-stage concurrency limits (stages without a limit are only bounded by max_workers)
+        self._stage_limits = {
+            stage: threading.BoundedSemaphore(limit)
+            for stage, limit in (stage_limits or {}).items() if limit
+        }
+
+        self.checkpoint = checkpoint
+        self.resume = resume
+        self.manifest = manifest
+        self.results_db = results_db
+        self._cv_hash = None
+
+        # Events raised by worker threads, relayed on the consuming thread
+        self._events = None
+
+        # Set by cancel(): no new jobs are started, in-flight ones finish
+        self._cancelled = threading.Event()
+
+    @staticmethod
+    def build_model(model_name: str = None, temperature: float = None, max_tokens: int = None):
         """
-        Executes the letter generation process for each job offer.
+        Builds the structured-output model used for generation.
+
+        Args:
+            model_name (str, optional): Name of the model to use. Falls back to MODEL from config.
+            temperature (float, optional): Sampling temperature override.
+            max_tokens (int, optional): Completion length override.
 
         Returns:
-            list[CoverLetterSchema]: A list of generated cover letters 
-            as structured data (title and content).
+            Runnable: The model configured to return a dict with the parsed CoverLetterSchema
+            ("parsed") and the raw response carrying the token usage ("raw").
         """
-        # Compose the prompt and model into a LangChain chain
-        chain = self.prompt | self.model
+        model = Models.get_model(model_name, temperature=temperature, max_tokens=max_tokens)
+        return model.with_structured_output(CoverLetterSchema, include_raw=True)
+
+    def cancel(self) -> None:
+        """
+        Requests cancellation of the running batch.
+
+        Jobs not yet started are skipped; jobs already running finish normally.
+        Safe to call from any thread.
+        """
+        self._cancelled.set()
 
-        # Managers for saving letters and parsing job applications
-        letter_manager = CoverLetterManager(destination_path=self.destination_path)
-        application_manager = ApplicationManager(self.urls)
+    @property
+    def cancelled(self) -> bool:
+        """Whether cancellation was requested."""
+        return self._cancelled.is_set()
 
-        # Retrieve job descriptions from the provided URLs
-        applications = application_manager.run()
+    def _stage(self, stage: str):
+        """Context manager holding a slot of the stage's concurrency limit, if any."""
+        return self._stage_limits.get(stage) or nullcontext()
 
-        # Store the resulting cover letters
-        results = []
+    def _emit(self, event_type: str, job_index: int = None, url: str = None,
+              elapsed: float = 0.0, letter: CoverLetterSchema = None, **data) -> None:
+        """Send a progress event to the registered callback, if any."""
+        if self.on_event is None:
+            return
+        event = GenerationEvent(
+            type=event_type,
+            job_index=job_index,
+            url=url,
+            total=self.total,
+            elapsed=elapsed,
+            timestamp=time.time(),
+            data=data,
+            letter=letter
+        )
+        if self._events is not None:
+            self._events.put(event)
+        else:
+            self.on_event(event)
 
-        for i, application in enumerate(applications):
+    def _relay_events(self) -> None:
+        """Deliver events queued by worker threads to the callback."""
+        while True:
             try:
-                # Detect the language of the job posting
-                language, confidence = LanguageDetector.detect_language(application)
-                language_name = LanguageDetector.get_language_name(language)
-                
-                print(f"📌 Job {i+1}/{len(applications)}: Detected language: {language_name} (confidence: {confidence:.2f})")
-                
+                event = self._events.get_nowait()
+            except queue.Empty:
+                return
+            self.on_event(event)
+
+    def _journal(self, url: str, stage: str, **data) -> None:
+        """Record a stage completion in the checkpoint journal, if any."""
+        if self.checkpoint is not None:
+            self.checkpoint.append(url, stage, **data)
+
+    def _process(self, index: int, url: str, chain, letter_manager: Optional[CoverLetterManager],
+                 prior: Optional[dict] = None) -> Optional[CoverLetterSchema]:
+        """
+        Runs the full pipeline for one job posting: scrape, detect language, generate, save.
+        Executed in a worker thread.
+
+        Args:
+            index (int): Position of the job in the batch.
+            url (str): Job posting URL.
+            chain: Prompt | model chain returning a CoverLetterSchema.
+            letter_manager (CoverLetterManager, optional): Manager saving the letter to disk.
+            prior (dict, optional): Journal state of an earlier attempt, whose outputs are reused.
+
+        Returns:
+            CoverLetterSchema: The generated letter, None if the manifest shows it is up to date.
+        """
+        prior = prior or {}
+        with self.tracer.span("job", job_index=index, parent=self._batch_span, url=url) as job_span:
+            job = self._prepare(index, url, prior)
+            if job is None:
+                return None
+
+            if prior.get("content"):
+                letter, usage = self._resumed_letter(index, url, prior)
+            else:
                 # Prepare texts to fit within token limits
-                truncated_cv, truncated_job = TextProcessor.prepare_for_llm(
-                    self.cv, 
-                    application,
-                    max_total_chars=5000  # Approximately 1250 tokens, well under 6000 limit
-                )
-                
+                inputs, saved_tokens = self._letter_inputs(job)
+
                 # Generate a structured letter using the model with language parameter
-                letter: CoverLetterSchema = chain.invoke({
-                    "cv": truncated_cv,
-                    "job_description": truncated_job,
-                    "language": language_name
-                })
-
-                # Save or handle the generated letter
-                letter_manager.manage(letter.title, letter.content)
-
-                # Store the result
-                results.append(letter)
-                print(f"✅ Cover letter generated in {language_name}")
-            except Exception as e:
-                print(f"❌ Error generating letter: {e}")
-                continue
-
-        return results
\ No newline at end of file
+                self._emit(EventType.LLM_STARTED, index, url, model=self.model_name)
+                with self._stage("llm"), self.tracer.span("llm.invoke", model=self.model_name,
+                                                          prompt=self.prompt_variant) as span:
+                    letter, usage, quality = self._generate(chain, inputs, job["language"], job["candidate_name"])
+                    usage.saved_tokens = saved_tokens
+                    span.set(input_tokens=usage.input_tokens, output_tokens=usage.output_tokens, **quality)
+                self._record_letter(index, url, job, letter, usage, span.duration, **quality)
+
+            self._store(index, url, job, letter, usage, letter_manager)
+
+        print(f"✅ Cover letter generated in {job['language_name']}")
+        self._emit(EventType.JOB_DONE, index, url, job_span.duration,
+                   letter=letter, language=job["language"], usage=usage.model_dump())
+        return letter
+
+    def _prepare(self, index: int, url: str, prior: dict) -> Optional[dict]:
+        """
+        Everything a job needs before the LLM call: scrape the posting, pick the CV
+        profile, check the manifest and detect the language.
+
+        Args:
+            index (int): Position of the job in the batch.
+            url (str): Job posting URL.
+            prior (dict): Journal state of an earlier attempt (empty if none).
+
+        Returns:
+            dict: The job's "application", "profile", "cv", "candidate_name", "dependencies",
+            "language" and "language_name", or None if the manifest shows its letter is up to date.
+        """
+        # Retrieve the job description (the first document holds the main content)
+        if prior.get("application"):
+            application = prior["application"]
+            self._emit(EventType.SCRAPE_DONE, index, url, chars=len(application), resumed=True)
+        else:
+            with self._stage("scrape"), self.tracer.span("scrape") as span:
+                application = self.scraper.run(url)[0].page_content
+                span.set(chars=len(application))
+            self._journal(url, JobStage.SCRAPED, application=application)
+            self._emit(EventType.SCRAPE_DONE, index, url, span.duration, chars=len(application))
+
+        # Pick the CV profile closest to the posting
+        if self.cv_profiles is not None:
+            with self.tracer.span("cv.match") as span:
+                profile, score = self.cv_profiles.best(application)
+                span.set(profile=profile, score=score)
+            cv, cv_hash = self.cv_profiles.text(profile), self.cv_profiles.hash(profile)
+            self._emit(EventType.CV_SELECTED, index, url, span.duration, profile=profile, score=score)
+        else:
+            profile, cv, cv_hash = None, self.cv, self._cv_hash
+
+        # Skip letters whose inputs did not change since they were generated
+        dependencies = {
+            "cv_hash": cv_hash,
+            "job_hash": text_hash(application),
+            "model": self.model_name,
+            "prompt_version": self.prompt_version,
+        }
+        if self.manifest is not None and self.manifest.is_current(url, dependencies):
+            entry = self.manifest.get(url)
+            self._emit(EventType.JOB_SKIPPED, index, url, title=entry.get("title"),
+                       path=entry.get("path"), reason="unchanged")
+            return None
+
+        # Detect the language of the job posting
+        with self.tracer.span("language.detect") as span:
+            language, confidence = LanguageDetector.detect_language(application)
+            language_name = LanguageDetector.get_language_name(language)
+            span.set(language=language, confidence=confidence)
+        self._emit(EventType.LANGUAGE_DETECTED, index, url, span.duration,
+                   language=language, language_name=language_name, confidence=confidence)
+
+        print(f"📌 Job {index+1}/{self.total or '?'}: Detected language: {language_name} (confidence: {confidence:.2f})")
+
+        return {
+            "application": application,
+            "profile": profile,
+            "cv": cv,
+            "candidate_name": LetterValidator.candidate_name(cv),
+            "dependencies": dependencies,
+            "language": language,
+            "language_name": language_name,
+        }
+
+    def _letter_inputs(self, job: dict) -> Tuple[dict, int]:
+        """
+        Inputs of the letter prompt, with the CV and posting truncated to fit the token limits.
+
+        Returns:
+            tuple[dict, int]: The prompt inputs and the tokens saved by the truncation.
+        """
+        with self.tracer.span("text.prepare"):
+            cv, application = job["cv"], job["application"]
+            truncated_cv, truncated_job = TextProcessor.prepare_for_llm(
+                cv,
+                application,
+                max_total_chars=5000  # Approximately 1250 tokens, well under 6000 limit
+            )
+        saved_tokens = TextProcessor.estimate_tokens(cv + application) - \
+            TextProcessor.estimate_tokens(truncated_cv + truncated_job)
+        return Prompt.letter_inputs(truncated_cv, truncated_job, job["language"]), saved_tokens
+
+    def _resumed_letter(self, index: int, url: str, prior: dict) -> Tuple[CoverLetterSchema, TokenUsage]:
+        """Letter generated by an earlier attempt (its tokens were already paid for)."""
+        letter = CoverLetterSchema(title=prior["title"], content=prior["content"], company=prior.get("company"))
+        usage = TokenUsage(**prior.get("usage") or {})
+        self._emit(EventType.LLM_FINISHED, index, url, model=self.model_name,
+                   title=letter.title, usage=usage.model_dump(), resumed=True)
+        return letter, usage
+
+    def _record_letter(self, index: int, url: str, job: dict, letter: CoverLetterSchema, usage: TokenUsage,
+                       elapsed: float, **quality) -> None:
+        """Account for a freshly generated letter: usage totals, journal and LLM_FINISHED event."""
+        self.usage.record(self.model_name, usage, job_index=index, url=url, title=letter.title)
+        self._journal(url, JobStage.GENERATED, language=job["language"], title=letter.title,
+                      company=letter.company, content=letter.content, usage=usage.model_dump())
+        self._emit(EventType.LLM_FINISHED, index, url, elapsed,
+                   model=self.model_name, title=letter.title, usage=usage.model_dump(), **quality)
+
+    def _store(self, index: int, url: str, job: dict, letter: CoverLetterSchema, usage: TokenUsage,
+               letter_manager: Optional[CoverLetterManager]) -> Optional[str]:
+        """
+        Save a letter and record it: file (rendering is traced as a child span), journal,
+        results history and manifest.
+
+        Returns:
+            str: Path of the saved letter, None when files are not saved.
+        """
+        if letter_manager:
+            with self._stage("render"), self.tracer.span("store.save") as span:
+                path = letter_manager.manage(
+                    letter.title,
+                    letter.content,
+                    url=url,
+                    metadata={"language": job["language"], "company": letter.company, "model": self.model_name,
+                              "profile": job["profile"], "usage": usage.model_dump()}
+                )
+            self._emit(EventType.FILE_WRITTEN, index, url, span.duration, path=path)
+        else:
+            path = None
+        self._journal(url, JobStage.DONE, title=letter.title, path=path)
+        if self.results_db is not None:
+            self.results_db.add(url, letter.title, letter.content, company=letter.company,
+                                language=job["language"], model=self.model_name, path=path,
+                                usage=usage.model_dump())
+        if self.manifest is not None:
+            self.manifest.update(url, job["dependencies"], letter.title, path)
+        return path
+
+    def _generate(self, chain, inputs: dict, language: str,
+                  candidate_name: Optional[str]) -> Tuple[CoverLetterSchema, TokenUsage, dict]:
+        """
+        Generate a letter, repair it locally, and ask the model for a targeted fix only
+        when the local checks still fail.
+
+        Malformed structured output is first recovered locally (see `_parse_response`);
+        only output with no recoverable letter costs a new full generation. A targeted
+        fix resends the letter and the failed checks, not the CV and job posting.
+        Both kinds of retry share the `repair_retries` budget.
+
+        Args:
+            chain: Prompt | model chain returning a CoverLetterSchema.
+            inputs (dict): Inputs of the letter prompt.
+            language (str): Language code the letter must be written in.
+            candidate_name (str, optional): Name expected in the signature.
+
+        Returns:
+            tuple[CoverLetterSchema, TokenUsage, dict]: The letter, the usage summed over every
+            call, and its quality: local "repairs", LLM "retries" and remaining "issues".
+        """
+        retries = 0
+        while True:
+            try:
+                letter, usage = self._parse_response(chain.invoke(inputs))
+                break
+            except ValueError:
+                if retries >= self.repair_retries:
+                    raise
+                retries += 1
+
+        letter, repairs, issues = self._repair(letter, language, candidate_name)
+        while issues and retries < self.repair_retries:
+            retries += 1
+            with self.tracer.span("llm.repair", issues=",".join(issues)):
+                try:
+                    fixed, fix_usage = self._parse_response(self._repair_chain.invoke(Prompt.repair_inputs(
+                        letter.title, letter.content, [LetterValidator.ISSUES[code] for code in issues],
+                        language, candidate_name
+                    )))
+                except ValueError:
+                    continue
+            usage = add_usage(usage, fix_usage)
+            fixed, fixed_repairs, fixed_issues = self._repair(fixed, language, candidate_name)
+            # A fix that makes things worse is discarded
+            if len(fixed_issues) < len(issues):
+                fixed.company = fixed.company or letter.company
+                letter, issues, repairs = fixed, fixed_issues, repairs + fixed_repairs
+        return letter, usage, {"repairs": sorted(set(repairs)), "retries": retries, "issues": issues}
+
+    def _repair(self, letter: CoverLetterSchema, language: str,
+                candidate_name: Optional[str]) -> Tuple[CoverLetterSchema, list, list]:
+        """
+        Apply the local repairs of LetterValidator to a letter.
+
+        Returns:
+            tuple[CoverLetterSchema, list, list]: The repaired letter, the applied fixes and the issues left.
+        """
+        with self.tracer.span("letter.validate") as span:
+            content, repairs = LetterValidator.repair(letter.content, language, candidate_name, letter.company)
+            issues = LetterValidator.check(content, language, candidate_name)
+            span.set(repairs=",".join(repairs), issues=",".join(issues))
+        if repairs:
+            letter = CoverLetterSchema(title=letter.title, content=content, company=letter.company)
+        return letter, repairs, issues
+
+    def _parse_response(self, response) -> Tuple[CoverLetterSchema, TokenUsage]:
+        """
+        Split a structured-output response into the letter and its token usage.
+
+        Args:
+            response: Output of `build_model` (dict with "raw", "parsed" and "parsing_error"),
+                or a bare CoverLetterSchema from models built without `include_raw`.
+
+        Output that failed to parse (unescaped quotes, raw newlines, JSON wrapped in
+        prose or code fences) is recovered from the raw message when possible.
+
+        Returns:
+            tuple[CoverLetterSchema, TokenUsage]: The letter and the usage of the call.
+
+        Raises:
+            ValueError: When no letter can be recovered from the response.
+        """
+        if not isinstance(response, dict):
+            return response, TokenUsage()
+        raw = response.get("raw")
+        letter = response.get("parsed")
+        if letter is None:
+            fields = next(filter(None, map(parse_letter_json, self._raw_outputs(raw))), None)
+            if fields is None:
+                error = response.get("parsing_error")
+                raise ValueError(f"Could not parse the model response: {error}") from error
+            letter = CoverLetterSchema(title=fields.get("title") or "Cover Letter", content=fields["content"],
+                                       company=fields.get("company") or None)
+        return letter, extract_usage(raw, self.model_name)
+
+    @staticmethod
+    def _raw_outputs(raw) -> Iterator[str]:
+        """Texts of a raw model message that may hold the letter JSON: tool-call arguments, then content."""
+        if raw is None:
+            return
+        for call in getattr(raw, "invalid_tool_calls", None) or []:
+            if isinstance(call.get("args"), str):
+                yield call["args"]
+        for call in (getattr(raw, "additional_kwargs", None) or {}).get("tool_calls") or []:
+            yield (call.get("function") or {}).get("arguments") or ""
+        if isinstance(getattr(raw, "content", None), str):
+            yield raw.content
+
+    def _iter_jobs(self) -> Iterator[Tuple[int, str]]:
+        """Number the URLs as they are read; sets `total` once a streamed source is exhausted."""
+        count = 0
+        for count, url in enumerate(self.urls, 1):
+            yield count - 1, url
+        self.total = count
+
+    def iter_run(self) -> Iterator[Tuple[str, Union[CoverLetterSchema, Exception]]]:
+        """
+        Generates letters concurrently and yields them as they complete.
+
+        At most `max_workers` jobs are in flight at any time, and URLs are read
+        lazily, so memory stays bounded regardless of the batch size.
+
+        Yields:
+            tuple[str, CoverLetterSchema | Exception]: The job URL and either its
+            letter or the error that stopped it, in completion order.
+        """
+        for _, url, outcome in self._iter_outcomes():
+            yield url, outcome
+
+    def _iter_outcomes(self) -> Iterator[Tuple[int, str, Union[CoverLetterSchema, Exception]]]:
+        """
+        Run the batch (see `iter_run`).
+
+        Yields:
+            tuple[int, str, CoverLetterSchema | Exception]: The job index, URL and outcome, in completion order.
+        """
+        # Compose the prompt and model into a LangChain chain
+        chain = self.prompt | self.model
+        self._repair_chain = Prompt.REPAIR_LETTER | self.model
+
+        # Manager for saving letters
+        letter_manager = CoverLetterManager(destination_path=self.destination_path) if self.save_files else None
+
+        succeeded = failed = skipped = 0
+        resume_state = self.checkpoint.load() if self.checkpoint is not None and self.resume else {}
+        self._cv_hash = text_hash(self.cv) if self.cv is not None else None
+        batch_start = time.perf_counter()
+        self._batch_span = self.tracer.start_span("batch", model=self.model_name)
+        self._events = queue.Queue() if self.on_event else None
+        self._emit(EventType.BATCH_STARTED)
+
+        jobs = self._iter_jobs()
+        pending = {}
+
+        try:
+            pool_context = nullcontext(self.executor) if self.executor else ThreadPoolExecutor(max_workers=self.max_workers)
+            with pool_context as pool:
+
+                def submit_next() -> None:
+                    nonlocal skipped
+                    if self._cancelled.is_set():
+                        return
+                    for index, url in jobs:
+                        prior = resume_state.get(url)
+                        if prior and prior.get("stage") == JobStage.DONE:
+                            # Finished in an earlier run
+                            skipped += 1
+                            self._emit(EventType.JOB_SKIPPED, index, url, title=prior.get("title"),
+                                       path=prior.get("path"), reason="resumed")
+                            continue
+                        future = pool.submit(self._process, index, url, chain, letter_manager, prior)
+                        pending[future] = (index, url, time.perf_counter())
+                        return
+
+                for _ in range(self.max_workers):
+                    submit_next()
+
+                while pending:
+                    done, _ = wait(pending, timeout=0.1, return_when=FIRST_COMPLETED)
+                    if self._events is not None:
+                        self._relay_events()
+
+                    # Withdraw jobs still waiting in a shared queue
+                    if self._cancelled.is_set():
+                        for future in [future for future in pending if future not in done]:
+                            if future.cancel():
+                                del pending[future]
+
+                    for future in done:
+                        index, url, job_start = pending.pop(future)
+                        submit_next()
+                        try:
+                            letter = future.result()
+                        except Exception as e:
+                            print(f"❌ Error generating letter: {e}")
+                            failed += 1
+                            self._journal(url, JobStage.FAILED, error=str(e))
+                            self._emit(EventType.JOB_FAILED, index, url, time.perf_counter() - job_start, error=str(e))
+                            if self._events is not None:
+                                self._relay_events()
+                            yield index, url, e
+                            continue
+
+                        if letter is None:
+                            # Up to date according to the manifest
+                            skipped += 1
+                            continue
+
+                        # Bundles are not thread-safe, so they are fed from this thread
+                        if self.bundle:
+                            with self.tracer.span("bundle.add", job_index=index, parent=self._batch_span):
+                                self.bundle.add(letter.title, letter.content)
+                        succeeded += 1
+                        yield index, url, letter
+
+            self._report_batch(batch_start, succeeded, failed, skipped)
+        finally:
+            self._close_batch(succeeded, failed)
+
+    def _report_batch(self, batch_start: float, succeeded: int, failed: int, skipped: int) -> None:
+        """Print the token totals and emit BATCH_FINISHED."""
+        total = self.usage.total
+        cost = f", ~${total.cost:.4f}" if total.cost is not None else ""
+        print(f"🧮 Tokens: {total.input_tokens} in / {total.output_tokens} out{cost}")
+        self._emit(EventType.BATCH_FINISHED, elapsed=time.perf_counter() - batch_start,
+                   succeeded=succeeded, failed=failed, skipped=skipped, cancelled=self.cancelled,
+                   usage=self.usage.summary()["batch"])
+        if self._events is not None:
+            self._relay_events()
+
+    def _close_batch(self, succeeded: int, failed: int) -> None:
+        """Finish the trace and persist the journal and manifest, even after an error."""
+        self._events = None
+        self._finish_trace(succeeded, failed)
+        if self.checkpoint is not None:
+            self.checkpoint.flush()
+        if self.manifest is not None:
+            self.manifest.save()
+
+    def _finish_trace(self, succeeded: int, failed: int) -> None:
+        """Close the batch span, print the stage summary and export the trace if configured."""
+        self._batch_span.set(succeeded=succeeded, failed=failed, cancelled=self.cancelled)
+        self.tracer.finish(self._batch_span)
+        self._batch_span = None
+        print(self.tracer.format_summary())
+        if TRACE_PATH:
+            try:
+                path = Path(TRACE_PATH) / f"trace_{self.tracer.trace_id}.jsonl"
+                self.tracer.export_jsonl(path, otel=TRACE_FORMAT == "otel")
+            except OSError as e:
+                print(f"⚠️ Could not write trace: {e}")
+
+    def run(self):
+        """
+        Executes the letter generation process for each job offer.
+
+        Thin wrapper around `iter_run` kept for compatibility: jobs still run
+        concurrently, but the letters are returned in the order of the URLs.
+
+        Returns:
+            list[CoverLetterSchema]: A list of generated cover letters
+            as structured data (title and content), in input order.
+        """
+        letters = [(index, outcome) for index, _, outcome in self._iter_outcomes()
+                   if not isinstance(outcome, Exception)]
+        return [letter for _, letter in sorted(letters, key=lambda item: item[0])]
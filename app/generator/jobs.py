@@ -0,0 +1,263 @@
+import threading
+import time
+import uuid
+from collections import deque
+from typing import Dict, List, Optional
+from generator.generator import Generator
+from generator.scheduler import FairScheduler
+from schema.event_schema import EventType, GenerationEvent
+
+
+class JobStatus:
+    """
+    Lifecycle states of a background generation job.
+    """
+
+    PENDING = "pending"
+    RUNNING = "running"
+    COMPLETED = "completed"
+    FAILED = "failed"
+    CANCELLED = "cancelled"
+
+    FINISHED = (COMPLETED, FAILED, CANCELLED)
+
+
+# Share of a job completed once a stage has been reported
+STAGE_PROGRESS = {
+    EventType.SCRAPE_DONE: 0.25,
+    EventType.CV_SELECTED: 0.3,
+    EventType.LANGUAGE_DETECTED: 0.35,
+    EventType.LLM_STARTED: 0.4,
+    EventType.LLM_FINISHED: 0.9,
+    EventType.FILE_WRITTEN: 0.95,
+    EventType.JOB_DONE: 1.0,
+    EventType.JOB_FAILED: 1.0,
+    EventType.JOB_SKIPPED: 1.0,
+}
+
+
+class Job:
+    """
+    A generation batch running in the background.
+
+    The worker thread updates the job through `record_event`/`run` while the
+    UI reads it through `snapshot`, both under the job's lock.
+    """
+
+    def __init__(self, generator: Generator, bundle=None, session_id: str = None, max_events: int = 200):
+        """
+        Initialize the job.
+
+        Args:
+            generator (Generator): Configured generator to run.
+            bundle (BundleExporter, optional): Bundle fed by the generator, closed when the job ends.
+            session_id (str, optional): Session that submitted the job.
+            max_events (int, optional): Number of recent events kept for display.
+        """
+        self.id = uuid.uuid4().hex[:12]
+        self.generator = generator
+        self.bundle = bundle
+        self.session_id = session_id
+        self.status = JobStatus.PENDING
+        self.results = []
+        self.errors = []
+        self.error = None
+        self.created_at = time.time()
+        self.started_at = None
+        self.finished_at = None
+
+        self._progress: Dict[int, float] = {}
+        self._events = deque(maxlen=max_events)
+        self._lock = threading.Lock()
+
+        # Chain any callback already set on the generator
+        self._user_callback = generator.on_event
+        generator.on_event = self.record_event
+
+    def record_event(self, event: GenerationEvent) -> None:
+        """Store a generator event (called from the worker thread)."""
+        with self._lock:
+            self._events.append(event)
+            if event.job_index is not None:
+                self._progress[event.job_index] = max(
+                    self._progress.get(event.job_index, 0.0),
+                    STAGE_PROGRESS.get(event.type, 0.0)
+                )
+            if event.type == EventType.JOB_DONE:
+                self.results.append(event.letter)
+            elif event.type == EventType.JOB_FAILED:
+                self.errors.append((event.url, event.data.get("error")))
+        if self._user_callback:
+            self._user_callback(event)
+
+    def run(self) -> None:
+        """Execute the batch (called from the worker thread)."""
+        with self._lock:
+            if self.generator.cancelled:
+                self.status = JobStatus.CANCELLED
+                self.finished_at = time.time()
+                return
+            self.status = JobStatus.RUNNING
+            self.started_at = time.time()
+        try:
+            for _ in self.generator.iter_run():
+                pass
+            status = JobStatus.CANCELLED if self.generator.cancelled else JobStatus.COMPLETED
+            error = None
+        except Exception as e:
+            status = JobStatus.FAILED
+            error = str(e)
+        if self.bundle is not None:
+            # A bundle that cannot be finished fails the job rather than leaving it RUNNING
+            try:
+                self.bundle.close()
+            except Exception as e:
+                status = JobStatus.FAILED
+                error = error or f"Could not finish the bundle: {e}"
+        with self._lock:
+            self.status = status
+            self.error = error
+            self.finished_at = time.time()
+
+    def cancel(self) -> None:
+        """Stop starting new jobs; running ones finish and are kept."""
+        self.generator.cancel()
+
+    @property
+    def progress(self) -> float:
+        """Overall completion between 0 and 1."""
+        with self._lock:
+            if self.status == JobStatus.COMPLETED:
+                return 1.0
+            # Streamed batches only know the jobs started so far
+            total = self.total or len(self._progress)
+            return min(1.0, sum(self._progress.values()) / total) if total else 0.0
+
+    @property
+    def total(self) -> Optional[int]:
+        """Number of jobs in the batch, None until a streamed source is exhausted."""
+        return self.generator.total
+
+    @property
+    def done(self) -> bool:
+        """Whether the job has reached a final state."""
+        return self.status in JobStatus.FINISHED
+
+    def snapshot(self) -> dict:
+        """
+        Consistent copy of the job state for display.
+
+        Returns:
+            dict: status, progress, results, errors, recent events, timings,
+            per-stage duration statistics (see Tracer.summary) and token usage
+            (see UsageTracker.summary).
+        """
+        progress = self.progress
+        stages = self.generator.tracer.summary()
+        usage = self.generator.usage.summary()
+        with self._lock:
+            return {
+                "id": self.id,
+                "status": self.status,
+                "progress": progress,
+                "total": self.total,
+                "results": list(self.results),
+                "errors": list(self.errors),
+                "error": self.error,
+                "events": list(self._events),
+                "created_at": self.created_at,
+                "started_at": self.started_at,
+                "finished_at": self.finished_at,
+                "stages": stages,
+                "usage": usage,
+            }
+
+
+class JobManager:
+    """
+    Runs generation batches on background threads so callers never block.
+
+    One manager is meant to live for the whole process (e.g. through
+    `st.cache_resource`), so jobs survive Streamlit reruns. With a
+    FairScheduler, the work of every batch goes through one shared queue with
+    per-session caps and round-robin dispatch, and each batch thread only
+    coordinates its own jobs.
+    """
+
+    def __init__(self, scheduler: FairScheduler = None, keep_finished: int = 50):
+        """
+        Initialize the job manager.
+
+        Args:
+            scheduler (FairScheduler, optional): Shared scheduler running the jobs of every batch.
+                Without one, each batch uses its generator's own thread pool.
+            keep_finished (int, optional): Finished jobs kept for later retrieval.
+        """
+        self.scheduler = scheduler
+        self._jobs: Dict[str, Job] = {}
+        self._keep_finished = keep_finished
+        self._lock = threading.Lock()
+
+    def submit(self, generator: Generator, bundle=None, session_id: str = None) -> str:
+        """
+        Start a batch in the background.
+
+        Args:
+            generator (Generator): Configured generator to run.
+            bundle (BundleExporter, optional): Bundle fed by the generator, closed when the job ends.
+            session_id (str, optional): Submitting session, used for fair scheduling.
+
+        Returns:
+            str: The job ID.
+        """
+        if self.scheduler is not None:
+            generator.executor = self.scheduler.executor_for(session_id or "default")
+
+        job = Job(generator, bundle=bundle, session_id=session_id)
+        with self._lock:
+            self._jobs[job.id] = job
+            self._prune()
+        threading.Thread(target=job.run, name=f"generation-job-{job.id}", daemon=True).start()
+        return job.id
+
+    def queue_stats(self, session_id: str = None) -> Optional[dict]:
+        """
+        Shared queue statistics, for one session or globally.
+
+        Returns:
+            dict: See FairScheduler.session_stats / FairScheduler.stats, None without a scheduler.
+        """
+        if self.scheduler is None:
+            return None
+        if session_id is None:
+            return self.scheduler.stats()
+        return self.scheduler.session_stats(session_id)
+
+    def get(self, job_id: str) -> Optional[Job]:
+        """Return the job with this ID, or None if unknown or pruned."""
+        with self._lock:
+            return self._jobs.get(job_id)
+
+    def cancel(self, job_id: str) -> bool:
+        """
+        Request cancellation of a job.
+
+        Returns:
+            bool: True if the job exists and was still running.
+        """
+        job = self.get(job_id)
+        if job is None or job.done:
+            return False
+        job.cancel()
+        return True
+
+    def jobs(self) -> List[Job]:
+        """All known jobs, most recent first."""
+        with self._lock:
+            return sorted(self._jobs.values(), key=lambda job: job.created_at, reverse=True)
+
+    def _prune(self) -> None:
+        """Forget the oldest finished jobs beyond `keep_finished` (lock held)."""
+        finished = sorted((job for job in self._jobs.values() if job.done), key=lambda job: job.created_at)
+        for job in finished[:max(0, len(finished) - self._keep_finished)]:
+            del self._jobs[job.id]
@@ -0,0 +1,203 @@
+import threading
+import time
+from collections import OrderedDict, deque
+from concurrent.futures import Future, ThreadPoolExecutor
+from typing import Callable, Dict, Optional
+from config import LLM_CONCURRENCY, SESSION_CONCURRENCY, LLM_REQUESTS_PER_MINUTE
+
+
+class _Task:
+    """A queued unit of work (one job posting) waiting for a worker slot."""
+
+    __slots__ = ("session_id", "fn", "args", "kwargs", "future", "enqueued_at")
+
+    def __init__(self, session_id: str, fn: Callable, args: tuple, kwargs: dict):
+        self.session_id = session_id
+        self.fn = fn
+        self.args = args
+        self.kwargs = kwargs
+        self.future = Future()
+        self.enqueued_at = time.monotonic()
+
+
+class SessionExecutor:
+    """
+    Executor-like handle submitting tasks to a FairScheduler on behalf of one session.
+
+    Exposes the `submit` method of `concurrent.futures.Executor`, so it can be
+    handed to a Generator in place of its private thread pool.
+    """
+
+    def __init__(self, scheduler: "FairScheduler", session_id: str):
+        self.scheduler = scheduler
+        self.session_id = session_id
+
+    def submit(self, fn: Callable, *args, **kwargs) -> Future:
+        """Queue `fn(*args, **kwargs)` and return its future."""
+        return self.scheduler.submit(self.session_id, fn, *args, **kwargs)
+
+
+class FairScheduler:
+    """
+    Process-wide task queue shared by every session of the hosted app.
+
+    Tasks are dispatched round-robin across sessions, with a global concurrency
+    limit (total LLM calls in flight), a per-session cap, and an optional
+    requests-per-minute ceiling, so one large batch cannot starve other users
+    or push the combined traffic over the provider's rate limits.
+    """
+
+    def __init__(self, max_concurrency: int = None, per_session: int = None,
+                 requests_per_minute: int = None):
+        """
+        Initialize the scheduler.
+
+        Args:
+            max_concurrency (int, optional): Tasks running at once across all sessions.
+                Falls back to LLM_CONCURRENCY from config.
+            per_session (int, optional): Tasks running at once for a single session.
+                Falls back to SESSION_CONCURRENCY from config.
+            requests_per_minute (int, optional): Maximum task starts per rolling minute,
+                0 to disable. Falls back to LLM_REQUESTS_PER_MINUTE from config.
+        """
+        self.max_concurrency = max(1, max_concurrency or LLM_CONCURRENCY)
+        self.per_session = max(1, per_session or SESSION_CONCURRENCY)
+        self.requests_per_minute = LLM_REQUESTS_PER_MINUTE if requests_per_minute is None else requests_per_minute
+
+        self._pool = ThreadPoolExecutor(max_workers=self.max_concurrency, thread_name_prefix="fair-scheduler")
+        self._cond = threading.Condition()
+        self._queues: "OrderedDict[str, deque]" = OrderedDict()
+        self._running: Dict[str, int] = {}
+        self._avg_wait: Dict[str, float] = {}
+        self._starts = deque()
+        self._active = 0
+
+        self._dispatcher = threading.Thread(target=self._dispatch_loop, name="fair-scheduler-dispatch", daemon=True)
+        self._dispatcher.start()
+
+    def executor_for(self, session_id: str) -> SessionExecutor:
+        """Return an executor submitting tasks on behalf of `session_id`."""
+        return SessionExecutor(self, session_id)
+
+    def submit(self, session_id: str, fn: Callable, *args, **kwargs) -> Future:
+        """
+        Queue a task for a session.
+
+        Returns:
+            Future: Resolved with the task's result once it has run.
+        """
+        task = _Task(session_id, fn, args, kwargs)
+        with self._cond:
+            self._queues.setdefault(session_id, deque()).append(task)
+            self._cond.notify_all()
+        return task.future
+
+    def _next_task(self) -> Optional[_Task]:
+        """Pop the next task in round-robin order, honouring every limit (lock held)."""
+        if self._active >= self.max_concurrency:
+            return None
+        for session_id in list(self._queues):
+            tasks = self._queues[session_id]
+            # Drop tasks whose future was cancelled while queued
+            while tasks and tasks[0].future.cancelled():
+                tasks.popleft().future.set_running_or_notify_cancel()
+            if not tasks:
+                del self._queues[session_id]
+                continue
+            if self._running.get(session_id, 0) >= self.per_session:
+                continue
+            # Rotate this session to the back so the next pick favours others
+            self._queues.move_to_end(session_id)
+            return tasks.popleft()
+        return None
+
+    def _rate_limit_delay(self) -> float:
+        """Seconds until another task may start under the per-minute ceiling (lock held)."""
+        if not self.requests_per_minute:
+            return 0.0
+        now = time.monotonic()
+        while self._starts and now - self._starts[0] >= 60:
+            self._starts.popleft()
+        if len(self._starts) < self.requests_per_minute:
+            return 0.0
+        return 60 - (now - self._starts[0])
+
+    def _dispatch_loop(self) -> None:
+        """Start queued tasks whenever a slot frees up."""
+        with self._cond:
+            while True:
+                delay = self._rate_limit_delay()
+                if delay > 0:
+                    self._cond.wait(timeout=delay)
+                    continue
+                task = self._next_task()
+                if task is None:
+                    self._cond.wait()
+                    continue
+                if not task.future.set_running_or_notify_cancel():
+                    continue
+
+                waited = time.monotonic() - task.enqueued_at
+                previous = self._avg_wait.get(task.session_id)
+                self._avg_wait[task.session_id] = waited if previous is None else 0.8 * previous + 0.2 * waited
+                self._running[task.session_id] = self._running.get(task.session_id, 0) + 1
+                self._active += 1
+                if self.requests_per_minute:
+                    self._starts.append(time.monotonic())
+                self._pool.submit(self._run, task)
+
+    def _run(self, task: _Task) -> None:
+        """Execute a task on a pool thread and release its slot."""
+        try:
+            task.future.set_result(task.fn(*task.args, **task.kwargs))
+        except BaseException as e:
+            task.future.set_exception(e)
+        finally:
+            with self._cond:
+                self._active -= 1
+                self._running[task.session_id] -= 1
+                if not self._running[task.session_id]:
+                    del self._running[task.session_id]
+                self._cond.notify_all()
+
+    def session_stats(self, session_id: str) -> dict:
+        """
+        Queue statistics for one session.
+
+        Returns:
+            dict: queued and running task counts, tasks queued by other sessions,
+            the wait of the oldest queued task and the average wait before a task starts.
+        """
+        now = time.monotonic()
+        with self._cond:
+            tasks = [task for task in self._queues.get(session_id, ()) if not task.future.cancelled()]
+            others = sum(
+                1 for sid, queued in self._queues.items() if sid != session_id
+                for task in queued if not task.future.cancelled()
+            )
+            return {
+                "queued": len(tasks),
+                "running": self._running.get(session_id, 0),
+                "queued_by_others": others,
+                "oldest_wait": now - tasks[0].enqueued_at if tasks else 0.0,
+                "avg_wait": self._avg_wait.get(session_id, 0.0),
+            }
+
+    def stats(self) -> dict:
+        """
+        Global queue statistics.
+
+        Returns:
+            dict: total queue depth, running tasks, limits and per-session statistics.
+        """
+        with self._cond:
+            sessions = set(self._queues) | set(self._running)
+            depth = sum(1 for queued in self._queues.values() for task in queued if not task.future.cancelled())
+            active = self._active
+        return {
+            "queue_depth": depth,
+            "running": active,
+            "max_concurrency": self.max_concurrency,
+            "per_session": self.per_session,
+            "sessions": {session_id: self.session_stats(session_id) for session_id in sessions},
+        }
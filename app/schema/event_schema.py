@@ -0,0 +1,38 @@
+from typing import Optional
+from pydantic import BaseModel, Field
+from schema.letter_schema import CoverLetterSchema
+
+
+class EventType:
+    """
+    Kinds of progress events emitted by the Generator.
+    """
+
+    BATCH_STARTED = "batch_started"
+    SCRAPE_DONE = "scrape_done"
+    CV_SELECTED = "cv_selected"
+    LANGUAGE_DETECTED = "language_detected"
+    LLM_STARTED = "llm_started"
+    LLM_FINISHED = "llm_finished"
+    FILE_WRITTEN = "file_written"
+    JOB_DONE = "job_done"
+    JOB_FAILED = "job_failed"
+    JOB_SKIPPED = "job_skipped"
+    BATCH_SUBMITTED = "batch_submitted"
+    BATCH_PROGRESS = "batch_progress"
+    BATCH_FINISHED = "batch_finished"
+
+
+class GenerationEvent(BaseModel):
+    """
+    Structured progress event for one stage of a generation batch.
+    """
+
+    type: str = Field(description="One of the EventType values")
+    job_index: Optional[int] = Field(default=None, description="Index of the job in the batch, None for batch events")
+    url: Optional[str] = Field(default=None, description="Job posting URL, None for batch events")
+    total: Optional[int] = Field(default=None, description="Number of jobs in the batch, None until a streamed source is read")
+    elapsed: float = Field(default=0.0, description="Duration of the stage in seconds")
+    timestamp: float = Field(description="Unix time at which the event was emitted")
+    data: dict = Field(default_factory=dict, description="Stage-specific details (language, path, error...)")
+    letter: Optional[CoverLetterSchema] = Field(default=None, description="Generated letter on job_done events")
@@ -1,3 +1,4 @@
+from typing import Optional
 from pydantic import BaseModel, Field
 
 class CoverLetterSchema(BaseModel):
@@ -9,6 +10,11 @@ class CoverLetterSchema(BaseModel):
         description="Title of the application (e.g. 'Application for Data Analyst position')"
     )
 
+    company: Optional[str] = Field(
+        default=None,
+        description="Name of the hiring company as written in the job posting, if stated"
+    )
+
     content: str = Field(
         description=(
             "Full cover letter content following a professional structure:\n"
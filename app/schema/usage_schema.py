@@ -0,0 +1,14 @@
+from typing import Optional
+from pydantic import BaseModel, Field
+
+
+class TokenUsage(BaseModel):
+    """
+    Token usage and estimated cost of one or more LLM calls.
+    """
+
+    input_tokens: int = Field(default=0, description="Prompt tokens billed by the provider")
+    output_tokens: int = Field(default=0, description="Completion tokens billed by the provider")
+    total_tokens: int = Field(default=0, description="Prompt plus completion tokens")
+    cost: Optional[float] = Field(default=None, description="Estimated cost in USD, None when the model price is unknown")
+    saved_tokens: int = Field(default=0, description="Estimated prompt tokens removed by truncation before the call")
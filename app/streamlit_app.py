@@ -8,14 +8,29 @@ import sys
 import subprocess
 import platform
 from pathlib import Path
-import pdfplumber
+import io
+import tempfile
+import time
+import uuid
 import warnings
+from datetime import datetime, timedelta, timezone
 
 # Add app directory to path
 sys.path.append(os.path.dirname(os.path.abspath(__file__)))
 
 from generator.generator import Generator
-from config import get_api_key, AVAILABLE_MODELS, validate_api_key
+from config import get_api_key, AVAILABLE_MODELS, MAX_WORKERS, RESULTS_DB_PATH, WARM_UP_MODELS, validate_api_key
+from tools.file_manager import PdfManager
+from tools.output_store import sanitize_filename
+from tools.bundle_exporter import BundleExporter
+from tools.results_db import ResultsDB
+from tools.ingest import iter_urls
+from generator.jobs import JobManager, JobStatus
+from generator.scheduler import FairScheduler
+from schema.event_schema import EventType
+from utils.simple_pdf_generator import SimplePDFGenerator, default_backend
+from utils.language_detector import LanguageDetector
+from utils.models import Models
 
 # Suppress PDF warnings
 warnings.filterwarnings('ignore', message='.*FontBBox.*')
@@ -82,22 +97,319 @@ def open_folder(path):
         st.error(f"Could not open folder: {e}")
         return False
 
+@st.cache_data(show_spinner="Reading CV...", max_entries=32)
+def _extract_pdf_text_cached(content_hash, _file_bytes):
+    """Extract text from PDF bytes, memoized by content hash across reruns and sessions."""
+    # Streamlit serves sessions from threads: no fork, one spawned pool for the whole app
+    return PdfManager.extract_text(_file_bytes, shared_pool=True)
+
 def extract_pdf_text(uploaded_file):
     """Extract text from uploaded PDF file."""
     try:
-        with warnings.catch_warnings():
-            warnings.simplefilter("ignore")
-            with pdfplumber.open(uploaded_file) as pdf:
-                text = ""
-                for page in pdf.pages:
-                    page_text = page.extract_text(x_tolerance=1.5, y_tolerance=2)
-                    if page_text:
-                        text += page_text + '\n'
-                return text
+        file_bytes = uploaded_file.getvalue()
+        return _extract_pdf_text_cached(PdfManager.content_hash(file_bytes), file_bytes)
     except Exception as e:
         st.error(f"Error reading PDF: {e}")
         return None
 
+@st.cache_resource
+def get_pdf_generator():
+    """Shared renderer, so styles and templates are built once per process."""
+    return SimplePDFGenerator()
+
+@st.cache_data(max_entries=256)
+def render_letter(title, content, backend):
+    """Letter rendered by the shared renderer, once per title, content and backend across reruns."""
+    return get_pdf_generator().render_bytes(title, content)
+
+@st.cache_resource
+def get_model(model_name):
+    """Structured-output model per model name, reused across reruns and sessions."""
+    return Generator.build_model(model_name)
+
+@st.cache_resource
+def warm_up_models():
+    """Open API connections once per process, in the background, before the first letter."""
+    return Models.warm_up(background=True)
+
+@st.cache_resource
+def get_job_manager():
+    """Process-wide job manager and fair scheduler, shared by every rerun and session."""
+    return JobManager(scheduler=FairScheduler())
+
+@st.cache_resource
+def get_results_db():
+    """Process-wide history of generated letters (None when RESULTS_DB_PATH is empty)."""
+    return ResultsDB(RESULTS_DB_PATH) if RESULTS_DB_PATH else None
+
+def set_job_id(job_id):
+    """Remember the active job in session state and in the URL (survives a browser refresh)."""
+    st.session_state.job_id = job_id
+    if hasattr(st, "query_params"):
+        if job_id:
+            st.query_params["job"] = job_id
+        elif "job" in st.query_params:
+            del st.query_params["job"]
+
+def get_query_job_id():
+    """Job ID carried in the page URL, if any."""
+    if hasattr(st, "query_params"):
+        return st.query_params.get("job")
+    return None
+
+def describe_event(event):
+    """Human-readable status line for a generator event."""
+    job = f"Job {event.job_index + 1}/{event.total or '?'}" if event.job_index is not None else ""
+    if event.type == EventType.BATCH_STARTED:
+        return f"Starting {event.total} job(s)..." if event.total else "Starting imported jobs..."
+    if event.type == EventType.SCRAPE_DONE:
+        return f"{job}: job description fetched in {event.elapsed:.1f}s"
+    if event.type == EventType.CV_SELECTED:
+        return f"{job}: using CV profile '{event.data['profile']}' (similarity: {event.data['score']:.2f})"
+    if event.type == EventType.LANGUAGE_DETECTED:
+        return f"{job}: detected {event.data['language_name']} (confidence: {event.data['confidence']:.2f})"
+    if event.type == EventType.LLM_STARTED:
+        return f"{job}: generating letter with {event.data['model']}..."
+    if event.type == EventType.LLM_FINISHED:
+        message = f"{job}: letter generated in {event.elapsed:.1f}s"
+        if event.data.get("repairs"):
+            message += f", repaired locally ({', '.join(event.data['repairs'])})"
+        if event.data.get("retries"):
+            message += f", {event.data['retries']} targeted retry(ies)"
+        if event.data.get("issues"):
+            message += f" — remaining issues: {', '.join(event.data['issues'])}"
+        return message
+    if event.type == EventType.FILE_WRITTEN:
+        return f"{job}: saved to {event.data['path']}"
+    if event.type == EventType.JOB_DONE:
+        return f"{job}: done in {event.elapsed:.1f}s"
+    if event.type == EventType.JOB_FAILED:
+        return f"{job}: failed ({event.data.get('error')})"
+    if event.type == EventType.JOB_SKIPPED:
+        if event.data.get("reason") == "unchanged":
+            return f"{job}: unchanged since the last run, skipped"
+        return f"{job}: already done in an earlier run"
+    if event.type == EventType.BATCH_FINISHED:
+        return f"✅ Generation complete in {event.elapsed:.1f}s"
+    return job
+
+def render_job(job):
+    """Show the live state of a background job and collect its results once finished."""
+    snapshot = job.snapshot()
+    
+    st.markdown("### Generation Progress")
+    st.progress(snapshot["progress"])
+    
+    events = snapshot["events"]
+    if snapshot["status"] == JobStatus.PENDING:
+        st.text("Waiting for a free worker...")
+    elif events:
+        st.text(describe_event(events[-1]))
+    
+    if not job.done:
+        queue = get_job_manager().queue_stats(job.session_id)
+        if queue and (queue["queued"] or queue["queued_by_others"]):
+            st.caption(
+                f"Shared queue: {queue['running']} running and {queue['queued']} waiting for you, "
+                f"{queue['queued_by_others']} waiting for other users · "
+                f"average wait {queue['avg_wait']:.0f}s"
+            )
+        
+        if st.button("⏹️ Cancel", key="cancel_job"):
+            job.cancel()
+            st.toast("Cancelling: letters already in progress will still finish")
+        
+        # Letters are shown as soon as they are ready
+        for letter in snapshot["results"]:
+            with st.expander(f"📝 {letter.title}"):
+                st.text(letter.content)
+    
+    for url, error in snapshot["errors"]:
+        st.warning(f"⚠️ {url}: {error}")
+    
+    if job.done:
+        if snapshot["status"] == JobStatus.FAILED:
+            st.error(f"❌ An error occurred: {snapshot['error']}")
+        elif snapshot["status"] == JobStatus.CANCELLED:
+            st.info(f"Cancelled after {len(snapshot['results'])} letter(s).")
+        elif not snapshot["results"]:
+            st.warning("No cover letters were generated. Please check the URLs.")
+        
+        # Keep results across reruns triggered by the download buttons
+        if st.session_state.bundle is not None:
+            st.session_state.bundle.stream.close()
+        st.session_state.results = snapshot["results"]
+        st.session_state.bundle = job.bundle
+        st.session_state.tracer = job.generator.tracer
+        st.session_state.usage = job.generator.usage.summary()
+        set_job_id(None)
+
+def format_cost(cost):
+    """Estimated cost for display ("n/a" when the model price is unknown)."""
+    return f"${cost:.4f}" if cost is not None else "n/a"
+
+def render_usage(usage):
+    """Token usage and estimated cost of the last batch, per model and per letter."""
+    batch = usage["batch"]
+    if not batch["total_tokens"]:
+        return
+    col1, col2, col3 = st.columns(3)
+    col1.metric("Prompt tokens", f"{batch['input_tokens']:,}")
+    col2.metric("Completion tokens", f"{batch['output_tokens']:,}")
+    col3.metric("Estimated cost", format_cost(batch["cost"]))
+    with st.expander("🧮 Token usage details"):
+        st.caption(f"Truncation saved about {batch['saved_tokens']:,} prompt tokens.")
+        st.table([
+            {"Model": name, "Prompt": stats["input_tokens"], "Completion": stats["output_tokens"],
+             "Cost": format_cost(stats["cost"])}
+            for name, stats in usage["models"].items()
+        ])
+        st.table([
+            {"Letter": job["title"], "Prompt": job["input_tokens"], "Completion": job["output_tokens"],
+             "Cost": format_cost(job["cost"])}
+            for job in usage["jobs"]
+        ])
+
+def render_stage_timings(tracer):
+    """Per-stage duration statistics of the last batch, with its trace as a download."""
+    stages = sorted(tracer.summary().items(), key=lambda item: item[1]["total"], reverse=True)
+    if not stages:
+        return
+    with st.expander("⏱️ Stage timings"):
+        st.table([
+            {
+                "Stage": name,
+                "Count": stats["count"],
+                "p50 (s)": round(stats["p50"], 3),
+                "p95 (s)": round(stats["p95"], 3),
+                "Max (s)": round(stats["max"], 3),
+            }
+            for name, stats in stages
+        ])
+        trace = io.StringIO()
+        tracer.export_jsonl(trace)
+        st.download_button(
+            "⬇️ Download trace (JSONL)",
+            data=trace.getvalue(),
+            file_name=f"trace_{tracer.trace_id}.jsonl",
+            mime="application/x-ndjson",
+            key="download_trace"
+        )
+
+def render_results(results):
+    """Show generated letters with in-memory download buttons."""
+    st.success(f"🎉 Successfully generated {len(results)} cover letter(s)!")
+    
+    # Show generated letters
+    st.markdown("### 📄 Generated Cover Letters")
+    pdf_generator = get_pdf_generator()
+    for i, letter in enumerate(results, 1):
+        with st.expander(f"📝 {letter.title}", expanded=(i==1)):
+            st.markdown(f"**Preview:**")
+            st.text(letter.content[:500] + "..." if len(letter.content) > 500 else letter.content)
+            st.download_button(
+                "⬇️ Download",
+                data=render_letter(letter.title, letter.content, pdf_generator.backend),
+                file_name=f"{sanitize_filename(letter.title) or 'cover_letter'}{pdf_generator.extension}",
+                mime=pdf_generator.mime_type,
+                key=f"download_{i}"
+            )
+    
+    # Whole batch as a single download
+    bundle = st.session_state.bundle
+    if bundle is not None and bundle.count:
+        # download_button takes bytes or a real file, not the spooled temporary file
+        bundle_file = bundle.stream
+        bundle_file.seek(0)
+        st.download_button(
+            f"📦 Download all {bundle.count} letter(s)",
+            data=bundle_file.read(),
+            file_name=f"cover_letters{bundle.extension}",
+            mime=bundle.mime_type,
+            key="download_bundle",
+            use_container_width=True
+        )
+    
+    if st.session_state.usage:
+        render_usage(st.session_state.usage)
+    
+    tracer = st.session_state.tracer
+    if tracer is not None:
+        render_stage_timings(tracer)
+    
+    # Success message with folder button
+    if st.session_state.save_files:
+        col1, col2 = st.columns([3, 1])
+        with col1:
+            st.info(f"📁 Files saved to: {st.session_state.destination_path}")
+        with col2:
+            if st.button("📂 Open Folder", key="open_results"):
+                open_folder(st.session_state.destination_path)
+
+def render_history(db, page_size=20):
+    """Browse previously generated letters one page at a time, with filters."""
+    with st.expander("🗂️ History"):
+        col1, col2, col3 = st.columns(3)
+        company = col1.selectbox("Company", [""] + db.distinct("company"), key="history_company",
+                                 format_func=lambda value: value or "All")
+        language = col2.selectbox("Language", [""] + db.distinct("language"), key="history_language",
+                                  format_func=lambda value: LanguageDetector.get_language_name(value) if value else "All")
+        period = col3.selectbox("Period", [0, 7, 30, 365], key="history_period",
+                                format_func=lambda days: f"Last {days} days" if days else "All time")
+        search = st.text_input("Title contains", key="history_search")
+        filters = {
+            "company": company or None,
+            "language": language or None,
+            "since": datetime.now(timezone.utc) - timedelta(days=period) if period else None,
+            "search": search or None,
+        }
+        
+        # Keyset cursors of the pages before the current one; reset when the filters change
+        filter_key = (company, language, period, search)
+        if st.session_state.history_filters != filter_key:
+            st.session_state.history_filters = filter_key
+            st.session_state.history_cursors = []
+        cursors = st.session_state.history_cursors
+        
+        total = db.count(**filters)
+        rows = db.page(page_size, before=cursors[-1] if cursors else None, **filters)
+        if not rows:
+            st.caption("No letters match these filters.")
+            return
+        first = len(cursors) * page_size + 1
+        st.caption(f"Letters {first}-{first + len(rows) - 1} of {total}")
+        st.table([
+            {"Date": row["created_at"][:16].replace("T", " "), "Company": row["company"] or "",
+             "Title": row["title"], "Language": row["language"] or "", "Model": row["model"] or "",
+             "Tokens": row["total_tokens"]}
+            for row in rows
+        ])
+        
+        col1, col2 = st.columns(2)
+        if col1.button("⬅️ Newer", key="history_newer", disabled=not cursors):
+            cursors.pop()
+            st.rerun()
+        if col2.button("Older ➡️", key="history_older", disabled=first + len(rows) - 1 >= total):
+            cursors.append((rows[-1]["created_at"], rows[-1]["id"]))
+            st.rerun()
+        
+        # Only the selected letter's content is loaded
+        selected = st.selectbox("Open letter", [None] + [row["id"] for row in rows], key="history_open",
+                                format_func=lambda record_id: "—" if record_id is None else
+                                next(row["title"] for row in rows if row["id"] == record_id))
+        record = db.get(selected) if selected is not None else None
+        if record:
+            st.caption(record["url"])
+            st.text(record["content"])
+            pdf_generator = get_pdf_generator()
+            st.download_button(
+                "⬇️ Download",
+                data=render_letter(record["title"], record["content"], pdf_generator.backend),
+                file_name=f"{sanitize_filename(record['title']) or 'cover_letter'}{pdf_generator.extension}",
+                mime=pdf_generator.mime_type,
+                key="download_history"
+            )
+
 def main():
     # Initialize session state
     if 'cv_content' not in st.session_state:
@@ -108,12 +420,38 @@ def main():
         st.session_state.destination_path = str(Path.home() / "Documents" / "CoverLetters")
     if 'selected_model' not in st.session_state:
         st.session_state.selected_model = AVAILABLE_MODELS[0]
+    if 'save_files' not in st.session_state:
+        st.session_state.save_files = True
+    if 'results' not in st.session_state:
+        st.session_state.results = []
+    if 'bundle' not in st.session_state:
+        st.session_state.bundle = None
+    if 'session_id' not in st.session_state:
+        st.session_state.session_id = uuid.uuid4().hex
+    if 'job_id' not in st.session_state:
+        st.session_state.job_id = get_query_job_id()
+    if 'max_workers' not in st.session_state:
+        st.session_state.max_workers = MAX_WORKERS
+    if 'tracer' not in st.session_state:
+        st.session_state.tracer = None
+    if 'usage' not in st.session_state:
+        st.session_state.usage = None
+    if 'bundle_format' not in st.session_state:
+        st.session_state.bundle_format = "zip"
+    if 'cv_profiles' not in st.session_state:
+        st.session_state.cv_profiles = {}
+    if 'history_filters' not in st.session_state:
+        st.session_state.history_filters = None
+    if 'history_cursors' not in st.session_state:
+        st.session_state.history_cursors = []
         
     # Check API key
     if not validate_api_key():
         st.error("⚠️ GROQ_API_KEY not found in environment variables. Please set it up before using the app.")
         st.info("Set GROQ_API_KEY in your .env file or environment variables.")
         st.stop()
+    if WARM_UP_MODELS:
+        warm_up_models()
     
     # Header
     st.markdown("""
@@ -148,19 +486,42 @@ def main():
         elif st.session_state.cv_filename:
             st.info(f"Using: {st.session_state.cv_filename}")
         
+        # Tailored variants: the closest CV is picked for each job posting
+        profile_files = st.file_uploader(
+            "Other CV profiles (optional)",
+            type=["pdf"],
+            accept_multiple_files=True,
+            key="cv_profiles_upload",
+            help="E.g. data, backend and management versions of your CV"
+        )
+        st.session_state.cv_profiles = {}
+        for profile_file in profile_files or []:
+            profile_text = extract_pdf_text(profile_file)
+            if profile_text:
+                st.session_state.cv_profiles[Path(profile_file.name).stem] = profile_text
+        if st.session_state.cv_profiles:
+            st.caption(f"Best match per job among {len(st.session_state.cv_profiles) + 1} CVs")
+        
         st.markdown("---")
         
         # Destination Folder
         st.markdown("### 📁 Output Folder")
+        st.session_state.save_files = st.checkbox(
+            "Save copies to a folder",
+            value=st.session_state.save_files,
+            key="save_files_input",
+            help="Letters can always be downloaded directly from the results"
+        )
         destination = st.text_input(
             "Destination path",
             value=st.session_state.destination_path,
             key="destination_input",
-            help="Enter the full path where cover letters will be saved"
+            help="Enter the full path where cover letters will be saved",
+            disabled=not st.session_state.save_files
         )
         
         # Validate and create directory
-        if destination:
+        if destination and st.session_state.save_files:
             try:
                 Path(destination).mkdir(parents=True, exist_ok=True)
                 st.session_state.destination_path = destination
@@ -192,6 +553,31 @@ def main():
         if selected_model in model_info:
             st.caption(model_info[selected_model])
         
+        st.session_state.max_workers = st.slider(
+            "Parallel jobs",
+            min_value=1,
+            max_value=8,
+            value=st.session_state.max_workers,
+            key="max_workers_input",
+            help="Number of job postings processed at the same time"
+        )
+        
+        st.markdown("---")
+        
+        # Bundle format
+        st.markdown("### 📦 Batch Download")
+        bundle_formats = {"zip": "ZIP archive", "pdf": "Merged PDF"}
+        if default_backend() == "html":
+            bundle_formats.pop("pdf")
+        st.session_state.bundle_format = st.radio(
+            "Download all letters as",
+            options=list(bundle_formats),
+            format_func=bundle_formats.get,
+            index=list(bundle_formats).index(st.session_state.bundle_format)
+            if st.session_state.bundle_format in bundle_formats else 0,
+            key="bundle_format_input"
+        )
+        
         st.markdown("---")
         
         # Features list
@@ -212,12 +598,19 @@ def main():
         st.markdown("### 📊 Status")
         status_items = [
             ("CV", "✅" if st.session_state.cv_content else "❌"),
-            ("Output", "✅" if st.session_state.destination_path else "❌"),
+            ("Output", "✅" if st.session_state.destination_path or not st.session_state.save_files else "❌"),
             ("Model", "✅"),
             ("API Key", "✅" if get_api_key() else "❌")
         ]
         for item, status in status_items:
             st.write(f"{item}: {status}")
+        
+        queue = get_job_manager().queue_stats()
+        if queue:
+            st.caption(
+                f"Shared queue: {queue['running']}/{queue['max_concurrency']} running, "
+                f"{queue['queue_depth']} waiting across {len(queue['sessions'])} session(s)"
+            )
     
     # Main content area
     col1, col2 = st.columns([2, 1])
@@ -262,19 +655,39 @@ def main():
             if st.button("🗑️ Clear All", type="secondary", use_container_width=True):
                 st.session_state.urls = ['']
                 st.rerun()
+        
+        # Large lists are streamed into the batch instead of becoming input fields
+        with st.expander("📥 Bulk import (CSV, TXT, RSS/Atom feed, sitemap)"):
+            import_file = st.file_uploader(
+                "URL list or feed file",
+                type=["csv", "txt", "xml", "rss", "atom"],
+                key="import_file"
+            )
+            import_url = st.text_input(
+                "Feed or sitemap URL",
+                key="import_url",
+                placeholder="https://example.com/jobs/feed.xml"
+            ).strip()
+            import_match = st.text_input(
+                "Only URLs containing (regular expression)",
+                key="import_match",
+                placeholder="/jobs?/"
+            ).strip()
+            st.caption("Imported URLs are read while the batch runs and duplicates are skipped.")
     
     with col2:        
         # Display stats
         valid_urls = [url for url in st.session_state.urls if url.strip()]
+        has_import = import_file is not None or bool(import_url)
         
         metric_col1, metric_col2 = st.columns(2)
         with metric_col1:
-            st.metric("Total URLs", len(valid_urls))
+            st.metric("Total URLs", f"{len(valid_urls)} + import" if has_import else len(valid_urls))
         with metric_col2:
-            st.metric("Ready", "✅" if valid_urls else "❌")
+            st.metric("Ready", "✅" if valid_urls or has_import else "❌")
         
         # Language detection preview
-        if valid_urls:
+        if valid_urls or has_import:
             st.markdown("### 🌍 Expected Languages")
             st.info("Language will be auto-detected from each job posting")
     
@@ -282,13 +695,19 @@ def main():
     st.markdown("---")
     
     # Check if ready to generate
-    can_generate = valid_urls and st.session_state.cv_content and st.session_state.destination_path
+    has_output = st.session_state.destination_path or not st.session_state.save_files
+    can_generate = (valid_urls or has_import) and st.session_state.cv_content and has_output
     
     if not st.session_state.cv_content:
         st.warning("⚠️ Please upload your CV in the sidebar before generating cover letters.")
     
-    if st.button("Generate Cover Letters", type="primary", use_container_width=True, disabled=not can_generate):
-        if not valid_urls:
+    job_manager = get_job_manager()
+    job = job_manager.get(st.session_state.job_id) if st.session_state.job_id else None
+    running = job is not None and not job.done
+    
+    if st.button("Generate Cover Letters", type="primary", use_container_width=True,
+                 disabled=not can_generate or running):
+        if not valid_urls and not has_import:
             st.error("Please enter at least one URL")
             return
         
@@ -296,70 +715,59 @@ def main():
             st.error("Please upload your CV first")
             return
         
-        # Create progress container
-        progress_container = st.container()
-        
-        with progress_container:
-            st.markdown("### Generation Progress")
+        try:
+            # Bundle is spooled to a temporary file once it outgrows memory
+            bundle_file = tempfile.SpooledTemporaryFile(max_size=8 * 1024 * 1024)
+            bundle = BundleExporter(bundle_file, fmt=st.session_state.bundle_format,
+                                    pdf_generator=get_pdf_generator())
             
-            # Progress bar
-            progress_bar = st.progress(0)
-            status_text = st.empty()
+            # Typed URLs first, then the imports, read lazily by the background job
+            sources = [io.BytesIO("\n".join(valid_urls).encode("utf-8"))]
+            if import_file is not None:
+                upload = io.BytesIO(import_file.getvalue())
+                upload.name = import_file.name  # format is guessed from the extension
+                sources.append(upload)
+            if import_url:
+                sources.append(import_url)
+            urls = valid_urls if not has_import else iter_urls(*sources, match=import_match or None)
             
-            # Results container
-            results_container = st.container()
+            cv_profiles = None
+            if st.session_state.cv_profiles:
+                from utils.cv_profiles import CVProfiles
+                main_name = Path(st.session_state.cv_filename or "cv").stem
+                cv_profiles = CVProfiles({main_name: st.session_state.cv_content, **st.session_state.cv_profiles})
             
-            try:
-                # Initialize generator with user-provided parameters
-                status_text.text("Initializing generator...")
-                generator = Generator(
-                    urls=valid_urls,
-                    cv_content=st.session_state.cv_content,
-                    destination_path=st.session_state.destination_path,
-                    model_name=st.session_state.selected_model
-                )
-                
-                # Simulate progress (in real app, update based on actual progress)
-                status_text.text("Fetching job descriptions...")
-                progress_bar.progress(25)
-                
-                status_text.text("Detecting languages...")
-                progress_bar.progress(50)
-                
-                status_text.text("Generating cover letters...")
-                progress_bar.progress(75)
-                
-                # Run generation
-                results = generator.run()
-                
-                progress_bar.progress(100)
-                status_text.text("✅ Generation complete!")
-                
-                # Display results
-                if results:
-                    with results_container:
-                        st.success(f"🎉 Successfully generated {len(results)} cover letter(s)!")
-                        
-                        # Show generated letters
-                        st.markdown("### 📄 Generated Cover Letters")
-                        for i, letter in enumerate(results, 1):
-                            with st.expander(f"📝 {letter.title}", expanded=(i==1)):
-                                st.markdown(f"**Preview:**")
-                                st.text(letter.content[:500] + "..." if len(letter.content) > 500 else letter.content)
-                        
-                        # Success message with folder button
-                        col1, col2 = st.columns([3, 1])
-                        with col1:
-                            st.info(f"📁 Files saved to: {st.session_state.destination_path}")
-                        with col2:
-                            if st.button("📂 Open Folder", key="open_results"):
-                                open_folder(st.session_state.destination_path)
-                else:
-                    st.warning("No cover letters were generated. Please check the URLs.")
-                    
-            except Exception as e:
-                st.error(f"❌ An error occurred: {str(e)}")
-                st.exception(e)
+            # Initialize generator with user-provided parameters
+            generator = Generator(
+                urls=urls,
+                cv_content=st.session_state.cv_content,
+                destination_path=st.session_state.destination_path,
+                model_name=st.session_state.selected_model,
+                save_files=st.session_state.save_files,
+                bundle=bundle,
+                max_workers=st.session_state.max_workers,
+                model=get_model(st.session_state.selected_model),
+                results_db=get_results_db(),
+                cv_profiles=cv_profiles
+            )
+            
+            # Run in the background so the page stays responsive across reruns
+            set_job_id(job_manager.submit(generator, bundle=bundle, session_id=st.session_state.session_id))
+            st.rerun()
+        except Exception as e:
+            st.error(f"❌ An error occurred: {str(e)}")
+            st.exception(e)
+    
+    if job is not None:
+        render_job(job)
+    
+    # Display results
+    if st.session_state.results and not running:
+        render_results(st.session_state.results)
+    
+    results_db = get_results_db()
+    if results_db is not None:
+        render_history(results_db)
     
     # Footer
     st.markdown("---")
@@ -373,5 +781,10 @@ def main():
         unsafe_allow_html=True
     )
 
+    # Poll the background job until it finishes
+    if running:
+        time.sleep(1)
+        st.rerun()
+
 if __name__ == "__main__":
     main()
\ No newline at end of file
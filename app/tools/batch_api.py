@@ -0,0 +1,182 @@
+import json
+import os
+import tempfile
+from pathlib import Path
+from typing import Iterator, List, Optional
+from config import get_api_key, BATCH_COST_FACTOR
+from schema.usage_schema import TokenUsage
+from utils.letter_validator import parse_letter_json
+from utils.models import GROQ_API_BASE, Models
+from utils.usage import estimate_cost
+
+# Endpoint of every request line (relative to the API version root)
+CHAT_COMPLETIONS = "/v1/chat/completions"
+
+# Batch statuses after which nothing changes any more
+TERMINAL_STATUSES = {"completed", "failed", "expired", "cancelled"}
+
+# LangChain message types -> chat-completions roles
+ROLES = {"system": "system", "human": "user", "ai": "assistant"}
+
+# Batch input files can be large: uploads and downloads get a longer timeout than chat calls
+TRANSFER_TIMEOUT = 600.0
+
+
+def chat_request(custom_id: str, messages: list, model: str, tool: dict,
+                 temperature: float = None, max_tokens: int = None) -> dict:
+    """
+    One line of a batch input file: a chat completion forced to call `tool`,
+    which is how the structured output of the interactive mode is requested too.
+
+    Args:
+        custom_id (str): Identifier echoed in the result line.
+        messages (list): LangChain messages of the rendered prompt.
+        model (str): Model name.
+        tool (dict): OpenAI tool definition of the output schema (see `convert_to_openai_tool`).
+        temperature (float, optional): Sampling temperature.
+        max_tokens (int, optional): Completion length limit.
+
+    Returns:
+        dict: The request line.
+    """
+    body = {
+        "model": model,
+        "messages": [{"role": ROLES.get(message.type, message.type), "content": message.content}
+                     for message in messages],
+        "tools": [tool],
+        "tool_choice": {"type": "function", "function": {"name": tool["function"]["name"]}},
+    }
+    if temperature is not None:
+        body["temperature"] = temperature
+    if max_tokens is not None:
+        body["max_tokens"] = max_tokens
+    return {"custom_id": custom_id, "method": "POST", "url": CHAT_COMPLETIONS, "body": body}
+
+
+def response_letter(body: dict) -> Optional[dict]:
+    """
+    Letter fields of a chat completion from a result line: the tool-call arguments,
+    else the message content, recovered with `parse_letter_json` if malformed.
+
+    Returns:
+        dict: "title", "content" and possibly "company", or None when the response holds no letter.
+    """
+    message = ((body.get("choices") or [{}])[0]).get("message") or {}
+    texts = [(call.get("function") or {}).get("arguments") for call in message.get("tool_calls") or []]
+    texts.append(message.get("content"))
+    return next(filter(None, (parse_letter_json(text) for text in texts if isinstance(text, str))), None)
+
+
+def response_usage(body: dict, model_name: str) -> TokenUsage:
+    """Token usage of a chat completion from a result line, priced at the batch rate."""
+    usage = body.get("usage") or {}
+    input_tokens = usage.get("prompt_tokens") or 0
+    output_tokens = usage.get("completion_tokens") or 0
+    cost = estimate_cost(model_name, input_tokens, output_tokens)
+    return TokenUsage(
+        input_tokens=input_tokens,
+        output_tokens=output_tokens,
+        total_tokens=usage.get("total_tokens") or input_tokens + output_tokens,
+        cost=cost * BATCH_COST_FACTOR if cost is not None else None
+    )
+
+
+def iter_results(path: str) -> Iterator[dict]:
+    """Lines of a batch output or error file, read one at a time."""
+    with open(path, encoding="utf-8") as f:
+        for line in f:
+            if line.strip():
+                yield json.loads(line)
+
+
+class BatchClient:
+    """
+    Client of the provider's OpenAI-compatible batch API: a JSONL file of requests
+    is uploaded, processed offline within a completion window, and its results are
+    downloaded as another JSONL file.
+
+    Batch requests do not count against the per-minute rate limits and are billed
+    at a discount (BATCH_COST_FACTOR), at the price of latency.
+    """
+
+    def __init__(self, base_url: str = None, api_key: str = None, http_client=None):
+        """
+        Args:
+            base_url (str, optional): API root. Falls back to GROQ_BASE_URL (e.g. a local stub) or Groq.
+            api_key (str, optional): API key. Falls back to GROQ_API_KEY.
+            http_client (httpx.Client, optional): Client to use. Defaults to the pooled client of Models.
+        """
+        self.base_url = (base_url or GROQ_API_BASE).rstrip("/") + "/openai/v1"
+        self.api_key = api_key or get_api_key()
+        if not self.api_key:
+            raise ValueError("GROQ_API_KEY not set. Please set it in .env file or Streamlit secrets.")
+        self.http = http_client or Models.get_http_client()
+
+    def _request(self, method: str, path: str, **kwargs):
+        response = self.http.request(method, self.base_url + path,
+                                     headers={"Authorization": f"Bearer {self.api_key}"}, **kwargs)
+        response.raise_for_status()
+        return response
+
+    def upload(self, path: str) -> str:
+        """
+        Upload a batch input file.
+
+        Returns:
+            str: The file id.
+        """
+        with open(path, "rb") as f:
+            response = self._request("POST", "/files", data={"purpose": "batch"},
+                                     files={"file": (Path(path).name, f, "application/jsonl")},
+                                     timeout=TRANSFER_TIMEOUT)
+        return response.json()["id"]
+
+    def create(self, input_file_id: str, completion_window: str = "24h") -> dict:
+        """
+        Start processing an uploaded input file.
+
+        Returns:
+            dict: The batch object ("id", "status", "request_counts"...).
+        """
+        return self._request("POST", "/batches", json={
+            "input_file_id": input_file_id,
+            "endpoint": CHAT_COMPLETIONS,
+            "completion_window": completion_window,
+        }).json()
+
+    def get(self, batch_id: str) -> dict:
+        """Current state of a batch."""
+        return self._request("GET", f"/batches/{batch_id}").json()
+
+    def cancel(self, batch_id: str) -> dict:
+        """Stop a batch; requests already processed are still returned."""
+        return self._request("POST", f"/batches/{batch_id}/cancel").json()
+
+    def download(self, file_id: str, path: str) -> None:
+        """
+        Stream a result file to `path`, replaced atomically once complete.
+
+        Args:
+            file_id (str): Output or error file id of a batch.
+            path (str): Destination file.
+        """
+        path = Path(path)
+        fd, tmp_name = tempfile.mkstemp(dir=path.parent, prefix=".tmp-", suffix=".jsonl")
+        try:
+            with os.fdopen(fd, "wb") as f, self.http.stream(
+                "GET", f"{self.base_url}/files/{file_id}/content",
+                headers={"Authorization": f"Bearer {self.api_key}"}, timeout=TRANSFER_TIMEOUT
+            ) as response:
+                response.raise_for_status()
+                for chunk in response.iter_bytes():
+                    f.write(chunk)
+            os.replace(tmp_name, path)
+        except BaseException:
+            os.unlink(tmp_name)
+            raise
+
+    @staticmethod
+    def counts(batch: dict) -> List[int]:
+        """Completed, failed and total requests of a batch object."""
+        counts = batch.get("request_counts") or {}
+        return [counts.get("completed") or 0, counts.get("failed") or 0, counts.get("total") or 0]
@@ -0,0 +1,116 @@
+import zipfile
+from typing import BinaryIO, Union
+from pathlib import Path
+from utils.simple_pdf_generator import SimplePDFGenerator
+from tools.output_store import sanitize_filename
+
+
+class BundleExporter:
+    """
+    Collects a whole batch of cover letters into a single downloadable bundle.
+
+    Two formats are supported:
+    - "zip": every letter is rendered straight into its own ZIP entry as soon as
+      it is added, so only the letter being written is ever held in memory.
+    - "pdf": letters are merged into one multi-page PDF. Only the letter texts are
+      kept until `close()`, where the document is laid out in a single pass.
+    """
+
+    FORMATS = ("zip", "pdf")
+
+    def __init__(self, target: Union[str, Path, BinaryIO], fmt: str = "zip",
+                 pdf_generator: SimplePDFGenerator = None):
+        """
+        Initialize the bundle exporter.
+
+        Args:
+            target (str | Path | BinaryIO): File path or writable binary stream receiving the bundle.
+            fmt (str, optional): "zip" or "pdf". Defaults to "zip".
+            pdf_generator (SimplePDFGenerator, optional): Renderer to use. A new one is created if omitted.
+        """
+        if fmt not in self.FORMATS:
+            raise ValueError(f"Unknown bundle format: {fmt}")
+
+        self.format = fmt
+        self.pdf_generator = pdf_generator or SimplePDFGenerator()
+        if fmt == "pdf" and self.pdf_generator.backend == "html":
+            raise ValueError("Merged PDF export requires reportlab or fpdf")
+
+        self.count = 0
+        self._names = set()
+        self._letters = []
+        self._closed = False
+
+        if isinstance(target, (str, Path)):
+            self._stream = open(target, "wb")
+            self._owns_stream = True
+        else:
+            self._stream = target
+            self._owns_stream = False
+
+        self._zip = zipfile.ZipFile(self._stream, "w", zipfile.ZIP_DEFLATED) if fmt == "zip" else None
+
+    @property
+    def stream(self) -> BinaryIO:
+        """Underlying binary stream receiving the bundle."""
+        return self._stream
+
+    @property
+    def extension(self) -> str:
+        """File extension of the bundle."""
+        return ".zip" if self.format == "zip" else ".pdf"
+
+    @property
+    def mime_type(self) -> str:
+        """MIME type of the bundle."""
+        return "application/zip" if self.format == "zip" else "application/pdf"
+
+    def add(self, title: str, content: str) -> None:
+        """
+        Append a letter to the bundle.
+
+        Args:
+            title (str): The title of the letter (used as entry name and document title).
+            content (str): The content/body of the letter.
+        """
+        if self._closed:
+            raise ValueError("Cannot add letters to a closed bundle")
+
+        if self._zip is not None:
+            with self._zip.open(self._entry_name(title), "w") as entry:
+                self.pdf_generator.render_to_stream(title, content, entry)
+        else:
+            self._letters.append((title, content))
+        self.count += 1
+
+    def close(self) -> None:
+        """Finish the bundle and release the underlying stream if it was opened here."""
+        if self._closed:
+            return
+        self._closed = True
+
+        if self._zip is not None:
+            self._zip.close()
+        elif self._letters:
+            self.pdf_generator.render_merged(self._letters, self._stream)
+            self._letters = []
+
+        if self._owns_stream:
+            self._stream.close()
+
+    def _entry_name(self, title: str) -> str:
+        """Build a unique archive entry name from a letter title."""
+        base = sanitize_filename(title) or "cover_letter"
+        name = f"{base}{self.pdf_generator.extension}"
+        suffix = 2
+        while name in self._names:
+            name = f"{base} ({suffix}){self.pdf_generator.extension}"
+            suffix += 1
+        self._names.add(name)
+        return name
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        self.close()
@@ -0,0 +1,158 @@
+import json
+import os
+import queue
+import threading
+import time
+from pathlib import Path
+from typing import Dict, Optional
+
+
+class JobStage:
+    """
+    Stages recorded in the checkpoint journal for each job.
+    """
+
+    SCRAPED = "scraped"
+    GENERATED = "generated"
+    DONE = "done"
+    FAILED = "failed"
+
+
+class CheckpointJournal:
+    """
+    Append-only, crash-safe journal of a generation batch.
+
+    Each job records its stage completions and outputs (scraped text,
+    generated letter, saved path) as JSON lines, keyed by URL, so an
+    interrupted batch can be resumed without redoing finished work.
+
+    Appends never block the caller: a background writer drains the pending
+    records, writes them with one `write` and makes them durable with one
+    `fsync` (group commit), so the fsync cost is shared by every record
+    written meanwhile.
+    """
+
+    def __init__(self, path: str):
+        """
+        Open (or create) the journal.
+
+        Args:
+            path (str): Journal file, appended to if it exists.
+        """
+        self.path = Path(path)
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        self._fd = os.open(self.path, os.O_WRONLY | os.O_APPEND | os.O_CREAT, 0o644)
+        self._queue = queue.Queue()
+        self._durable = threading.Condition()
+        self._appended = 0
+        self._written = 0
+        self._closed = False
+        self.error = None
+        self._writer = threading.Thread(target=self._write_loop, name="checkpoint-writer", daemon=True)
+        self._writer.start()
+
+    def append(self, url: str, stage: str, **data) -> None:
+        """
+        Record that a job reached a stage (returns before the record is durable).
+
+        Args:
+            url (str): Job posting URL.
+            stage (str): One of the JobStage values.
+            **data: Outputs of the stage (application, title, content, path, error...).
+        """
+        record = {"url": url, "stage": stage, "ts": time.time(), **data}
+        line = (json.dumps(record, ensure_ascii=False) + "\n").encode("utf-8")
+        with self._durable:
+            if self._closed:
+                raise ValueError("Checkpoint journal is closed")
+            self._appended += 1
+        self._queue.put(line)
+
+    def _write_loop(self) -> None:
+        """Write and fsync pending records in groups until the journal is closed."""
+        while True:
+            lines = [self._queue.get()]
+            while True:
+                try:
+                    lines.append(self._queue.get_nowait())
+                except queue.Empty:
+                    break
+            stop = lines[-1] is None
+            lines = [line for line in lines if line is not None]
+            if lines:
+                try:
+                    os.write(self._fd, b"".join(lines))
+                    os.fsync(self._fd)
+                except OSError as e:
+                    # A journal failure must not stop the batch; resume will just redo more work
+                    if self.error is None:
+                        print(f"⚠️ Checkpoint journal write failed: {e}")
+                    self.error = e
+            with self._durable:
+                self._written += len(lines)
+                self._durable.notify_all()
+            if stop:
+                return
+
+    def flush(self, timeout: Optional[float] = None) -> bool:
+        """
+        Wait until every record appended so far is written and fsync'd.
+
+        Returns:
+            bool: False if the timeout expired first.
+        """
+        with self._durable:
+            target = self._appended
+            return self._durable.wait_for(lambda: self._written >= target, timeout)
+
+    def close(self) -> None:
+        """Flush pending records and close the file."""
+        with self._durable:
+            if self._closed:
+                return
+            self._closed = True
+        self._queue.put(None)
+        self._writer.join()
+        os.close(self._fd)
+
+    def __enter__(self) -> "CheckpointJournal":
+        return self
+
+    def __exit__(self, *exc) -> None:
+        self.close()
+
+    def load(self) -> Dict[str, dict]:
+        """
+        Replay the journal into the latest known state of each job.
+
+        A torn last line (crash in the middle of a write) is ignored.
+
+        Returns:
+            dict: URL -> state with "stage" and the outputs recorded so far
+            ("application", "language", "title", "company", "content", "usage", "path", "error").
+        """
+        return self.replay(self.path)
+
+    @staticmethod
+    def replay(path: str) -> Dict[str, dict]:
+        """Replay the journal at `path` (see `load`); an empty state if it does not exist."""
+        states: Dict[str, dict] = {}
+        try:
+            f = open(path, "rb")
+        except FileNotFoundError:
+            return states
+        with f:
+            for raw in f:
+                try:
+                    record = json.loads(raw)
+                except ValueError:
+                    continue
+                url = record.pop("url", None)
+                if url is None:
+                    continue
+                record.pop("ts", None)
+                state = states.setdefault(url, {})
+                if record["stage"] != JobStage.FAILED:
+                    state.pop("error", None)
+                state.update(record)
+        return states
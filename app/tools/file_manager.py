@@ -1,9 +1,13 @@
+import hashlib
+import os
+import tempfile
 import warnings
 from pathlib import Path
-import pdfplumber
-from config import CV_PATH, DESTINATION_PATH
+from config import CV_PATH, DESTINATION_PATH, CACHE_PATH
 from tools.scraper import Scraper
+from tools.output_store import OutputStore
 from utils.simple_pdf_generator import SimplePDFGenerator
+from utils import pdf_extractor
 
 # Suppress FontBBox warnings
 warnings.filterwarnings('ignore', message='.*FontBBox.*')
@@ -13,16 +17,28 @@ warnings.filterwarnings('ignore', message='.*Could get FontBBox.*')
 class PdfManager:
     """
     Extracts and returns the full text content from a PDF CV file.
+
+    Extracted text is cached on disk by content hash, so a CV is only parsed
+    once no matter how many times it is loaded.
     """
 
-    def __init__(self, file_path=None):
+    # Bump when the extraction logic changes to invalidate cached texts
+    EXTRACTION_VERSION = 2
+
+    def __init__(self, file_path=None, cache_dir=None, use_cache=True, fast=True):
         """
         Initialize the PDF manager.
         
         Args:
             file_path (str, optional): Path to the PDF file. Falls back to CV_PATH from config.
+            cache_dir (str, optional): Folder for extracted texts. Falls back to CACHE_PATH from config.
+            use_cache (bool, optional): Read and write the extraction cache. Defaults to True.
+            fast (bool, optional): Read clean text layers directly, skipping layout analysis. Defaults to True.
         """
         self.file = file_path or CV_PATH
+        self.cache_dir = Path(cache_dir or CACHE_PATH) / "cv"
+        self.use_cache = use_cache
+        self.fast = fast
 
     def run(self) -> str:
         """
@@ -31,19 +47,54 @@ class PdfManager:
         Returns:
             str: The extracted text content of the PDF.
         """
-        content = ""
-
-        # Open the PDF file using pdfplumber
-        with warnings.catch_warnings():
-            warnings.simplefilter("ignore")
-            with pdfplumber.open(self.file) as file:
-                for page in file.pages:
-                    # Extract text with adjusted tolerance for better layout preservation
-                    txt = page.extract_text(x_tolerance=1.5, y_tolerance=2)
-                    if txt:
-                        content += txt + '\n'
+        data = Path(self.file).read_bytes()
+        if not self.use_cache:
+            return self.extract_text(data, fast=self.fast)
+
+        mode = "fast" if self.fast else "layout"
+        cache_file = self.cache_dir / f"{self.content_hash(data)}.v{self.EXTRACTION_VERSION}.{mode}.txt"
+        try:
+            return cache_file.read_text(encoding="utf-8")
+        except OSError:
+            pass
+
+        content = self.extract_text(data, fast=self.fast)
+
+        # Cache writes are best effort: an unwritable cache must not break extraction
+        try:
+            self.cache_dir.mkdir(parents=True, exist_ok=True)
+            fd, tmp_name = tempfile.mkstemp(dir=self.cache_dir, prefix=".tmp-")
+            with os.fdopen(fd, "w", encoding="utf-8") as f:
+                f.write(content)
+            os.replace(tmp_name, cache_file)
+        except OSError:
+            pass
         return content
 
+    @staticmethod
+    def content_hash(data: bytes) -> str:
+        """Return the SHA-256 hex digest identifying a PDF's content."""
+        return hashlib.sha256(data).hexdigest()
+
+    @staticmethod
+    def extract_text(source, fast=True, shared_pool=False) -> str:
+        """
+        Extract the text of every page of a PDF.
+
+        Large documents are extracted in parallel page ranges and capped in
+        pages and characters (see utils.pdf_extractor).
+
+        Args:
+            source: Path, raw bytes or binary file object of the PDF.
+            fast (bool, optional): Read clean text layers directly, skipping layout analysis.
+            shared_pool (bool, optional): Reuse one `spawn` process pool across calls instead of
+                forking a pool per call. Set by long-lived threaded callers such as the Streamlit app.
+
+        Returns:
+            str: The extracted text content of the PDF.
+        """
+        return pdf_extractor.extract_text(source, fast=fast, shared_pool=shared_pool)
+
 
 class CoverLetterManager:
     """
@@ -58,29 +109,28 @@ class CoverLetterManager:
             destination_path (str, optional): Path to save PDFs. Falls back to DESTINATION_PATH from config.
         """
         self.path = destination_path or DESTINATION_PATH
-        Path(self.path).mkdir(parents=True, exist_ok=True)
         self.pdf_generator = SimplePDFGenerator()
+        self.store = OutputStore(self.path, self.pdf_generator)
 
-    def manage(self, title: str, content: str) -> str:
+    def manage(self, title: str, content: str, url: str = None, job_id: str = None,
+               metadata: dict = None) -> str:
         """
         Saves the given letter content to a professional PDF file.
 
         Args:
             title (str): The title of the letter (used as filename and document title).
             content (str): The content/body of the letter.
+            url (str, optional): The job posting URL, recorded in the output index.
+            job_id (str, optional): Unique job identifier used as filename suffix.
+            metadata (dict, optional): Extra fields recorded in the output index.
 
         Returns:
             str: The full path to the saved PDF file.
         """
-        # Sanitize title for safe file naming
-        safe_title = "".join(c for c in title if c.isalnum() or c in (" ", "_", "-")).rstrip()
-        filename = f"{safe_title}"
-        full_path = Path(self.path) / filename
-        
-        # Generate PDF
-        pdf_path = self.pdf_generator.generate_pdf(title, content, full_path)
+        # Collision-free name, atomic write and index record
+        pdf_path = self.store.save(title, content, url=url, job_id=job_id, metadata=metadata)
         print(f"✅ Cover letter saved as: {pdf_path}")
-        return str(pdf_path)
+        return pdf_path
 
 
 class ApplicationManager:
@@ -0,0 +1,243 @@
+import csv
+import hashlib
+import io
+import re
+import sys
+import xml.etree.ElementTree as ET
+from contextlib import contextmanager
+from typing import BinaryIO, Iterable, Iterator, Union
+import requests
+from tools.results_db import canonical_url
+from tools.scraper import get_random_header
+
+# Header names recognized as the URL column of a CSV file
+URL_COLUMNS = ("url", "link", "job_url", "href", "posting_url", "apply_url")
+
+# XML elements holding one URL: RSS items, Atom entries, sitemap URLs and nested sitemaps
+RECORD_TAGS = {"item", "entry", "url", "sitemap"}
+
+# Nested sitemap indexes followed at most this deep
+MAX_SITEMAP_DEPTH = 3
+
+Source = Union[str, BinaryIO]
+
+
+def source_kind(name: str, head: bytes = b"") -> str:
+    """
+    Guess the format of a URL source from its name, then from its first bytes.
+
+    Args:
+        name (str): File name or URL of the source.
+        head (bytes, optional): First bytes of its content.
+
+    Returns:
+        str: "xml" (RSS/Atom feed or sitemap), "csv" or "text".
+    """
+    path = name.lower().split("?", 1)[0]
+    if path.endswith((".xml", ".rss", ".atom")):
+        return "xml"
+    if path.endswith(".csv"):
+        return "csv"
+    if path.endswith(".txt"):
+        return "text"
+    head = head.lstrip(b"\xef\xbb\xbf \t\r\n")
+    if head.startswith(b"<"):
+        return "xml"
+    first_line = head.split(b"\n", 1)[0].decode("utf-8", "ignore").lower()
+    if "," in first_line and any(column in first_line for column in URL_COLUMNS):
+        return "csv"
+    return "text"
+
+
+def is_http_url(value: str) -> bool:
+    """Whether `value` is an absolute http(s) URL."""
+    return value.startswith(("http://", "https://")) and len(value) > 8
+
+
+@contextmanager
+def open_source(source: Source):
+    """
+    Open a URL source as a buffered binary stream, without reading it whole.
+
+    Args:
+        source: Local path, http(s) URL (fetched in streaming mode) or binary file object.
+
+    Yields:
+        tuple[BufferedReader, str]: The stream and the source name.
+    """
+    if not isinstance(source, str):
+        stream = source if hasattr(source, "peek") else io.BufferedReader(source)
+        yield stream, getattr(source, "name", "")
+    elif is_http_url(source):
+        with requests.get(source, headers=get_random_header(), stream=True, timeout=30) as response:
+            response.raise_for_status()
+            response.raw.decode_content = True
+            yield io.BufferedReader(response.raw), source
+    else:
+        with open(source, "rb") as f:
+            yield f, source
+
+
+def iter_text(stream: BinaryIO) -> Iterator[str]:
+    """URLs of a text file, one per line (blank lines and # comments are skipped)."""
+    for line in io.TextIOWrapper(stream, encoding="utf-8-sig", errors="replace"):
+        url = line.strip()
+        if url and not url.startswith("#"):
+            yield url
+
+
+def iter_csv(stream: BinaryIO, column: str = None) -> Iterator[str]:
+    """
+    URLs of a CSV file.
+
+    The URL column is `column` if given, else the first header named like one of
+    URL_COLUMNS. Without a header, the first cell of each row holding a URL is used.
+    """
+    rows = csv.reader(io.TextIOWrapper(stream, encoding="utf-8-sig", errors="replace", newline=""))
+    header = next(rows, None)
+    if header is None:
+        return
+    names = [name.strip().lower() for name in header]
+    wanted = [column.lower()] if column else URL_COLUMNS
+    position = next((names.index(name) for name in wanted if name in names), None)
+    if position is None:
+        if column:
+            raise ValueError(f"CSV has no '{column}' column")
+        # No recognizable header: the first row is data
+        rows = _chain_row(header, rows)
+    for row in rows:
+        if position is not None:
+            if position < len(row):
+                yield row[position].strip()
+        else:
+            yield next((cell.strip() for cell in row if is_http_url(cell.strip())), "")
+
+
+def _chain_row(first: list, rows: Iterator[list]) -> Iterator[list]:
+    yield first
+    yield from rows
+
+
+def _local_name(tag: str) -> str:
+    """Tag without its XML namespace."""
+    return tag.rsplit("}", 1)[-1]
+
+
+def iter_xml(stream: BinaryIO, depth: int = 0) -> Iterator[str]:
+    """
+    URLs of an RSS feed, an Atom feed, a sitemap or a sitemap index.
+
+    The document is parsed incrementally and every record is discarded once read,
+    so memory does not grow with the number of entries. Nested sitemaps of an
+    index are fetched and streamed in turn.
+    """
+    parents = []
+    for event, elem in ET.iterparse(stream, events=("start", "end")):
+        if event == "start":
+            parents.append(elem)
+            continue
+        parents.pop()
+        tag = _local_name(elem.tag)
+        if tag not in RECORD_TAGS:
+            continue
+        children = {_local_name(child.tag): child for child in elem}
+        url = None
+        if tag in ("url", "sitemap") and "loc" in children:
+            url = (children["loc"].text or "").strip()
+        elif tag == "item":
+            link = children.get("link")
+            url = (link.text or "").strip() if link is not None else None
+            if not url and "guid" in children:
+                url = (children["guid"].text or "").strip()
+        elif tag == "entry":
+            links = [child for child in elem if _local_name(child.tag) == "link"]
+            alternate = next((link for link in links if link.get("rel", "alternate") == "alternate"), None)
+            url = (alternate.get("href") or "").strip() if alternate is not None else None
+            if not url and "id" in children:
+                url = (children["id"].text or "").strip()
+        if url and tag == "sitemap":
+            if depth < MAX_SITEMAP_DEPTH:
+                try:
+                    yield from iter_source(url, kind="xml", _depth=depth + 1)
+                except (requests.RequestException, ET.ParseError) as e:
+                    # stderr: stdout may be the JSONL output of the CLI
+                    print(f"⚠️ Skipping sitemap {url}: {e}", file=sys.stderr)
+        elif url:
+            yield url
+        # Records already read are dropped from the tree
+        if parents:
+            parents[-1].clear()
+        else:
+            elem.clear()
+
+
+def iter_source(source: Source, kind: str = None, column: str = None, _depth: int = 0) -> Iterator[str]:
+    """
+    Stream the http(s) URLs listed by a source, in order (duplicates included).
+
+    Args:
+        source: Local path, http(s) URL or binary file object (e.g. an upload).
+        kind (str, optional): "text", "csv" or "xml"; guessed from the name and content if omitted.
+        column (str, optional): URL column of a CSV source.
+
+    Yields:
+        str: Job posting URLs.
+    """
+    with open_source(source) as (stream, name):
+        kind = kind or source_kind(name, stream.peek(512)[:512])
+        if kind == "xml":
+            urls = iter_xml(stream, depth=_depth)
+        elif kind == "csv":
+            urls = iter_csv(stream, column)
+        elif kind == "text":
+            urls = iter_text(stream)
+        else:
+            raise ValueError(f"Unknown source format: {kind}")
+        for url in urls:
+            if is_http_url(url):
+                yield url
+
+
+def unique_urls(urls: Iterable[str], match: str = None) -> Iterator[str]:
+    """
+    Drop repeated postings (compared by canonical URL) and, optionally, URLs not matching a pattern.
+
+    Only an 8-byte digest is kept per posting seen, so deduplicating 10k URLs
+    costs well under a megabyte.
+
+    Args:
+        urls: URLs to filter, consumed lazily.
+        match (str, optional): Regular expression the URL must contain (e.g. "/jobs?/").
+
+    Yields:
+        str: First occurrence of each posting.
+    """
+    pattern = re.compile(match) if match else None
+    seen = set()
+    for url in urls:
+        if pattern is not None and not pattern.search(url):
+            continue
+        key = hashlib.blake2b(canonical_url(url).encode("utf-8"), digest_size=8).digest()
+        if key not in seen:
+            seen.add(key)
+            yield url
+
+
+def iter_urls(*sources: Source, kind: str = None, column: str = None, match: str = None) -> Iterator[str]:
+    """
+    Stream the deduplicated job posting URLs of several sources, one source after the other.
+
+    Args:
+        *sources: Local paths, http(s) URLs of feeds/sitemaps/lists, or binary file objects.
+        kind (str, optional): Format of every source (guessed per source if omitted).
+        column (str, optional): URL column of CSV sources.
+        match (str, optional): Regular expression URLs must contain.
+
+    Yields:
+        str: Job posting URLs, each posting once.
+    """
+    def chained() -> Iterator[str]:
+        for source in sources:
+            yield from iter_source(source, kind=kind, column=column)
+
+    return unique_urls(chained(), match=match)
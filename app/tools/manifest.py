@@ -0,0 +1,128 @@
+import hashlib
+import json
+import os
+import tempfile
+import threading
+from contextlib import contextmanager
+from datetime import datetime, timezone
+from pathlib import Path
+from typing import Dict, Optional
+
+try:
+    import fcntl
+except ImportError:  # Windows: saves from concurrent processes are not serialized
+    fcntl = None
+
+
+def text_hash(text: str) -> str:
+    """Return the SHA-256 hex digest of a text."""
+    return hashlib.sha256(text.encode("utf-8")).hexdigest()
+
+
+class LetterManifest:
+    """
+    Records the inputs each letter was generated from, for incremental runs.
+
+    A letter depends on the CV, the job posting content, the model and the
+    prompt version. A letter whose dependencies are unchanged (and whose file
+    still exists) does not need to be generated again.
+
+    Several processes may share a manifest: each save merges this instance's
+    updates into the file under a lock instead of overwriting it.
+    """
+
+    DEPENDENCIES = ("cv_hash", "job_hash", "model", "prompt_version")
+
+    def __init__(self, path: str):
+        """
+        Load the manifest.
+
+        Args:
+            path (str): JSON manifest file, created on first save.
+        """
+        self.path = Path(path)
+        self._lock = threading.Lock()
+        self._updated: Dict[str, dict] = {}
+        try:
+            self._entries: Dict[str, dict] = json.loads(self.path.read_text(encoding="utf-8"))
+        except (OSError, ValueError):
+            self._entries = {}
+
+    def get(self, url: str) -> Optional[dict]:
+        """Entry recorded for a URL, if any."""
+        with self._lock:
+            entry = self._entries.get(url)
+            return dict(entry) if entry else None
+
+    def is_current(self, url: str, dependencies: dict) -> bool:
+        """
+        Check whether the letter of `url` was generated from these exact inputs.
+
+        Args:
+            url (str): Job posting URL.
+            dependencies (dict): Current cv_hash, job_hash, model and prompt_version.
+
+        Returns:
+            bool: True if the recorded letter is up to date (and its file, if any, still exists).
+        """
+        entry = self.get(url)
+        if entry is None:
+            return False
+        if any(entry.get(key) != dependencies.get(key) for key in self.DEPENDENCIES):
+            return False
+        return entry.get("path") is None or Path(entry["path"]).exists()
+
+    def update(self, url: str, dependencies: dict, title: str, path: Optional[str] = None) -> None:
+        """Record the inputs and outputs of a freshly generated letter."""
+        with self._lock:
+            entry = {
+                **{key: dependencies.get(key) for key in self.DEPENDENCIES},
+                "title": title,
+                "path": path,
+                "updated_at": datetime.now(timezone.utc).isoformat(),
+            }
+            self._entries[url] = entry
+            self._updated[url] = entry
+
+    @contextmanager
+    def _file_lock(self):
+        """Serialize saves across processes with an advisory lock file."""
+        if fcntl is None:
+            yield
+            return
+        with open(self.path.with_name(self.path.name + ".lock"), "w") as lock:
+            fcntl.flock(lock, fcntl.LOCK_EX)
+            try:
+                yield
+            finally:
+                fcntl.flock(lock, fcntl.LOCK_UN)
+
+    def save(self) -> None:
+        """Merge the entries updated since the last save into the file, atomically."""
+        with self._lock:
+            updated, self._updated = self._updated, {}
+        if not updated:
+            return
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        with self._file_lock():
+            try:
+                entries = json.loads(self.path.read_text(encoding="utf-8"))
+            except (OSError, ValueError):
+                entries = {}
+            entries.update(updated)
+
+            fd, tmp_name = tempfile.mkstemp(dir=self.path.parent, prefix=".tmp-manifest-")
+            try:
+                with os.fdopen(fd, "w", encoding="utf-8") as f:
+                    json.dump(entries, f, ensure_ascii=False, indent=2)
+                    f.flush()
+                    os.fsync(f.fileno())
+                os.replace(tmp_name, self.path)
+            except BaseException:
+                try:
+                    os.unlink(tmp_name)
+                except OSError:
+                    pass
+                raise
+        with self._lock:
+            self._entries = {**entries, **self._entries}
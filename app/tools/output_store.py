@@ -0,0 +1,148 @@
+import hashlib
+import json
+import os
+import uuid
+from datetime import datetime, timezone
+from pathlib import Path
+from typing import Iterator, Optional
+from utils.simple_pdf_generator import SimplePDFGenerator
+
+
+def sanitize_filename(title: str) -> str:
+    """
+    Turn a letter title into a safe file name (without extension).
+
+    Args:
+        title (str): The title of the letter.
+
+    Returns:
+        str: The title restricted to alphanumerics, spaces, underscores and dashes.
+    """
+    return "".join(c for c in title if c.isalnum() or c in (" ", "_", "-")).rstrip()
+
+
+class OutputStore:
+    """
+    Concurrency-safe store for generated letters.
+
+    Every letter gets a collision-free file name (sanitized title plus a job-id or
+    content-hash suffix) and is written to a temporary file in the same folder,
+    then renamed into place, so readers never observe partial files.
+
+    An append-only index (`index.jsonl`) maps URL -> letter path -> metadata. Each
+    record is appended with a single O_APPEND write, so parallel workers never
+    need a lock and never lose each other's entries.
+    """
+
+    INDEX_FILENAME = "index.jsonl"
+
+    def __init__(self, path: str, pdf_generator: SimplePDFGenerator = None):
+        """
+        Initialize the output store.
+
+        Args:
+            path (str): Folder receiving the letters and the index file.
+            pdf_generator (SimplePDFGenerator, optional): Renderer to use. A new one is created if omitted.
+        """
+        self.path = Path(path)
+        self.path.mkdir(parents=True, exist_ok=True)
+        self.index_path = self.path / self.INDEX_FILENAME
+        self.pdf_generator = pdf_generator or SimplePDFGenerator()
+
+    def filename_for(self, title: str, content: str, url: str = None, job_id: str = None) -> str:
+        """
+        Build a collision-free file name for a letter.
+
+        Args:
+            title (str): The title of the letter.
+            content (str): The content/body of the letter.
+            url (str, optional): The job posting URL.
+            job_id (str, optional): Unique job identifier. A content hash is used when omitted.
+
+        Returns:
+            str: File name including the renderer's extension.
+        """
+        if job_id is None:
+            digest = hashlib.sha256(f"{url or ''}\n{title}\n{content}".encode("utf-8"))
+            job_id = digest.hexdigest()[:10]
+        base = sanitize_filename(title) or "cover_letter"
+        return f"{base}_{sanitize_filename(job_id)}{self.pdf_generator.extension}"
+
+    def save(self, title: str, content: str, url: str = None, job_id: str = None,
+             metadata: Optional[dict] = None) -> str:
+        """
+        Render a letter, write it atomically and record it in the index.
+
+        Args:
+            title (str): The title of the letter.
+            content (str): The content/body of the letter.
+            url (str, optional): The job posting URL.
+            job_id (str, optional): Unique job identifier used as file name suffix.
+            metadata (dict, optional): Extra fields stored in the index record.
+
+        Returns:
+            str: The full path to the saved file.
+        """
+        final_path = self.path / self.filename_for(title, content, url, job_id)
+
+        # Write to a temp file in the same folder, then rename over the target. Created with
+        # os.open rather than mkstemp (0600) so the letter gets the umask's usual mode
+        tmp_name = self.path / f".tmp-{uuid.uuid4().hex}{final_path.suffix}"
+        fd = os.open(tmp_name, os.O_WRONLY | os.O_CREAT | os.O_EXCL | getattr(os, "O_BINARY", 0), 0o666)
+        try:
+            with os.fdopen(fd, "wb") as f:
+                self.pdf_generator.render_to_stream(title, content, f)
+                f.flush()
+                os.fsync(f.fileno())
+            os.replace(tmp_name, final_path)
+        except BaseException:
+            try:
+                os.unlink(tmp_name)
+            except OSError:
+                pass
+            raise
+
+        record = {
+            "url": url,
+            "path": str(final_path),
+            "title": title,
+            "created_at": datetime.now(timezone.utc).isoformat(),
+        }
+        if metadata:
+            record.update(metadata)
+        self._append_index(record)
+        return str(final_path)
+
+    def _append_index(self, record: dict) -> None:
+        """Append one record to the index with a single atomic write."""
+        line = (json.dumps(record, ensure_ascii=False) + "\n").encode("utf-8")
+        fd = os.open(self.index_path, os.O_WRONLY | os.O_APPEND | os.O_CREAT, 0o644)
+        try:
+            os.write(fd, line)
+        finally:
+            os.close(fd)
+
+    def records(self) -> Iterator[dict]:
+        """
+        Iterate over every index record, oldest first.
+
+        Yields:
+            dict: One record per saved letter. Truncated trailing lines are skipped.
+        """
+        if not self.index_path.exists():
+            return
+        with open(self.index_path, encoding="utf-8") as f:
+            for line in f:
+                try:
+                    yield json.loads(line)
+                except json.JSONDecodeError:
+                    continue
+
+    def index(self) -> dict:
+        """
+        Latest index record per URL.
+
+        Returns:
+            dict: Mapping of URL to its most recent record.
+        """
+        return {record["url"]: record for record in self.records() if record.get("url")}
@@ -0,0 +1,216 @@
+import sqlite3
+import threading
+from datetime import datetime, timezone
+from pathlib import Path
+from typing import Dict, List, Optional, Tuple
+from urllib.parse import parse_qsl, urlencode, urlsplit, urlunsplit
+
+# Query parameters that only track where a visitor came from
+TRACKING_PARAMS = {"gclid", "fbclid", "msclkid", "ref", "refid", "trk", "trackingid", "src", "source"}
+
+
+def canonical_url(url: str) -> str:
+    """
+    Normalize a job posting URL so the same posting shared through different links matches.
+
+    Lowercases the scheme and host, drops default ports, fragments, tracking
+    parameters (utm_*, gclid, ref...) and trailing slashes, and sorts the query.
+
+    Args:
+        url (str): The job posting URL.
+
+    Returns:
+        str: The canonical URL.
+    """
+    parts = urlsplit(url.strip())
+    scheme = parts.scheme.lower()
+    host = (parts.hostname or "").lower()
+    if parts.port and (scheme, parts.port) not in (("http", 80), ("https", 443)):
+        host = f"{host}:{parts.port}"
+    query = sorted(
+        (key, value) for key, value in parse_qsl(parts.query, keep_blank_values=True)
+        if not key.lower().startswith("utm_") and key.lower() not in TRACKING_PARAMS
+    )
+    return urlunsplit((scheme, host, parts.path.rstrip("/") or "/", urlencode(query), ""))
+
+
+class ResultsDB:
+    """
+    Embedded SQLite history of every generated letter.
+
+    Records the URL (and its canonical form), company, language, model, title,
+    content, file path, token usage and creation time of each letter, indexed
+    on the fields history is usually filtered by. Pages are read with keyset
+    pagination and without the letter content, so browsing a long history
+    never loads it all into memory.
+
+    The database runs in WAL mode: the app can read it while a batch (or
+    several CLI worker processes) write to it.
+    """
+
+    SCHEMA_VERSION = 1
+
+    # Columns returned by `page` (content is only loaded by `get`)
+    SUMMARY_COLUMNS = (
+        "id", "url", "canonical_url", "company", "language", "model", "title", "path",
+        "input_tokens", "output_tokens", "total_tokens", "cost", "created_at",
+    )
+
+    def __init__(self, path: str):
+        """
+        Open (or create) the database.
+
+        Args:
+            path (str): SQLite database file.
+        """
+        self.path = Path(path)
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        # One connection shared by the worker threads, serialized by the lock
+        self._conn = sqlite3.connect(self.path, timeout=30, check_same_thread=False)
+        self._conn.row_factory = sqlite3.Row
+        self._lock = threading.Lock()
+        with self._lock, self._conn:
+            self._conn.execute("PRAGMA journal_mode=WAL")
+            self._conn.execute("PRAGMA synchronous=NORMAL")
+            self._migrate()
+
+    def _migrate(self) -> None:
+        """Create the tables and indexes of a new database."""
+        if self._conn.execute("PRAGMA user_version").fetchone()[0] >= self.SCHEMA_VERSION:
+            return
+        self._conn.executescript("""
+            CREATE TABLE IF NOT EXISTS letters (
+                id INTEGER PRIMARY KEY,
+                url TEXT NOT NULL,
+                canonical_url TEXT NOT NULL,
+                company TEXT,
+                language TEXT,
+                model TEXT,
+                title TEXT NOT NULL,
+                content TEXT NOT NULL,
+                path TEXT,
+                input_tokens INTEGER NOT NULL DEFAULT 0,
+                output_tokens INTEGER NOT NULL DEFAULT 0,
+                total_tokens INTEGER NOT NULL DEFAULT 0,
+                cost REAL,
+                created_at TEXT NOT NULL
+            );
+            CREATE INDEX IF NOT EXISTS letters_created ON letters (created_at, id);
+            CREATE INDEX IF NOT EXISTS letters_company ON letters (company COLLATE NOCASE, created_at);
+            CREATE INDEX IF NOT EXISTS letters_language ON letters (language, created_at);
+            CREATE INDEX IF NOT EXISTS letters_model ON letters (model, created_at);
+            CREATE INDEX IF NOT EXISTS letters_canonical_url ON letters (canonical_url);
+        """)
+        self._conn.execute(f"PRAGMA user_version = {self.SCHEMA_VERSION}")
+
+    def add(self, url: str, title: str, content: str, company: str = None, language: str = None,
+            model: str = None, path: str = None, usage: Optional[dict] = None) -> int:
+        """
+        Record a generated letter.
+
+        Args:
+            url (str): Job posting URL.
+            title (str): Title of the letter.
+            content (str): Body of the letter.
+            company (str, optional): Hiring company.
+            language (str, optional): Language code of the posting.
+            model (str, optional): Model that wrote the letter.
+            path (str, optional): Saved file, if any.
+            usage (dict, optional): TokenUsage fields (input_tokens, output_tokens, total_tokens, cost).
+
+        Returns:
+            int: ID of the new record.
+        """
+        usage = usage or {}
+        row = (
+            url, canonical_url(url), company or None, language, model, title, content, path,
+            usage.get("input_tokens") or 0, usage.get("output_tokens") or 0, usage.get("total_tokens") or 0,
+            usage.get("cost"), datetime.now(timezone.utc).isoformat(timespec="seconds"),
+        )
+        with self._lock, self._conn:
+            cursor = self._conn.execute(
+                "INSERT INTO letters (url, canonical_url, company, language, model, title, content, path,"
+                " input_tokens, output_tokens, total_tokens, cost, created_at)"
+                " VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)",
+                row
+            )
+            return cursor.lastrowid
+
+    @staticmethod
+    def _where(company: str = None, language: str = None, model: str = None, url: str = None,
+               since: datetime = None, until: datetime = None, search: str = None) -> Tuple[str, list]:
+        """Build the WHERE clause and parameters of the history filters."""
+        clauses, params = [], []
+        if company:
+            clauses.append("company = ? COLLATE NOCASE")
+            params.append(company)
+        if language:
+            clauses.append("language = ?")
+            params.append(language)
+        if model:
+            clauses.append("model = ?")
+            params.append(model)
+        if url:
+            clauses.append("canonical_url = ?")
+            params.append(canonical_url(url))
+        if since:
+            clauses.append("created_at >= ?")
+            params.append(since.astimezone(timezone.utc).isoformat(timespec="seconds"))
+        if until:
+            clauses.append("created_at < ?")
+            params.append(until.astimezone(timezone.utc).isoformat(timespec="seconds"))
+        if search:
+            clauses.append("title LIKE ?")
+            params.append(f"%{search}%")
+        return (" WHERE " + " AND ".join(clauses)) if clauses else "", params
+
+    def page(self, limit: int = 20, before: Optional[Tuple[str, int]] = None, **filters) -> List[Dict]:
+        """
+        One page of history, newest first, without the letter content.
+
+        Args:
+            limit (int, optional): Records per page.
+            before (tuple, optional): (created_at, id) of the last record of the previous
+                page; the first page is returned when omitted.
+            **filters: company, language, model, url, since, until (datetimes) and search (title).
+
+        Returns:
+            List[dict]: Records with the SUMMARY_COLUMNS fields. Pass the last one's
+            (created_at, id) as `before` to get the next page.
+        """
+        where, params = self._where(**filters)
+        if before is not None:
+            where += (" AND " if where else " WHERE ") + "(created_at, id) < (?, ?)"
+            params.extend(before)
+        query = (f"SELECT {', '.join(self.SUMMARY_COLUMNS)} FROM letters{where}"
+                 " ORDER BY created_at DESC, id DESC LIMIT ?")
+        with self._lock:
+            rows = self._conn.execute(query, (*params, limit)).fetchall()
+        return [dict(row) for row in rows]
+
+    def count(self, **filters) -> int:
+        """Number of records matching the filters (see `page`)."""
+        where, params = self._where(**filters)
+        with self._lock:
+            return self._conn.execute(f"SELECT COUNT(*) FROM letters{where}", params).fetchone()[0]
+
+    def get(self, record_id: int) -> Optional[Dict]:
+        """Full record, content included, or None if it does not exist."""
+        with self._lock:
+            row = self._conn.execute("SELECT * FROM letters WHERE id = ?", (record_id,)).fetchone()
+        return dict(row) if row else None
+
+    def distinct(self, column: str) -> List[str]:
+        """Known values of a filter column ("company", "language" or "model"), for pickers."""
+        if column not in ("company", "language", "model"):
+            raise ValueError(f"Not a filter column: {column}")
+        with self._lock:
+            rows = self._conn.execute(
+                f"SELECT DISTINCT {column} FROM letters WHERE {column} IS NOT NULL ORDER BY {column}"
+            ).fetchall()
+        return [row[0] for row in rows]
+
+    def close(self) -> None:
+        """Close the connection."""
+        with self._lock:
+            self._conn.close()
@@ -1,7 +1,10 @@
 import random
+from typing import TYPE_CHECKING
 import requests
-from langchain.schema import Document
-from langchain_community.document_loaders import WebBaseLoader
+from utils import tracing
+
+if TYPE_CHECKING:
+    from langchain_core.documents import Document
 
 # List of user agents to rotate requests and avoid detection
 USER_AGENTS = [
@@ -31,25 +34,28 @@ class Scraper:
     Web scraping utility class that uses a document loader to retrieve and validate web content.
     """
 
-    def __init__(self, loader = WebBaseLoader):
-        # Initialize the scraper with a document loader
+    def __init__(self, loader = None):
+        # Initialize the scraper with a document loader (WebBaseLoader by default,
+        # imported on first use because langchain_community is slow to import)
         self.loader = loader
 
     def is_accessible_url(self, url: str) -> bool:
         """Check if the URL responds with a valid HTTP status."""
-        try:
-            response = requests.head(
-                url, headers=get_random_header(), allow_redirects=True, timeout=10
-            )
-            return response.status_code in [200, 405, 403] # method 'head' can be not allowed and return code 405 or 403
-        except requests.RequestException:
-            return False
+        with tracing.span("scrape.head_check") as span:
+            try:
+                response = requests.head(
+                    url, headers=get_random_header(), allow_redirects=True, timeout=10
+                )
+                span.set(status_code=response.status_code)
+                return response.status_code in [200, 405, 403] # method 'head' can be not allowed and return code 405 or 403
+            except requests.RequestException:
+                return False
 
     def is_valid_url(self, url: str) -> bool:
         "Check if the URL has been correctly formatted by the `format_url` method and is accessible."
         return url != None and self.is_accessible_url(url)
 
-    def load_web_content(self, url: str) -> list[Document]:
+    def load_web_content(self, url: str) -> list["Document"]:
         """
         Load web content from a URL using a document loader.
 
@@ -57,13 +63,20 @@ class Scraper:
         :return: A list of documents or an empty document if the URL is invalid.
         """
         if not self.is_valid_url(url):
+            from langchain_core.documents import Document
             return [Document("")]
 
+        if self.loader is None:
+            from langchain_community.document_loaders import WebBaseLoader
+            self.loader = WebBaseLoader
+
         # Use the document loader with the given URL and headers
         loader = self.loader(url, get_random_header())
-        documents = loader.load()  # Synchronous retrieval of documents
+        with tracing.span("scrape.load") as span:
+            documents = loader.load()  # Synchronous retrieval of documents
+            span.set(documents=len(documents))
         return documents
 
-    def run(self, url: str) -> list[Document]:
+    def run(self, url: str) -> list["Document"]:
         """Execute the scraper on a given URL and return its content."""
         return self.load_web_content(url)
@@ -0,0 +1,160 @@
+"""
+Several tailored CVs (profiles) and the selection of the best one per job posting.
+"""
+
+import hashlib
+import os
+import re
+import tempfile
+import zlib
+from pathlib import Path
+from typing import Dict, Iterable, List, Tuple
+import numpy as np
+from config import CACHE_PATH
+
+TOKEN_PATTERN = re.compile(r"\w{2,}")
+
+
+def term_counts(text: str, dim: int) -> np.ndarray:
+    """
+    Hashing-trick term frequencies of a text.
+
+    Words are hashed (CRC32, stable across processes) into `dim` buckets, so no
+    vocabulary has to be built or stored.
+
+    Args:
+        text (str): Text to vectorize.
+        dim (int): Number of buckets, a power of two.
+
+    Returns:
+        np.ndarray: Sublinear term frequencies (log(1 + count)), float32 of length `dim`.
+    """
+    tokens = TOKEN_PATTERN.findall(text.lower())
+    buckets = np.fromiter((zlib.crc32(token.encode("utf-8")) for token in tokens),
+                          dtype=np.uint32, count=len(tokens)) & np.uint32(dim - 1)
+    return np.log1p(np.bincount(buckets, minlength=dim).astype(np.float32))
+
+
+class CVProfiles:
+    """
+    A set of CV profiles (e.g. data, backend, management), vectorized once.
+
+    Each profile's term vector is cached on disk by content hash. Profiles are
+    weighted by inverse document frequency within the set, so words shared by
+    every CV (name, contact details, common words) do not drive the choice,
+    and L2-normalized: matching jobs is a cosine similarity computed as one
+    profiles x jobs matrix product.
+    """
+
+    # Bump when the vectorization changes to invalidate cached vectors
+    VECTOR_VERSION = 1
+    DIM = 2 ** 14
+
+    def __init__(self, profiles: Dict[str, str], dim: int = None, cache_dir: str = None):
+        """
+        Index the profiles.
+
+        Args:
+            profiles (dict): Profile name -> CV text.
+            dim (int, optional): Hashing-trick dimension, a power of two. Defaults to DIM.
+            cache_dir (str, optional): Folder for cached vectors. Falls back to CACHE_PATH from config.
+        """
+        if not profiles:
+            raise ValueError("At least one CV profile is required")
+        self.dim = dim or self.DIM
+        self.cache_dir = Path(cache_dir or CACHE_PATH) / "profiles"
+        self.names = list(profiles)
+        self.texts = [profiles[name] for name in self.names]
+        self.hashes = [hashlib.sha256(text.encode("utf-8")).hexdigest() for text in self.texts]
+
+        counts = np.vstack([self._cached_counts(text, digest) for text, digest in zip(self.texts, self.hashes)])
+        document_frequency = np.count_nonzero(counts, axis=0)
+        self.idf = (np.log((1 + len(self.names)) / (1 + document_frequency)) + 1).astype(np.float32)
+        self.matrix = self._normalize(counts * self.idf)
+
+    @classmethod
+    def from_pdfs(cls, paths: Iterable[str], **kwargs) -> "CVProfiles":
+        """
+        Build profiles from CV PDFs, named after their file names.
+
+        Extraction is cached by PdfManager, vectors by this class, so each CV is
+        only parsed and vectorized once.
+        """
+        from tools.file_manager import PdfManager
+
+        return cls({Path(path).stem: PdfManager(path).run() for path in paths}, **kwargs)
+
+    def __len__(self) -> int:
+        return len(self.names)
+
+    def _cached_counts(self, text: str, digest: str) -> np.ndarray:
+        """Term vector of a profile, read from or written to the on-disk cache."""
+        cache_file = self.cache_dir / f"{digest}.v{self.VECTOR_VERSION}.{self.dim}.npy"
+        try:
+            return np.load(cache_file)
+        except (OSError, ValueError):
+            pass
+
+        counts = term_counts(text, self.dim)
+
+        # Cache writes are best effort: an unwritable cache must not break matching
+        try:
+            self.cache_dir.mkdir(parents=True, exist_ok=True)
+            fd, tmp_name = tempfile.mkstemp(dir=self.cache_dir, prefix=".tmp-", suffix=".npy")
+            with os.fdopen(fd, "wb") as f:
+                np.save(f, counts)
+            os.replace(tmp_name, cache_file)
+        except OSError:
+            pass
+        return counts
+
+    @staticmethod
+    def _normalize(matrix: np.ndarray) -> np.ndarray:
+        """Scale each row to unit length (empty rows stay zero)."""
+        norms = np.linalg.norm(matrix, axis=1, keepdims=True)
+        return matrix / np.maximum(norms, 1e-12)
+
+    def vectorize(self, texts: List[str]) -> np.ndarray:
+        """
+        Weighted, normalized term vectors of job postings.
+
+        Returns:
+            np.ndarray: Matrix of shape (len(texts), dim).
+        """
+        counts = np.vstack([term_counts(text, self.dim) for text in texts])
+        return self._normalize(counts * self.idf)
+
+    def match(self, job_texts: List[str], chunk_size: int = 1024) -> List[Tuple[str, float]]:
+        """
+        Best profile for each job posting.
+
+        Each chunk of up to `chunk_size` postings is scored against every profile
+        with a single matrix product, which bounds memory for large batches.
+
+        Args:
+            job_texts (List[str]): Job posting texts.
+            chunk_size (int, optional): Postings vectorized and scored at once.
+
+        Returns:
+            List[Tuple[str, float]]: Name of the best profile and its cosine similarity, per posting.
+        """
+        matches = []
+        for start in range(0, len(job_texts), chunk_size):
+            scores = self.matrix @ self.vectorize(job_texts[start:start + chunk_size]).T  # profiles x jobs
+            best = scores.argmax(axis=0)
+            matches.extend(
+                (self.names[profile], float(scores[profile, job])) for job, profile in enumerate(best)
+            )
+        return matches
+
+    def best(self, job_text: str) -> Tuple[str, float]:
+        """Best profile for one job posting (see `match`)."""
+        return self.match([job_text])[0]
+
+    def text(self, name: str) -> str:
+        """CV text of a profile."""
+        return self.texts[self.names.index(name)]
+
+    def hash(self, name: str) -> str:
+        """Content hash of a profile's CV text."""
+        return self.hashes[self.names.index(name)]
@@ -0,0 +1,280 @@
+"""
+Local structure checks and repairs of generated cover letters.
+"""
+
+import json
+import re
+from typing import Dict, List, Optional, Tuple
+from utils.language_detector import LanguageDetector
+
+
+class LetterValidator:
+    """
+    Checks that a letter follows the expected structure, without any LLM call:
+    salutation and closing of the target language, a signature, enough body
+    paragraphs, a reasonable length, the right language and no leftover
+    template placeholders.
+    """
+
+    # Accepted openings and closings per language (lowercase prefixes), on top of
+    # LanguageDetector.get_salutation / get_closing
+    SALUTATIONS = {
+        'english': ('dear', 'hello', 'to whom it may concern'),
+        'french': ('madame', 'monsieur', 'chère', 'cher', 'bonjour'),
+        'dutch': ('geachte', 'beste'),
+        'spanish': ('estimado', 'estimada', 'estimados', 'apreciado', 'apreciada'),
+    }
+    CLOSINGS = {
+        'english': ('sincerely', 'best regards', 'kind regards', 'regards', 'yours sincerely', 'yours faithfully'),
+        'french': ('cordialement', 'bien cordialement', 'veuillez agréer', 'je vous prie', 'sincères salutations',
+                   'bien à vous'),
+        'dutch': ('met vriendelijke groet', 'hoogachtend', 'vriendelijke groeten', 'met vriendelijke groeten'),
+        'spanish': ('atentamente', 'cordialmente', 'saludos cordiales', 'un cordial saludo', 'reciba un cordial saludo'),
+    }
+
+    # Human-readable description of each issue code, also used as repair instructions
+    ISSUES = {
+        "salutation": "Start with the salutation of the letter's language",
+        "closing": "End with a closing formula of the letter's language before the signature",
+        "signature": "Sign with the candidate's full name after the closing",
+        "paragraphs": "Write at least 3 body paragraphs (introduction, experience, skills, conclusion) "
+                      "separated by blank lines",
+        "length": "Keep the letter between 150 and 600 words",
+        "language": "Write the whole letter in the requested language",
+        "placeholder": "Replace every placeholder such as [Company Name] with real content",
+    }
+
+    MIN_WORDS = 150
+    MAX_WORDS = 600
+    MIN_BODY_PARAGRAPHS = 3
+    # Language detection is only trusted above this confidence
+    MIN_LANGUAGE_CONFIDENCE = 0.4
+
+    PLACEHOLDER_PATTERN = re.compile(r"\[[^\]\n]{2,40}\]|\{[^}\n]*\}|<[A-Z][A-Z _]+>|\bX{3,}\b")
+    COMPANY_PLACEHOLDER = re.compile(r"\[[^\]\n]*(?:compan|entreprise|soci[ée]t[ée]|bedrijf|empresa)[^\]\n]*\]",
+                                     re.IGNORECASE)
+    NAME_PLACEHOLDER = re.compile(r"\[(?:your |votre |uw |su )?(?:full )?(?:name|nom|naam|nombre)[^\]\n]*\]",
+                                  re.IGNORECASE)
+
+    # Markdown the model sometimes adds to a plain-text letter
+    MARKDOWN = (
+        (re.compile(r"^\s*```[\w-]*\s*$", re.MULTILINE), ""),            # code fences
+        (re.compile(r"^ {0,3}#{1,6}\s+", re.MULTILINE), ""),              # headings
+        (re.compile(r"\*\*(.+?)\*\*|__(.+?)__"), r"\1\2"),                # bold
+        (re.compile(r"(?<![\w*])\*(?=\S)([^*\n]+?)(?<=\S)\*(?![\w*])"), r"\1"),  # italics
+        (re.compile(r"^\s*(?:-{3,}|\*{3,}|_{3,})\s*$", re.MULTILINE), ""),  # horizontal rules
+    )
+
+    # First CV lines that are headings, not the candidate's name
+    CV_HEADINGS = ("curriculum", "resume", "résumé", "cv", "profile", "summary", "contact")
+
+    @classmethod
+    def check(cls, content: str, language: str, candidate_name: Optional[str] = None) -> List[str]:
+        """
+        Run every structure check on a letter.
+
+        Args:
+            content (str): The letter body.
+            language (str): Language code the letter must be written in (e.g. "french").
+            candidate_name (str, optional): Name expected in the signature.
+
+        Returns:
+            List[str]: Codes (keys of ISSUES) of the failed checks, empty for a valid letter.
+        """
+        issues = []
+        lines = [line.strip() for line in content.strip().splitlines() if line.strip()]
+        if not lines:
+            return list(cls.ISSUES)
+
+        salutations = cls.SALUTATIONS.get(language, ()) + (LanguageDetector.get_salutation(language).lower(),)
+        if not lines[0].lower().startswith(salutations):
+            issues.append("salutation")
+
+        # The closing is one of the last lines, followed by the signature
+        closings = cls.CLOSINGS.get(language, ()) + (LanguageDetector.get_closing(language).lower().rstrip(","),)
+        last_lines = range(len(lines) - 1, max(len(lines) - 5, 0) - 1, -1)
+        closing_line = next((i for i in last_lines if lines[i].lower().startswith(closings)), None)
+        if closing_line is None:
+            issues.append("closing")
+        else:
+            # Name on the following lines, or on the closing line itself ("Best regards, Jane Doe")
+            signature = " ".join(lines[closing_line + 1:]) or lines[closing_line].partition(",")[2].strip()
+            if not signature or (candidate_name and candidate_name.split()[-1].lower() not in signature.lower()):
+                issues.append("signature")
+
+        paragraphs = [paragraph for paragraph in re.split(r"\n\s*\n", content.strip()) if paragraph.strip()]
+        body = [paragraph for paragraph in paragraphs if len(paragraph.split()) >= 20]
+        if len(body) < cls.MIN_BODY_PARAGRAPHS:
+            issues.append("paragraphs")
+
+        words = len(content.split())
+        if not cls.MIN_WORDS <= words <= cls.MAX_WORDS:
+            issues.append("length")
+
+        detected, confidence = LanguageDetector.detect_language(content)
+        if detected != language and confidence >= cls.MIN_LANGUAGE_CONFIDENCE:
+            issues.append("language")
+
+        if cls.PLACEHOLDER_PATTERN.search(content):
+            issues.append("placeholder")
+        return issues
+
+    @classmethod
+    def repair(cls, content: str, language: str, candidate_name: Optional[str] = None,
+               company: Optional[str] = None) -> Tuple[str, List[str]]:
+        """
+        Fix the structure issues that do not need the model: escaped newlines left
+        by a broken JSON output, stray markdown, missing or wrong-language salutation
+        and closing, missing signature, and company or name placeholders.
+
+        Body paragraphs, length and language cannot be fixed locally.
+
+        Args:
+            content (str): The letter body.
+            language (str): Language code the letter must be written in.
+            candidate_name (str, optional): Name to sign with.
+            company (str, optional): Company name replacing company placeholders.
+
+        Returns:
+            tuple[str, List[str]]: The repaired letter and the codes of the applied fixes
+            ("escapes", "markdown", "salutation", "closing", "signature", "placeholder").
+        """
+        fixes = []
+
+        # Literal escape sequences of a double-encoded JSON string
+        if "\\n" in content and content.count("\n") <= content.count("\\n"):
+            content = content.replace("\\r\\n", "\n").replace("\\n", "\n").replace("\\t", " ").replace('\\"', '"')
+            fixes.append("escapes")
+
+        stripped = content
+        for pattern, replacement in cls.MARKDOWN:
+            stripped = pattern.sub(replacement, stripped)
+        if stripped != content:
+            content = stripped
+            fixes.append("markdown")
+
+        if company and cls.COMPANY_PLACEHOLDER.search(content):
+            content = cls.COMPANY_PLACEHOLDER.sub(company, content)
+            fixes.append("placeholder")
+        if candidate_name and cls.NAME_PLACEHOLDER.search(content):
+            content = cls.NAME_PLACEHOLDER.sub(candidate_name, content)
+            fixes.append("placeholder")
+
+        lines = [line.rstrip() for line in content.strip().splitlines()]
+        lines = [line for i, line in enumerate(lines) if line or (i and lines[i - 1])]  # single blank lines
+        if not any(lines):
+            return content, fixes
+        issues = cls.check("\n".join(lines), language, candidate_name)
+
+        if "salutation" in issues:
+            salutation = LanguageDetector.get_salutation(language)
+            any_salutation = tuple(prefix for prefixes in cls.SALUTATIONS.values() for prefix in prefixes)
+            if lines[0].lower().startswith(any_salutation) and len(lines[0].split()) <= 6:
+                lines[0] = salutation  # Salutation of another language
+            else:
+                lines[:0] = [salutation, ""]
+            fixes.append("salutation")
+
+        if "closing" in issues:
+            closing = LanguageDetector.get_closing(language)
+            any_closing = tuple(prefix for prefixes in cls.CLOSINGS.values() for prefix in prefixes)
+            last_lines = range(len(lines) - 1, max(len(lines) - 5, 0) - 1, -1)
+            foreign = next((i for i in last_lines if lines[i].lower().startswith(any_closing)), None)
+            if foreign is not None:
+                lines[foreign] = closing  # Closing of another language
+            elif cls._is_signature(lines[-1], candidate_name):
+                lines[-1:-1] = [closing] if len(lines) > 1 and not lines[-2] else ["", closing]
+            else:
+                lines += ["", closing]
+            fixes.append("closing")
+
+        if candidate_name and "signature" in cls.check("\n".join(lines), language, candidate_name):
+            lines.append(candidate_name)
+            fixes.append("signature")
+        return "\n".join(lines), fixes
+
+    @staticmethod
+    def _is_signature(line: str, candidate_name: Optional[str]) -> bool:
+        """Whether the last line of a letter looks like a signature rather than a sentence."""
+        if candidate_name:
+            return candidate_name.split()[-1].lower() in line.lower() and len(line.split()) <= 6
+        return 0 < len(line.split()) <= 4 and not line.endswith((".", "!", "?", ":", ","))
+
+    @classmethod
+    def candidate_name(cls, cv: str) -> Optional[str]:
+        """
+        Candidate's name, taken from the first line of the CV when it looks like one.
+
+        Returns:
+            str: The name, or None when the first line is a heading, contact details or a sentence.
+        """
+        first_line = next((line.strip() for line in cv.splitlines() if line.strip()), "")
+        words = first_line.split()
+        if not 2 <= len(words) <= 4 or any(word.lower().strip(":") in cls.CV_HEADINGS for word in words):
+            return None
+        if not all(re.fullmatch(r"[^\W\d_]+(?:[-'.][^\W\d_]*)*", word) for word in words):
+            return None
+        return first_line
+
+    @classmethod
+    def report(cls, letters: List[Dict]) -> Dict[str, float]:
+        """
+        Pass rate of each check over several letters.
+
+        Args:
+            letters (List[dict]): Letters with "content" and "language" (and optionally "candidate_name").
+
+        Returns:
+            dict: Check code -> share of letters passing it, plus "valid" (share passing every check).
+        """
+        if not letters:
+            return {}
+        failures = [
+            cls.check(letter["content"], letter["language"], letter.get("candidate_name")) for letter in letters
+        ]
+        rates = {code: sum(code not in issues for issues in failures) / len(letters) for code in cls.ISSUES}
+        rates["valid"] = sum(not issues for issues in failures) / len(letters)
+        return rates
+
+
+def parse_letter_json(text: str) -> Optional[dict]:
+    """
+    Recover the fields of a letter from structured output that failed to parse.
+
+    Handles code fences or prose around the JSON object, raw newlines inside
+    strings and, as a last resort, unescaped quotes (fields are then cut at the
+    next known key).
+
+    Args:
+        text (str): Tool-call arguments or message content returned by the model.
+
+    Returns:
+        dict: "title", "content" and possibly "company", or None when no letter content is found.
+    """
+    if not text:
+        return None
+    candidates = [text]
+    start, end = text.find("{"), text.rfind("}")
+    if 0 <= start < end:
+        candidates.append(text[start:end + 1])
+    for candidate in candidates:
+        try:
+            # strict=False accepts raw control characters (newlines, tabs) inside strings
+            fields = json.loads(candidate, strict=False)
+        except ValueError:
+            continue
+        if isinstance(fields, dict) and isinstance(fields.get("content"), str):
+            return fields
+
+    keys = "title|company|content"
+    fields = {}
+    for key in keys.split("|"):
+        match = re.search(rf'"{key}"\s*:\s*"(.*?)"\s*(?:,\s*"(?:{keys})"\s*:|}})', text, re.DOTALL)
+        if match:
+            value = match.group(1)
+            try:
+                value = json.loads(f'"{value}"', strict=False)
+            except ValueError:
+                value = value.replace("\\n", "\n").replace('\\"', '"')
+            fields[key] = value
+    return fields if fields.get("content") else None
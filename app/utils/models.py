@@ -1,40 +1,153 @@
-from langchain_groq import ChatGroq
-from config import get_api_key, MODEL
+import threading
+from config import get_api_key, MODEL, GROQ_BASE_URL, HTTP_MAX_CONNECTIONS, HTTP_KEEPALIVE_CONNECTIONS
+
+# Endpoint touched by warm_up to open pooled connections ahead of the first letter
+GROQ_API_BASE = GROQ_BASE_URL.rstrip("/") or "https://api.groq.com"
+WARM_UP_PATH = "/openai/v1/models"
 
 class Models:
     """
     Manages LLM model instances and configurations.
+
+    Instances are created once per model name and shared across threads.
+    Every instance talks to the API through one pooled HTTP client, so
+    concurrent jobs reuse warm connections instead of opening their own.
     """
-    
+
     _instances = {}
-    
+    _lock = threading.RLock()
+    _http_client = None
+
     @classmethod
-    def get_model(cls, model_name=None):
-        """Get or create a model instance for the specified model"""
+    def get_http_client(cls):
+        """
+        Get or create the HTTP client shared by all model instances.
+
+        Returns:
+            httpx.Client: Client with a keep-alive connection pool sized for the job concurrency.
+        """
+        if cls._http_client is None:
+            with cls._lock:
+                if cls._http_client is None:
+                    # httpx ships with the groq SDK; imported here to keep startup fast
+                    import httpx
+
+                    cls._http_client = httpx.Client(
+                        limits=httpx.Limits(
+                            max_connections=HTTP_MAX_CONNECTIONS,
+                            max_keepalive_connections=HTTP_KEEPALIVE_CONNECTIONS
+                        ),
+                        timeout=httpx.Timeout(60.0, connect=10.0)
+                    )
+        return cls._http_client
+
+    @classmethod
+    def get_model(cls, model_name=None, temperature=None, max_tokens=None):
+        """
+        Get or create a model instance for the specified model.
+
+        Args:
+            model_name (str, optional): Name of the model. Falls back to MODEL from config.
+            temperature (float, optional): Sampling temperature overriding the default (0.7).
+            max_tokens (int, optional): Completion length overriding the default (2000).
+
+        Returns:
+            ChatGroq: The shared instance, or a copy with the overrides applied that
+            reuses its API client and connection pool.
+        """
         # Use provided model name or fall back to config
         model_to_use = model_name or MODEL
-        
-        # Check if we already have an instance for this model
-        if model_to_use not in cls._instances:
-            api_key = get_api_key()
-            if not api_key:
-                raise ValueError("GROQ_API_KEY not set. Please set it in .env file or Streamlit secrets.")
-            
-            cls._instances[model_to_use] = ChatGroq(
-                model=model_to_use,
-                api_key=api_key,
-                temperature=0.7,
-                max_tokens=2000,
-                timeout=60,
-                max_retries=2
-            )
-        return cls._instances[model_to_use]
-    
+        overrides = {
+            key: value for key, value in (("temperature", temperature), ("max_tokens", max_tokens))
+            if value is not None
+        }
+        key = (model_to_use, tuple(sorted(overrides.items())))
+
+        # Fast path without locking once the instance exists
+        instance = cls._instances.get(key)
+        if instance is not None:
+            return instance
+
+        with cls._lock:
+            if key in cls._instances:
+                return cls._instances[key]
+
+            base_key = (model_to_use, ())
+            if base_key not in cls._instances:
+                cls._instances[base_key] = cls._create(model_to_use)
+            if overrides:
+                # Shallow copy: the groq client (and its connection pool) is shared, not rebuilt
+                cls._instances[key] = cls._instances[base_key].model_copy(update=overrides)
+            return cls._instances[key]
+
+    @classmethod
+    def _create(cls, model_name):
+        """Build a ChatGroq instance on the shared HTTP client (lock held)."""
+        api_key = get_api_key()
+        if not api_key:
+            raise ValueError("GROQ_API_KEY not set. Please set it in .env file or Streamlit secrets.")
+
+        # Imported on first use: langchain_groq is one of the slowest startup imports
+        from langchain_groq import ChatGroq
+
+        options = {"base_url": GROQ_BASE_URL} if GROQ_BASE_URL else {}
+        return ChatGroq(
+            model=model_name,
+            api_key=api_key,
+            temperature=0.7,
+            max_tokens=2000,
+            timeout=60,
+            max_retries=2,
+            http_client=cls.get_http_client(),
+            **options
+        )
+
+    @classmethod
+    def warm_up(cls, model_names=None, background=True):
+        """
+        Create model instances and open pooled connections to the API ahead of use,
+        so the first letter does not pay for DNS and TLS setup.
+
+        Args:
+            model_names (list[str], optional): Models to instantiate. Defaults to MODEL.
+            background (bool, optional): Run in a daemon thread and return immediately.
+
+        Returns:
+            threading.Thread | None: The warm-up thread when run in the background.
+        """
+        def run():
+            try:
+                for name in model_names or [MODEL]:
+                    cls.get_model(name)
+                # Any response (even 401) leaves a warm keep-alive connection in the pool
+                cls.get_http_client().get(
+                    GROQ_API_BASE + WARM_UP_PATH,
+                    headers={"Authorization": f"Bearer {get_api_key()}"}
+                )
+            except Exception as e:
+                print(f"⚠️ Model warm-up failed: {e}")
+
+        if not background:
+            run()
+            return None
+        thread = threading.Thread(target=run, name="models-warm-up", daemon=True)
+        thread.start()
+        return thread
+
+    @classmethod
+    def reset(cls):
+        """Drop cached instances and close the shared HTTP client (e.g. after an API key change)."""
+        with cls._lock:
+            cls._instances.clear()
+            if cls._http_client is not None:
+                cls._http_client.close()
+                cls._http_client = None
+
     # Create a class-level attribute for backward compatibility
     MISTRAL = None
-    
+
     def __class_getattr__(cls, name):
         """Handle dynamic attribute access for backward compatibility"""
         if name == "MISTRAL":
             return cls.get_model()
-        raise AttributeError(f"'{cls.__name__}' object has no attribute '{name}'")
\ No newline at end of file
+        raise AttributeError(f"'{cls.__name__}' object has no attribute '{name}'")
@@ -0,0 +1,207 @@
+"""
+Page-level PDF text extraction for CVs and portfolios.
+
+Large documents are split into page-range chunks extracted in a process pool:
+one per call for short-lived callers (CLI), or a single shared pool started
+with `spawn` for long-lived threaded processes such as the Streamlit app,
+where forking would copy the state of the other threads.
+A fast mode reads the PDF text layer directly with pypdfium2 (installed with
+pdfplumber) and only falls back to pdfplumber's layout analysis for pages
+whose text layer is missing or garbled.
+"""
+
+import importlib.util
+import multiprocessing
+import os
+import threading
+import warnings
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+from io import BytesIO
+from pathlib import Path
+from typing import List, Optional, Union
+
+# pdfplumber and pypdfium2 are imported on first extraction to keep startup fast
+HAS_PDFIUM = importlib.util.find_spec("pypdfium2") is not None
+
+# Documents with fewer pages are extracted in-process
+PARALLEL_MIN_PAGES = 6
+
+# Pages handed to a worker at once
+PAGES_PER_CHUNK = 4
+
+# Hard caps protecting the pipeline from huge uploads
+MAX_PAGES = 40
+MAX_CHARS = 200_000
+
+# Characters emitted for glyphs without a unicode mapping
+_UNMAPPED_CHARS = {'\ufffd', '\ufffe', '\x00'}
+
+# Pool reused across calls with shared_pool=True, created on first use
+_shared_pool: Optional[ProcessPoolExecutor] = None
+_shared_pool_lock = threading.Lock()
+
+
+def has_clean_text(text: str) -> bool:
+    """
+    Check whether text read from the PDF text layer is usable as-is.
+
+    Args:
+        text: Text extracted from one page
+
+    Returns:
+        bool: False when the page looks empty, scanned or badly encoded
+    """
+    stripped = text.strip()
+    if len(stripped) < 20 or '(cid:' in stripped:
+        return False
+    unmapped = sum(1 for char in stripped if char in _UNMAPPED_CHARS)
+    return unmapped / len(stripped) < 0.01
+
+
+def _extract_fast(data: bytes, start: int, stop: int) -> List[Optional[str]]:
+    """Read the raw text layer of pages [start, stop), None where it is not clean."""
+    import pypdfium2 as pdfium
+
+    texts = []
+    pdf = pdfium.PdfDocument(data)
+    try:
+        for index in range(start, stop):
+            page = pdf[index]
+            textpage = page.get_textpage()
+            txt = textpage.get_text_range().replace('\r\n', '\n')
+            textpage.close()
+            page.close()
+            texts.append(txt if has_clean_text(txt) else None)
+    finally:
+        pdf.close()
+    return texts
+
+
+def extract_page_range(data: bytes, start: int, stop: int, fast: bool = True) -> List[str]:
+    """
+    Extract the text of pages [start, stop) of a PDF.
+
+    Runs in worker processes, so it only takes picklable arguments.
+
+    Args:
+        data: Raw PDF bytes
+        start: First page index (inclusive)
+        stop: Last page index (exclusive)
+        fast: Try the raw text layer before layout analysis
+
+    Returns:
+        List[str]: One text per page, empty for pages without text
+    """
+    texts = _extract_fast(data, start, stop) if fast and HAS_PDFIUM else [None] * (stop - start)
+
+    missing = [offset for offset, txt in enumerate(texts) if txt is None]
+    if missing:
+        import pdfplumber
+
+        with warnings.catch_warnings():
+            warnings.simplefilter("ignore")
+            with pdfplumber.open(BytesIO(data)) as pdf:
+                for offset in missing:
+                    # Extract text with adjusted tolerance for better layout preservation
+                    txt = pdf.pages[start + offset].extract_text(x_tolerance=1.5, y_tolerance=2)
+                    texts[offset] = txt or ''
+    return texts
+
+
+def count_pages(data: bytes) -> int:
+    """Return the number of pages of a PDF."""
+    if HAS_PDFIUM:
+        import pypdfium2 as pdfium
+
+        pdf = pdfium.PdfDocument(data)
+        try:
+            return len(pdf)
+        finally:
+            pdf.close()
+
+    import pdfplumber
+
+    with warnings.catch_warnings():
+        warnings.simplefilter("ignore")
+        with pdfplumber.open(BytesIO(data)) as pdf:
+            return len(pdf.pages)
+
+
+def _get_shared_pool() -> ProcessPoolExecutor:
+    """Return the module-level pool, starting it (with `spawn`) on first use."""
+    global _shared_pool
+    with _shared_pool_lock:
+        if _shared_pool is None:
+            _shared_pool = ProcessPoolExecutor(max_workers=os.cpu_count() or 1,
+                                               mp_context=multiprocessing.get_context("spawn"))
+        return _shared_pool
+
+
+def _reset_shared_pool(pool: ProcessPoolExecutor) -> None:
+    """Drop a broken shared pool so the next call starts a new one."""
+    global _shared_pool
+    with _shared_pool_lock:
+        if _shared_pool is pool:
+            _shared_pool = None
+    pool.shutdown(wait=False)
+
+
+def extract_text(source: Union[str, Path, bytes, BytesIO], fast: bool = True,
+                 max_pages: int = MAX_PAGES, max_chars: int = MAX_CHARS,
+                 workers: Optional[int] = None, shared_pool: bool = False) -> str:
+    """
+    Extract the text of a PDF, page ranges in parallel for large documents.
+
+    Args:
+        source: Path, raw bytes or binary file object of the PDF
+        fast: Read the text layer directly when it is clean
+        max_pages: Only the first `max_pages` pages are extracted
+        max_chars: The result is cut at `max_chars` characters
+        workers: Worker processes (defaults to the CPU count), ignored with `shared_pool`
+        shared_pool: Use the module-level `spawn` pool instead of a pool per call
+
+    Returns:
+        str: Page texts joined with newlines
+    """
+    if isinstance(source, (str, Path)):
+        data = Path(source).read_bytes()
+    elif isinstance(source, (bytes, bytearray)):
+        data = bytes(source)
+    else:
+        data = source.read()
+
+    total = min(count_pages(data), max_pages)
+    chunks = [(start, min(start + PAGES_PER_CHUNK, total))
+              for start in range(0, total, PAGES_PER_CHUNK)]
+
+    texts = None
+    if total >= PARALLEL_MIN_PAGES and len(chunks) > 1:
+        max_workers = min(workers or os.cpu_count() or 1, len(chunks))
+        if shared_pool and (os.cpu_count() or 1) > 1:
+            pool = None
+            try:
+                pool = _get_shared_pool()
+                futures = [pool.submit(extract_page_range, data, start, stop, fast)
+                           for start, stop in chunks]
+                texts = [txt for future in futures for txt in future.result()]
+            except (BrokenProcessPool, OSError):
+                # Process pools can be unavailable (sandboxed hosts), extract in-process
+                if pool is not None:
+                    _reset_shared_pool(pool)
+                texts = None
+        elif not shared_pool and max_workers > 1:
+            try:
+                with ProcessPoolExecutor(max_workers=max_workers) as pool:
+                    futures = [pool.submit(extract_page_range, data, start, stop, fast)
+                               for start, stop in chunks]
+                    texts = [txt for future in futures for txt in future.result()]
+            except (BrokenProcessPool, OSError):
+                # Process pools can be unavailable (sandboxed hosts), extract in-process
+                texts = None
+
+    if texts is None:
+        texts = [txt for start, stop in chunks for txt in extract_page_range(data, start, stop, fast)]
+
+    content = ''.join(txt + '\n' for txt in texts if txt)
+    return content[:max_chars]
@@ -2,15 +2,124 @@
 Prompt templates for LLM interactions.
 """
 
-from langchain.prompts import PromptTemplate
+from utils.language_detector import LanguageDetector
+
+
+class LazyPromptTemplate:
+    """
+    Class attribute building its PromptTemplate on first access,
+    so importing this module does not import LangChain.
+    """
+
+    def __init__(self, template: str):
+        self.template = template
+        self._prompt = None
+
+    def __get__(self, instance, owner):
+        if self._prompt is None:
+            from langchain_core.prompts import PromptTemplate
+            self._prompt = PromptTemplate.from_template(self.template)
+        return self._prompt
+
+
+class LazyChatPromptTemplate:
+    """
+    Class attribute building its ChatPromptTemplate from (role, template)
+    messages on first access, like LazyPromptTemplate.
+    """
+
+    def __init__(self, messages: list):
+        self.messages = messages
+        self._prompt = None
+
+    def __get__(self, instance, owner):
+        if self._prompt is None:
+            from langchain_core.prompts import ChatPromptTemplate
+            self._prompt = ChatPromptTemplate.from_messages(self.messages)
+        return self._prompt
 
 
 class Prompt:
     """
     Centralized prompt templates for the application.
+
+    Letter generation has two variants taking the same inputs (cv, job_description,
+    language, salutation, closing): "full", the original single template, and
+    "compact", which moves the static instructions to a system message and only
+    states the salutation and closing of the target language.
     """
     
-    GENERATE_MOTIVATION = PromptTemplate.from_template(
+    # Bump whenever a template changes, so letters built from the old prompt are regenerated
+    GENERATE_MOTIVATION_VERSION = 1
+    GENERATE_MOTIVATION_COMPACT_VERSION = 1
+    REPAIR_LETTER_VERSION = 1
+
+    VARIANTS = ("full", "compact")
+
+    @classmethod
+    def generate_motivation(cls, variant: str = "full"):
+        """
+        Letter-generation prompt of a variant and its version.
+
+        Args:
+            variant (str, optional): One of VARIANTS.
+
+        Returns:
+            tuple: The prompt template and its version (recorded in the letter manifest).
+        """
+        if variant == "full":
+            return cls.GENERATE_MOTIVATION, cls.GENERATE_MOTIVATION_VERSION
+        if variant == "compact":
+            return cls.GENERATE_MOTIVATION_COMPACT, f"compact-{cls.GENERATE_MOTIVATION_COMPACT_VERSION}"
+        raise ValueError(f"Unknown prompt variant: {variant} (expected one of {', '.join(cls.VARIANTS)})")
+
+    @staticmethod
+    def repair_inputs(title: str, content: str, issues: list, language: str, candidate_name: str = None) -> dict:
+        """
+        Inputs of REPAIR_LETTER.
+
+        Args:
+            title (str): Title of the letter to fix.
+            content (str): The letter to fix.
+            issues (list): Descriptions of the problems found by LetterValidator.
+            language (str): Language code the letter must be written in.
+            candidate_name (str, optional): Name to sign with, if known.
+
+        Returns:
+            dict: Inputs of the repair prompt.
+        """
+        return {
+            "title": title,
+            "content": content,
+            "issues": "\n".join(f"- {issue}" for issue in issues),
+            "language": LanguageDetector.get_language_name(language),
+            "salutation": LanguageDetector.get_salutation(language),
+            "closing": LanguageDetector.get_closing(language),
+            "signature": candidate_name or "the candidate's full name",
+        }
+
+    @staticmethod
+    def letter_inputs(cv: str, job_description: str, language: str) -> dict:
+        """
+        Inputs of the letter-generation prompts.
+
+        Args:
+            cv (str): CV text (already truncated).
+            job_description (str): Job posting text (already truncated).
+            language (str): Detected language code (e.g. "french").
+
+        Returns:
+            dict: cv, job_description, language name, and that language's salutation and closing.
+        """
+        return {
+            "cv": cv,
+            "job_description": job_description,
+            "language": LanguageDetector.get_language_name(language),
+            "salutation": LanguageDetector.get_salutation(language),
+            "closing": LanguageDetector.get_closing(language),
+        }
+
+    GENERATE_MOTIVATION = LazyPromptTemplate(
         """You are an expert multilingual career counselor and professional writer specializing in creating 
 personalized, authentic cover letters with perfect structure in multiple languages.
 
@@ -84,3 +193,49 @@ IMPORTANT: Return a structured CoverLetterSchema with:
 Remember: The goal is to create a compelling, authentic letter that stands out and avoids AI detection.
 """
     )
+
+    GENERATE_MOTIVATION_COMPACT = LazyChatPromptTemplate([
+        ("system", """You are an expert multilingual career counselor who writes personalized, authentic cover letters.
+
+Write the cover letter from the candidate's CV for the job description, entirely in the requested language and following its cultural conventions. Structure, with paragraphs separated by blank lines:
+1. Salutation (the one given).
+2. Introduction (3-4 sentences): enthusiasm for this position and company, the candidate's most relevant role or qualification, why this opportunity.
+3. Experience (4-5 sentences): most relevant experience from the CV with employer/project names and measurable achievements, tied to the job requirements.
+4. Skills (3-4 sentences): matching tools, technologies and methods, and how they meet the employer's needs.
+5. Conclusion (2-3 sentences): motivation, interest in an interview, thanks.
+6. Closing (the one given), then the candidate's full name from the CV.
+
+Style: specific rather than generic, varied sentences, professional but personal, natural industry terminology.
+
+Return a title (e.g. "Application for Data Analyst position") and the complete letter as content."""),
+        ("human", """Language: {language}
+Salutation: {salutation}
+Closing: {closing}
+
+CV:
+{cv}
+
+Job description:
+{job_description}"""),
+    ])
+
+    # Targeted fix of a letter that failed the local checks: only the letter is resent, not the CV and job
+    REPAIR_LETTER = LazyChatPromptTemplate([
+        ("system", """You correct cover letters. Fix only the listed problems and keep everything else: facts, \
+names, achievements, tone and paragraph order. The letter must start with the given salutation, have its body \
+paragraphs separated by blank lines, and end with the given closing followed by the signature.
+
+Return the title and the complete corrected letter as content."""),
+        ("human", """Language: {language}
+Salutation: {salutation}
+Closing: {closing}
+Signature: {signature}
+
+Problems to fix:
+{issues}
+
+Title: {title}
+
+Letter:
+{content}"""),
+    ])
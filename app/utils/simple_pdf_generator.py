@@ -2,143 +2,84 @@
 Simple PDF generation for cover letters using FPDF (fallback solution).
 """
 
+from io import BytesIO
 from pathlib import Path
 from datetime import datetime
+from types import SimpleNamespace
+from typing import BinaryIO, Iterable, Optional, Tuple
+import importlib.util
 import textwrap
+import threading
+from utils import tracing
 
-try:
-    from fpdf import FPDF
-    HAS_FPDF = True
-except ImportError:
-    HAS_FPDF = False
-    
-try:
-    from reportlab.lib.pagesizes import A4
-    from reportlab.lib.styles import getSampleStyleSheet, ParagraphStyle
-    from reportlab.lib.units import inch
-    from reportlab.platypus import SimpleDocTemplate, Paragraph, Spacer
-    from reportlab.lib.enums import TA_JUSTIFY, TA_LEFT, TA_CENTER
-    HAS_REPORTLAB = True
-except ImportError:
-    HAS_REPORTLAB = False
+# PDF libraries are only imported when a generator actually uses them,
+# which keeps application startup fast
+HAS_FPDF = importlib.util.find_spec("fpdf") is not None
+HAS_REPORTLAB = importlib.util.find_spec("reportlab") is not None
 
 
-class SimplePDFGenerator:
-    """
-    Generates PDF cover letters with a simple fallback to HTML if PDF libraries are not available.
-    """
-    
-    def generate_pdf(self, title: str, content: str, output_path: Path) -> Path:
-        """
-        Generate a PDF or HTML file based on available libraries.
-        
-        Args:
-            title: The title of the position
-            content: The cover letter content
-            output_path: Path where the file should be saved
-            
-        Returns:
-            Path: The path to the generated file
-        """
-        if HAS_REPORTLAB:
-            return self._generate_reportlab_pdf(title, content, output_path)
-        elif HAS_FPDF:
-            return self._generate_fpdf_pdf(title, content, output_path)
-        else:
-            return self._generate_html(title, content, output_path)
-    
-    def _generate_html(self, title: str, content: str, output_path: Path) -> Path:
-        """
-        Generate an HTML file as a fallback when PDF libraries are not available.
-        """
-        html_filename = output_path.with_suffix('.html')
-        
-        # Parse content into paragraphs
-        paragraphs = [p.strip() for p in content.split('\n') if p.strip()]
-        
-        # Build HTML content
-        html_content = f"""<!DOCTYPE html>
-<html lang="en">
-<head>
-    <meta charset="UTF-8">
-    <meta name="viewport" content="width=device-width, initial-scale=1.0">
-    <title>{title}</title>
-    <style>
-        @media print {{
-            body {{ margin: 0; }}
-            .container {{ padding: 20px; }}
-        }}
-        body {{
+def default_backend() -> str:
+    """Return the best rendering backend available ('reportlab', 'fpdf' or 'html')."""
+    return 'reportlab' if HAS_REPORTLAB else 'fpdf' if HAS_FPDF else 'html'
+
+
+# Static parts of the HTML fallback document, kept out of the per-letter path
+HTML_STYLE = """        @media print {
+            body { margin: 0; }
+            .container { padding: 20px; }
+        }
+        body {
             font-family: 'Helvetica Neue', Helvetica, Arial, sans-serif;
             line-height: 1.6;
             color: #000;
             background: white;
             margin: 0;
             padding: 0;
-        }}
-        .container {{
+        }
+        .container {
             max-width: 800px;
             margin: 0 auto;
             padding: 40px;
             background: white;
-        }}
-        h1 {{
+        }
+        h1 {
             font-size: 20px;
             text-align: center;
             margin-bottom: 10px;
             font-weight: bold;
-        }}
-        .date {{
+        }
+        .date {
             color: #333;
             margin-bottom: 30px;
             font-size: 14px;
-        }}
-        .salutation {{
+        }
+        .salutation {
             margin-bottom: 15px;
             font-size: 14px;
-        }}
-        p {{
+        }
+        p {
             margin-bottom: 15px;
             text-align: justify;
             font-size: 14px;
             line-height: 1.8;
-        }}
-        .closing {{
+        }
+        .closing {
             margin-top: 30px;
             margin-bottom: 5px;
             font-size: 14px;
-        }}
-        .signature {{
+        }
+        .signature {
             font-weight: bold;
             font-size: 14px;
             margin-top: 30px;
-        }}
-        @page {{
+        }
+        @page {
             size: A4;
             margin: 2cm;
-        }}
-    </style>
-</head>
-<body>
-    <div class="container">
-        <h1>{title}</h1>
-        <div class="date">{datetime.now().strftime("%B %d, %Y")}</div>
+        }
 """
-        
-        # Process paragraphs
-        for i, para in enumerate(paragraphs):
-            para_lower = para.lower()
-            
-            if para_lower.startswith(('dear', 'to whom')):
-                html_content += f'        <div class="salutation">{para}</div>\n'
-            elif any(word in para_lower for word in ['sincerely', 'regards', 'best', 'respectfully']):
-                html_content += f'        <div class="closing">{para}</div>\n'
-            elif i == len(paragraphs) - 1 and len(para) < 50:
-                html_content += f'        <div class="signature">{para}</div>\n'
-            else:
-                html_content += f'        <p>{para}</p>\n'
-        
-        html_content += """    </div>
+
+HTML_FOOTER = """    </div>
     <script>
         // Automatically offer to print as PDF when opened
         window.onload = function() {
@@ -153,85 +94,296 @@ class SimplePDFGenerator:
     </script>
 </body>
 </html>"""
+
+SALUTATION_PREFIXES = ('dear', 'to whom')
+CLOSING_WORDS = ('sincerely', 'regards', 'best', 'respectfully')
+
+
+class RenderContext:
+    """
+    Preloaded styles and templates shared by every letter rendered by one generator.
+
+    Building ReportLab's sample stylesheet and the custom paragraph styles is the
+    most expensive part of rendering a short letter, so it is done once here
+    instead of once per document.
+    """
+
+    def __init__(self, backend: str = 'html'):
+        # HTML shell with only the per-letter fields left to fill in
+        self.html_header = (
+            '<!DOCTYPE html>\n'
+            '<html lang="en">\n'
+            '<head>\n'
+            '    <meta charset="UTF-8">\n'
+            '    <meta name="viewport" content="width=device-width, initial-scale=1.0">\n'
+            '    <title>{title}</title>\n'
+            '    <style>\n'
+            + HTML_STYLE.replace('{', '{{').replace('}', '}}') +
+            '    </style>\n'
+            '</head>\n'
+            '<body>\n'
+            '    <div class="container">\n'
+            '        <h1>{title}</h1>\n'
+            '        <div class="date">{date}</div>\n'
+        )
+        self.html_footer = HTML_FOOTER
+
+        # Line wrapper for the FPDF backend
+        self.wrapper = textwrap.TextWrapper(width=80)
+
+        if backend == 'reportlab':
+            from reportlab.lib.pagesizes import A4
+            from reportlab.lib.styles import getSampleStyleSheet, ParagraphStyle
+            from reportlab.lib.units import inch
+            from reportlab.platypus import SimpleDocTemplate, Paragraph, Spacer, PageBreak
+            from reportlab.lib.enums import TA_JUSTIFY, TA_CENTER
+            from reportlab.lib.colors import HexColor
+
+            self.reportlab = SimpleNamespace(
+                A4=A4, inch=inch, SimpleDocTemplate=SimpleDocTemplate,
+                Paragraph=Paragraph, Spacer=Spacer, PageBreak=PageBreak
+            )
+
+            styles = getSampleStyleSheet()
+            self.date_style = styles['Normal']
+
+            # Custom styles
+            self.title_style = ParagraphStyle(
+                'CustomTitle',
+                parent=styles['Heading1'],
+                fontSize=16,
+                textColor=HexColor('#000000'),
+                spaceAfter=20,
+                alignment=TA_CENTER,
+                fontName='Helvetica-Bold'
+            )
+
+            self.body_style = ParagraphStyle(
+                'BodyText',
+                parent=styles['Normal'],
+                fontSize=11,
+                textColor=HexColor('#000000'),
+                alignment=TA_JUSTIFY,
+                spaceAfter=12,
+                leading=16,
+                fontName='Helvetica'
+            )
+
+
+class SimplePDFGenerator:
+    """
+    Generates PDF cover letters with a simple fallback to HTML if PDF libraries are not available.
+
+    Letters can be written to disk with `generate_pdf` or rendered entirely in
+    memory with `render_to_buffer`, which is what the Streamlit app uses for downloads.
+    """
+
+    BACKENDS = {
+        'reportlab': ('.pdf', 'application/pdf'),
+        'fpdf': ('.pdf', 'application/pdf'),
+        'html': ('.html', 'text/html'),
+    }
+
+    def __init__(self, backend: Optional[str] = None):
+        """
+        Initialize the generator.
+
+        Args:
+            backend: Force a backend ('reportlab', 'fpdf' or 'html').
+                Defaults to the best one available.
+        """
+        if backend is None:
+            backend = default_backend()
+        if backend not in self.BACKENDS:
+            raise ValueError(f"Unknown PDF backend: {backend}")
+        if (backend == 'reportlab' and not HAS_REPORTLAB) or (backend == 'fpdf' and not HAS_FPDF):
+            raise ValueError(f"PDF backend '{backend}' is not installed")
+
+        self.backend = backend
+        self.extension, self.mime_type = self.BACKENDS[backend]
+        self._backend_render = {
+            'reportlab': self._render_reportlab_pdf,
+            'fpdf': self._render_fpdf_pdf,
+            'html': self._render_html,
+        }[backend]
+
+        # ReportLab and FPDF are not thread-safe, renders are serialized per generator
+        self._lock = threading.Lock()
+
+        # Styles and templates are built once and reused for every letter
+        self.context = RenderContext(backend)
+    
+    def generate_pdf(self, title: str, content: str, output_path: Path) -> Path:
+        """
+        Generate a PDF or HTML file based on available libraries.
         
-        # Write HTML file
-        with open(html_filename, 'w', encoding='utf-8') as f:
-            f.write(html_content)
-        
-        return html_filename
+        Args:
+            title: The title of the position
+            content: The cover letter content
+            output_path: Path where the file should be saved
+            
+        Returns:
+            Path: The path to the generated file
+        """
+        filename = Path(output_path).with_suffix(self.extension)
+        with open(filename, 'wb') as f:
+            self._render(title, content, f)
+        return filename
+
+    def render_to_buffer(self, title: str, content: str) -> BytesIO:
+        """
+        Render a letter in memory without touching the filesystem.
+
+        Args:
+            title: The title of the position
+            content: The cover letter content
+
+        Returns:
+            BytesIO: Buffer positioned at the start of the rendered document.
+                Its format is given by `extension` and `mime_type`.
+        """
+        buffer = BytesIO()
+        self._render(title, content, buffer)
+        buffer.seek(0)
+        return buffer
+
+    def render_bytes(self, title: str, content: str) -> bytes:
+        """Render a letter in memory and return the raw document bytes."""
+        return self.render_to_buffer(title, content).getvalue()
+
+    def render_to_stream(self, title: str, content: str, stream: BinaryIO) -> None:
+        """
+        Render a letter directly into a writable binary stream (file, ZIP entry, socket...).
+
+        Args:
+            title: The title of the position
+            content: The cover letter content
+            stream: Destination stream
+        """
+        self._render(title, content, stream)
+
+    def render_merged(self, letters: Iterable[Tuple[str, str]], stream: BinaryIO) -> int:
+        """
+        Render several letters into one multi-page PDF, each letter starting on a new page.
+
+        Args:
+            letters: Iterable of (title, content) pairs
+            stream: Destination stream
+
+        Returns:
+            int: Number of letters written
+        """
+        if self.backend == 'reportlab':
+            story = []
+            count = 0
+            for title, content in letters:
+                if story:
+                    story.append(self.context.reportlab.PageBreak())
+                story.extend(self._reportlab_story(title, content))
+                count += 1
+            if story:
+                with self._lock:
+                    self._reportlab_doc(stream).build(story)
+            return count
+
+        if self.backend == 'fpdf':
+            pdf = None
+            count = 0
+            for title, content in letters:
+                pdf = self._fpdf_add_letter(title, content, pdf)
+                count += 1
+            if pdf is not None:
+                with self._lock:
+                    self._fpdf_output(pdf, stream)
+            return count
+
+        raise ValueError("Merged PDF export requires reportlab or fpdf")
     
-    def _generate_reportlab_pdf(self, title: str, content: str, output_path: Path) -> Path:
-        """Generate PDF using reportlab if available."""
-        from reportlab.lib.pagesizes import A4
-        from reportlab.lib.styles import getSampleStyleSheet, ParagraphStyle
-        from reportlab.lib.units import inch
-        from reportlab.platypus import SimpleDocTemplate, Paragraph, Spacer
-        from reportlab.lib.enums import TA_JUSTIFY, TA_CENTER
-        from reportlab.lib.colors import HexColor
+    def _render(self, title: str, content: str, stream: BinaryIO) -> None:
+        """Render one letter with the selected backend."""
+        with self._lock, tracing.span("render", backend=self.backend):
+            self._backend_render(title, content, stream)
+
+    def _render_html(self, title: str, content: str, stream: BinaryIO) -> None:
+        """
+        Render an HTML document as a fallback when PDF libraries are not available.
+        """
+        # Parse content into paragraphs
+        paragraphs = [p.strip() for p in content.split('\n') if p.strip()]
+        
+        # Build HTML content from the preloaded shell
+        parts = [self.context.html_header.format(
+            title=title,
+            date=datetime.now().strftime("%B %d, %Y")
+        )]
         
-        pdf_filename = output_path.with_suffix('.pdf')
-        doc = SimpleDocTemplate(
-            str(pdf_filename),
-            pagesize=A4,
+        # Process paragraphs
+        last_index = len(paragraphs) - 1
+        for i, para in enumerate(paragraphs):
+            para_lower = para.lower()
+            
+            if para_lower.startswith(SALUTATION_PREFIXES):
+                parts.append(f'        <div class="salutation">{para}</div>\n')
+            elif any(word in para_lower for word in CLOSING_WORDS):
+                parts.append(f'        <div class="closing">{para}</div>\n')
+            elif i == last_index and len(para) < 50:
+                parts.append(f'        <div class="signature">{para}</div>\n')
+            else:
+                parts.append(f'        <p>{para}</p>\n')
+        
+        parts.append(self.context.html_footer)
+        stream.write(''.join(parts).encode('utf-8'))
+    
+    def _render_reportlab_pdf(self, title: str, content: str, stream: BinaryIO) -> None:
+        """Render a PDF using reportlab if available."""
+        self._reportlab_doc(stream).build(self._reportlab_story(title, content))
+
+    def _reportlab_doc(self, stream: BinaryIO):
+        """Create the A4 document template used for every letter."""
+        rl = self.context.reportlab
+        return rl.SimpleDocTemplate(
+            stream,
+            pagesize=rl.A4,
             rightMargin=72,
             leftMargin=72,
             topMargin=72,
             bottomMargin=72
         )
-        
-        styles = getSampleStyleSheet()
-        
-        # Custom styles
-        title_style = ParagraphStyle(
-            'CustomTitle',
-            parent=styles['Heading1'],
-            fontSize=16,
-            textColor=HexColor('#000000'),
-            spaceAfter=20,
-            alignment=TA_CENTER,
-            fontName='Helvetica-Bold'
-        )
-        
-        body_style = ParagraphStyle(
-            'BodyText',
-            parent=styles['Normal'],
-            fontSize=11,
-            textColor=HexColor('#000000'),
-            alignment=TA_JUSTIFY,
-            spaceAfter=12,
-            leading=16,
-            fontName='Helvetica'
-        )
-        
+
+    def _reportlab_story(self, title: str, content: str) -> list:
+        """Build the ReportLab flowables for one letter."""
+        context = self.context
+        rl = context.reportlab
         story = []
         
         # Add title
-        story.append(Paragraph(title, title_style))
-        story.append(Spacer(1, 0.2 * inch))
+        story.append(rl.Paragraph(title, context.title_style))
+        story.append(rl.Spacer(1, 0.2 * rl.inch))
         
         # Add date
         date_text = datetime.now().strftime("%B %d, %Y")
-        story.append(Paragraph(date_text, styles['Normal']))
-        story.append(Spacer(1, 0.3 * inch))
+        story.append(rl.Paragraph(date_text, context.date_style))
+        story.append(rl.Spacer(1, 0.3 * rl.inch))
         
         # Add content paragraphs
         paragraphs = content.split('\n')
         for para_text in paragraphs:
             if para_text.strip():
-                para = Paragraph(para_text.strip(), body_style)
+                para = rl.Paragraph(para_text.strip(), context.body_style)
                 story.append(para)
-                story.append(Spacer(1, 0.1 * inch))
+                story.append(rl.Spacer(1, 0.1 * rl.inch))
         
-        doc.build(story)
-        return pdf_filename
+        return story
     
-    def _generate_fpdf_pdf(self, title: str, content: str, output_path: Path) -> Path:
-        """Generate PDF using FPDF if available."""
-        from fpdf import FPDF
-        
-        pdf_filename = output_path.with_suffix('.pdf')
-        
-        pdf = FPDF()
+    def _render_fpdf_pdf(self, title: str, content: str, stream: BinaryIO) -> None:
+        """Render a PDF using FPDF if available."""
+        self._fpdf_output(self._fpdf_add_letter(title, content), stream)
+
+    def _fpdf_add_letter(self, title: str, content: str, pdf=None):
+        """Draw one letter on a new page, creating the FPDF document if needed."""
+        if pdf is None:
+            from fpdf import FPDF
+            pdf = FPDF()
         pdf.add_page()
         pdf.set_margins(25, 25, 25)
         
@@ -251,10 +403,20 @@ class SimplePDFGenerator:
         for para in paragraphs:
             if para.strip():
                 # Wrap text
-                lines = textwrap.wrap(para.strip(), width=80)
+                lines = self.context.wrapper.wrap(para.strip())
                 for line in lines:
                     pdf.cell(0, 6, line, 0, 1)
                 pdf.ln(3)
         
-        pdf.output(str(pdf_filename))
-        return pdf_filename
\ No newline at end of file
+        return pdf
+
+    @staticmethod
+    def _fpdf_output(pdf, stream: BinaryIO) -> None:
+        """Write a finished FPDF document to a stream."""
+        from fpdf import FPDF_VERSION
+
+        # fpdf 1.x returns a latin-1 string, fpdf2 returns a bytearray
+        if FPDF_VERSION.startswith('1.'):
+            stream.write(pdf.output(dest='S').encode('latin-1'))
+        else:
+            stream.write(bytes(pdf.output()))
\ No newline at end of file
@@ -0,0 +1,300 @@
+"""
+Span-style timing instrumentation for generation batches.
+
+A Tracer collects the spans of one batch. Stages open spans with
+`tracer.span(...)`; code deeper in the pipeline (scraper, renderer) calls
+the module-level `span(...)`, which nests under the span active in the
+current thread and is a no-op when nothing is being traced.
+
+Spans can be exported as JSONL, either in a flat native format or using
+the OpenTelemetry OTLP/JSON field names, and summarised per stage.
+"""
+
+import json
+import os
+import threading
+import time
+from contextlib import contextmanager, nullcontext
+from contextvars import ContextVar
+from pathlib import Path
+from typing import BinaryIO, Dict, Iterator, List, Optional, TextIO, Union
+
+# Span active in the current thread, parent of spans opened by `span()`
+_current_span: ContextVar[Optional["Span"]] = ContextVar("current_span", default=None)
+
+
+def _new_id(n_bytes: int) -> str:
+    """Random hex identifier (16 bytes for traces, 8 for spans, as in OpenTelemetry)."""
+    return os.urandom(n_bytes).hex()
+
+
+def percentile(values: List[float], q: float) -> float:
+    """
+    Percentile with linear interpolation between closest ranks.
+
+    Args:
+        values: Sample values
+        q: Percentile between 0 and 100
+
+    Returns:
+        float: The percentile, 0.0 for an empty sample
+    """
+    if not values:
+        return 0.0
+    ordered = sorted(values)
+    rank = (len(ordered) - 1) * q / 100
+    low = int(rank)
+    high = min(low + 1, len(ordered) - 1)
+    return ordered[low] + (ordered[high] - ordered[low]) * (rank - low)
+
+
+class Span:
+    """
+    One timed stage of a batch.
+    """
+
+    __slots__ = ("tracer", "name", "span_id", "parent_id", "job_index", "attributes",
+                 "start_time", "duration", "error", "_start")
+
+    def __init__(self, tracer: "Tracer", name: str, parent: Optional["Span"] = None,
+                 job_index: Optional[int] = None, attributes: Optional[dict] = None):
+        self.tracer = tracer
+        self.name = name
+        self.span_id = _new_id(8)
+        self.parent_id = parent.span_id if parent else None
+        # Child spans belong to the job of their parent
+        self.job_index = job_index if job_index is not None or parent is None else parent.job_index
+        self.attributes = dict(attributes or {})
+        self.start_time = time.time()
+        self.duration = None
+        self.error = None
+        self._start = time.perf_counter()
+
+    def set(self, **attributes) -> None:
+        """Attach attributes to the span (sizes, model, language...)."""
+        self.attributes.update(attributes)
+
+    def end(self) -> None:
+        """Record the span duration."""
+        if self.duration is None:
+            self.duration = time.perf_counter() - self._start
+
+    def to_dict(self) -> dict:
+        """Flat native record."""
+        return {
+            "trace_id": self.tracer.trace_id,
+            "span_id": self.span_id,
+            "parent_id": self.parent_id,
+            "name": self.name,
+            "job_index": self.job_index,
+            "start_time": self.start_time,
+            "duration": self.duration,
+            "error": self.error,
+            "attributes": self.attributes,
+        }
+
+    def to_otel(self) -> dict:
+        """Span using the OTLP/JSON field names (ids in hex, times in nanoseconds)."""
+        start_ns = int(self.start_time * 1e9)
+        attributes = dict(self.attributes)
+        if self.job_index is not None:
+            attributes["job.index"] = self.job_index
+        record = {
+            "traceId": self.tracer.trace_id,
+            "spanId": self.span_id,
+            "name": self.name,
+            "kind": 1,  # SPAN_KIND_INTERNAL
+            "startTimeUnixNano": str(start_ns),
+            "endTimeUnixNano": str(start_ns + int((self.duration or 0.0) * 1e9)),
+            "attributes": [{"key": key, "value": _otel_value(value)} for key, value in attributes.items()],
+            # STATUS_CODE_ERROR / STATUS_CODE_OK
+            "status": {"code": 2, "message": self.error} if self.error else {"code": 1},
+        }
+        if self.parent_id:
+            record["parentSpanId"] = self.parent_id
+        return record
+
+
+class _NoopSpan:
+    """Stand-in yielded by `span()` outside a traced stage."""
+
+    def set(self, **attributes) -> None:
+        pass
+
+
+_NOOP_SPAN = _NoopSpan()
+
+
+def _otel_value(value) -> dict:
+    """Wrap a Python value in an OTLP AnyValue."""
+    if isinstance(value, bool):
+        return {"boolValue": value}
+    if isinstance(value, int):
+        return {"intValue": str(value)}
+    if isinstance(value, float):
+        return {"doubleValue": value}
+    return {"stringValue": str(value)}
+
+
+class Tracer:
+    """
+    Thread-safe collector of the spans of one batch (one trace).
+    """
+
+    def __init__(self, trace_id: str = None, service_name: str = "cover-letter-generator",
+                 max_spans: int = 100_000):
+        """
+        Initialize the tracer.
+
+        Args:
+            trace_id (str, optional): Identifier shared by all spans. Random if omitted.
+            service_name (str, optional): Service name used in OpenTelemetry exports.
+            max_spans (int, optional): Spans kept in memory; later ones are dropped.
+        """
+        self.trace_id = trace_id or _new_id(16)
+        self.service_name = service_name
+        self.max_spans = max_spans
+        self._spans: List[Span] = []
+        self._lock = threading.Lock()
+
+    @contextmanager
+    def span(self, name: str, job_index: int = None, parent: Optional[Span] = None,
+             **attributes) -> Iterator[Span]:
+        """
+        Time the enclosed block as a span.
+
+        Args:
+            name (str): Stage name, e.g. "scrape.load" or "llm.invoke".
+            job_index (int, optional): Job the span belongs to (inherited from the parent if omitted).
+            parent (Span, optional): Explicit parent, e.g. the batch span from a worker thread.
+                Defaults to the span active in the current thread.
+            **attributes: Attributes attached to the span.
+
+        Yields:
+            Span: The open span, to attach more attributes.
+        """
+        if parent is None:
+            current = _current_span.get()
+            parent = current if current is not None and current.tracer is self else None
+        span = self.start_span(name, job_index=job_index, parent=parent, **attributes)
+        token = _current_span.set(span)
+        try:
+            yield span
+        except BaseException as e:
+            span.error = f"{type(e).__name__}: {e}"
+            raise
+        finally:
+            _current_span.reset(token)
+            self.finish(span)
+
+    def start_span(self, name: str, job_index: int = None, parent: Optional[Span] = None,
+                   **attributes) -> Span:
+        """
+        Open a span without making it current, for stages that do not fit a `with`
+        block (e.g. a whole batch driven by a generator function). Close it with `finish`.
+        """
+        return Span(self, name, parent, job_index, attributes)
+
+    def finish(self, span: Span) -> None:
+        """Close a span and record it."""
+        span.end()
+        with self._lock:
+            if len(self._spans) < self.max_spans:
+                self._spans.append(span)
+
+    def spans(self) -> List[Span]:
+        """Finished spans, in completion order."""
+        with self._lock:
+            return list(self._spans)
+
+    def summary(self) -> Dict[str, dict]:
+        """
+        Duration statistics per stage.
+
+        Returns:
+            dict: stage name -> count, p50, p95, max and total duration in seconds.
+        """
+        durations: Dict[str, List[float]] = {}
+        for span in self.spans():
+            durations.setdefault(span.name, []).append(span.duration)
+        return {
+            name: {
+                "count": len(values),
+                "p50": percentile(values, 50),
+                "p95": percentile(values, 95),
+                "max": max(values),
+                "total": sum(values),
+            }
+            for name, values in durations.items()
+        }
+
+    def format_summary(self) -> str:
+        """Summary as a plain-text table, slowest stages (by total time) first."""
+        rows = sorted(self.summary().items(), key=lambda item: item[1]["total"], reverse=True)
+        lines = [f"{'stage':<20} {'count':>6} {'p50 (s)':>9} {'p95 (s)':>9} {'max (s)':>9}"]
+        for name, stats in rows:
+            lines.append(f"{name:<20} {stats['count']:>6} {stats['p50']:>9.3f} "
+                         f"{stats['p95']:>9.3f} {stats['max']:>9.3f}")
+        return "\n".join(lines)
+
+    def export_jsonl(self, target: Union[str, Path, TextIO, BinaryIO], otel: bool = False) -> int:
+        """
+        Write one JSON line per span.
+
+        Args:
+            target: File path (appended to) or open stream.
+            otel (bool, optional): Use the OTLP/JSON span format instead of the native one.
+
+        Returns:
+            int: Number of spans written.
+        """
+        spans = self.spans()
+        lines = "".join(
+            json.dumps(span.to_otel() if otel else span.to_dict(), ensure_ascii=False) + "\n"
+            for span in spans
+        )
+        if isinstance(target, (str, Path)):
+            Path(target).parent.mkdir(parents=True, exist_ok=True)
+            with open(target, "a", encoding="utf-8") as f:
+                f.write(lines)
+        elif hasattr(target, "encoding"):
+            target.write(lines)
+        else:
+            target.write(lines.encode("utf-8"))
+        return len(spans)
+
+    def to_otlp(self) -> dict:
+        """
+        All spans as an OTLP/JSON ExportTraceServiceRequest, ready to POST to a collector.
+
+        Returns:
+            dict: The request body.
+        """
+        return {
+            "resourceSpans": [{
+                "resource": {"attributes": [
+                    {"key": "service.name", "value": {"stringValue": self.service_name}}
+                ]},
+                "scopeSpans": [{
+                    "scope": {"name": __name__},
+                    "spans": [span.to_otel() for span in self.spans()],
+                }],
+            }]
+        }
+
+
+def span(name: str, **attributes):
+    """
+    Time the enclosed block as a child of the span active in this thread.
+
+    A no-op (yielding a stand-in span) when no stage is being traced, so
+    library code can be instrumented unconditionally.
+
+    Args:
+        name (str): Stage name.
+        **attributes: Attributes attached to the span.
+    """
+    parent = _current_span.get()
+    if parent is None:
+        return nullcontext(_NOOP_SPAN)
+    return parent.tracer.span(name, **attributes)
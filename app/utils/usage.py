@@ -0,0 +1,123 @@
+"""
+Token usage and cost accounting for LLM calls.
+"""
+
+import threading
+from typing import Dict, List, Optional
+from schema.usage_schema import TokenUsage
+from config import MODEL_PRICING
+
+
+def estimate_cost(model_name: str, input_tokens: int, output_tokens: int) -> Optional[float]:
+    """
+    Estimate the cost of a call from the per-million-token prices in MODEL_PRICING.
+
+    Args:
+        model_name: Name of the model
+        input_tokens: Prompt tokens
+        output_tokens: Completion tokens
+
+    Returns:
+        Optional[float]: Cost in USD, None when the model has no known price
+    """
+    prices = MODEL_PRICING.get(model_name)
+    if prices is None:
+        return None
+    input_price, output_price = prices
+    return (input_tokens * input_price + output_tokens * output_price) / 1_000_000
+
+
+def extract_usage(message, model_name: str) -> TokenUsage:
+    """
+    Read token usage from an LLM response message.
+
+    Uses the standard `usage_metadata` of LangChain messages, falling back to
+    the provider's `token_usage` response metadata.
+
+    Args:
+        message: AIMessage returned by the model (the `raw` output of structured calls)
+        model_name: Name of the model, used to price the call
+
+    Returns:
+        TokenUsage: Usage of the call, zeros when the response carries none
+    """
+    usage = getattr(message, "usage_metadata", None) or {}
+    input_tokens = usage.get("input_tokens")
+    output_tokens = usage.get("output_tokens")
+    if input_tokens is None:
+        token_usage = (getattr(message, "response_metadata", None) or {}).get("token_usage") or {}
+        input_tokens = token_usage.get("prompt_tokens", 0)
+        output_tokens = token_usage.get("completion_tokens", 0)
+    input_tokens, output_tokens = input_tokens or 0, output_tokens or 0
+    return TokenUsage(
+        input_tokens=input_tokens,
+        output_tokens=output_tokens,
+        total_tokens=usage.get("total_tokens") or input_tokens + output_tokens,
+        cost=estimate_cost(model_name, input_tokens, output_tokens)
+    )
+
+
+def add_usage(total: TokenUsage, usage: TokenUsage) -> TokenUsage:
+    """Sum two usages (the cost stays unknown if either is unknown)."""
+    return TokenUsage(
+        input_tokens=total.input_tokens + usage.input_tokens,
+        output_tokens=total.output_tokens + usage.output_tokens,
+        total_tokens=total.total_tokens + usage.total_tokens,
+        cost=None if total.cost is None or usage.cost is None else total.cost + usage.cost,
+        saved_tokens=total.saved_tokens + usage.saved_tokens
+    )
+
+
+class UsageTracker:
+    """
+    Thread-safe aggregation of token usage per job, per model and per batch.
+    """
+
+    def __init__(self):
+        self._jobs: List[dict] = []
+        self._models: Dict[str, TokenUsage] = {}
+        self._batch = TokenUsage(cost=0.0)
+        self._lock = threading.Lock()
+
+    def record(self, model_name: str, usage: TokenUsage, job_index: int = None,
+               url: str = None, title: str = None) -> None:
+        """
+        Add the usage of one letter.
+
+        Args:
+            model_name (str): Model that produced the letter.
+            usage (TokenUsage): Usage of the call.
+            job_index (int, optional): Position of the job in the batch.
+            url (str, optional): Job posting URL.
+            title (str, optional): Title of the generated letter.
+        """
+        with self._lock:
+            self._jobs.append({
+                "job_index": job_index,
+                "url": url,
+                "title": title,
+                "model": model_name,
+                **usage.model_dump(),
+            })
+            self._models[model_name] = add_usage(self._models.get(model_name, TokenUsage(cost=0.0)), usage)
+            self._batch = add_usage(self._batch, usage)
+
+    @property
+    def total(self) -> TokenUsage:
+        """Usage of the whole batch."""
+        with self._lock:
+            return self._batch
+
+    def summary(self) -> dict:
+        """
+        Usage aggregates.
+
+        Returns:
+            dict: "batch" totals, totals per model ("models") and one record per letter ("jobs").
+        """
+        with self._lock:
+            return {
+                "batch": self._batch.model_dump(),
+                "models": {name: usage.model_dump() for name, usage in self._models.items()},
+                "jobs": list(self._jobs),
+            }
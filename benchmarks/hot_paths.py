@@ -0,0 +1,294 @@
+#!/usr/bin/env python3
+"""
+Offline micro-benchmarks for the hot paths of the generation pipeline.
+
+Covers TextProcessor truncation, LanguageDetector, every available
+SimplePDFGenerator backend, PdfManager.run (cold extraction and cache hit)
+and Scraper against a local HTTP server, on synthetic inputs from 1KB to
+1MB. No network access is needed; cases whose optional dependency is not
+installed are skipped.
+
+Results can be saved as JSON and compared with a previous run, so
+regressions and scaling behaviour can be tracked across versions.
+
+Usage:
+    python benchmarks/hot_paths.py --json results.json
+    python benchmarks/hot_paths.py --groups text,language --compare results.json
+"""
+
+import argparse
+import importlib.util
+import json
+import os
+import platform
+import statistics
+import sys
+import tempfile
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from pathlib import Path
+from typing import Callable, Iterator, List, Tuple
+
+# Add app directory to path
+sys.path.append(os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "app"))
+
+from utils.text_processor import TextProcessor
+from utils.language_detector import LanguageDetector
+from utils import pdf_extractor, simple_pdf_generator
+from utils.simple_pdf_generator import SimplePDFGenerator
+
+SIZES = {"1KB": 1_000, "10KB": 10_000, "100KB": 100_000, "1MB": 1_000_000}
+
+GROUPS = ["text", "language", "render", "pdf", "scraper"]
+
+CV_SECTIONS = [
+    "Jane Doe\njane.doe@example.com | +32 470 00 00 00 | Brussels\n",
+    "PROFESSIONAL SUMMARY\nData analyst with 6 years of experience building reporting pipelines.\n",
+    "EXPERIENCE\nSenior Data Analyst, Acme Corp (2020-2024)\n- Built dashboards used by 300 people\n"
+    "- Reduced report turnaround time by 40%\n",
+    "EDUCATION\nMSc Statistics, University of Brussels\n",
+    "SKILLS\nPython, SQL, Pandas, Airflow, Tableau, Power BI, dbt, statistics\n",
+    "LANGUAGES\nEnglish, French, Dutch\n",
+]
+
+JOB_PARAGRAPHS = {
+    "english": "We are looking for a data analyst to join our team. The role requires experience "
+               "with SQL and Python, and the candidate will work with the product team on reporting. ",
+    "french": "Nous recherchons un analyste de données pour rejoindre notre équipe. Le poste exige une "
+              "expérience avec SQL et Python, et le candidat travaillera avec l'équipe produit. ",
+    "dutch": "Wij zoeken een data-analist om ons team te versterken. De functie vereist ervaring met "
+             "SQL en Python, en de kandidaat werkt samen met het productteam aan rapportage. ",
+}
+
+
+def repeat_to(text: str, size: int) -> str:
+    """Repeat `text` until it is `size` characters long."""
+    return (text * (size // len(text) + 1))[:size]
+
+
+def synthetic_cv(size: int) -> str:
+    """CV-shaped text (headed sections) of about `size` characters."""
+    return repeat_to("\n".join(CV_SECTIONS), size)
+
+
+def synthetic_job(size: int, language: str = "english") -> str:
+    """Job posting text in `language` of about `size` characters."""
+    return repeat_to(JOB_PARAGRAPHS[language], size)
+
+
+def make_pdf(text: str, chars_per_page: int = 3000) -> bytes:
+    """
+    Build a minimal text-only PDF (Helvetica, one text line per 90 characters).
+
+    Written by hand so the PDF benchmarks do not depend on a PDF writer.
+    """
+    pages = [text[i:i + chars_per_page] for i in range(0, len(text), chars_per_page)] or [""]
+    objects = [b"<< /Type /Catalog /Pages 2 0 R >>", None,
+               b"<< /Type /Font /Subtype /Type1 /BaseFont /Helvetica >>"]
+    page_ids = []
+    for page_text in pages:
+        lines = [page_text[i:i + 90] for i in range(0, len(page_text), 90)]
+        body = "BT /F1 9 Tf 40 800 Td 11 TL " + " ".join(
+            "({}) '".format(line.replace("\\", "\\\\").replace("(", "\\(").replace(")", "\\)"))
+            for line in lines
+        ) + " ET"
+        stream = body.encode("latin-1", "replace")
+        objects.append(b"<< /Length %d >>\nstream\n" % len(stream) + stream + b"\nendstream")
+        objects.append(b"<< /Type /Page /Parent 2 0 R /MediaBox [0 0 595 842] "
+                       b"/Resources << /Font << /F1 3 0 R >> >> /Contents %d 0 R >>" % len(objects))
+        page_ids.append(len(objects))
+    kids = " ".join(f"{i} 0 R" for i in page_ids).encode()
+    objects[1] = b"<< /Type /Pages /Kids [" + kids + b"] /Count %d >>" % len(page_ids)
+
+    out = bytearray(b"%PDF-1.4\n")
+    offsets = []
+    for number, obj in enumerate(objects, 1):
+        offsets.append(len(out))
+        out += b"%d 0 obj\n" % number + obj + b"\nendobj\n"
+    xref = len(out)
+    out += b"xref\n0 %d\n0000000000 65535 f \n" % (len(objects) + 1)
+    out += b"".join(b"%010d 00000 n \n" % offset for offset in offsets)
+    out += b"trailer\n<< /Size %d /Root 1 0 R >>\nstartxref\n%d\n%%EOF\n" % (len(objects) + 1, xref)
+    return bytes(out)
+
+
+def measure(fn: Callable, min_time: float, max_rounds: int = 1000) -> dict:
+    """
+    Call `fn` repeatedly for at least `min_time` seconds (and at least 3 times).
+
+    Returns:
+        dict: rounds, best and median duration in seconds
+    """
+    fn()  # warm-up
+    durations = []
+    deadline = time.perf_counter() + min_time
+    while len(durations) < 3 or (time.perf_counter() < deadline and len(durations) < max_rounds):
+        start = time.perf_counter()
+        fn()
+        durations.append(time.perf_counter() - start)
+    return {"rounds": len(durations), "best": min(durations), "median": statistics.median(durations)}
+
+
+Case = Tuple[str, str, int, Callable]
+
+
+def text_cases(sizes: dict) -> Iterator[Case]:
+    """TextProcessor truncation on CV and job texts."""
+    for label, size in sizes.items():
+        cv, job = synthetic_cv(size), synthetic_job(size)
+        yield "TextProcessor.smart_truncate_cv", label, size, lambda: TextProcessor.smart_truncate_cv(cv, 3000)
+        yield "TextProcessor.smart_truncate_job", label, size, lambda: TextProcessor.smart_truncate_job(job, 2000)
+        yield "TextProcessor.prepare_for_llm", label, 2 * size, lambda: TextProcessor.prepare_for_llm(cv, job, 5000)
+
+
+def language_cases(sizes: dict) -> Iterator[Case]:
+    """LanguageDetector on job postings in each supported language."""
+    for label, size in sizes.items():
+        for language in JOB_PARAGRAPHS:
+            job = synthetic_job(size, language)
+            yield f"LanguageDetector.detect_language[{language}]", label, size, \
+                lambda: LanguageDetector.detect_language(job)
+
+
+def render_cases(sizes: dict) -> Iterator[Case]:
+    """Every available SimplePDFGenerator backend, rendering to memory."""
+    backends = ["html"]
+    if simple_pdf_generator.HAS_REPORTLAB:
+        backends.append("reportlab")
+    if simple_pdf_generator.HAS_FPDF:
+        backends.append("fpdf")
+    for backend in backends:
+        generator = SimplePDFGenerator(backend)
+        for label, size in sizes.items():
+            content = synthetic_job(size)
+            yield f"SimplePDFGenerator[{backend}]", label, size, \
+                lambda: generator.render_bytes("Application for Data Analyst", content)
+
+
+def pdf_cases(sizes: dict, workdir: Path) -> Iterator[Case]:
+    """PdfManager.run on generated CV PDFs, without cache and on a cache hit."""
+    if importlib.util.find_spec("pdfplumber") is None and not pdf_extractor.HAS_PDFIUM:
+        print("⏭️  pdf: pdfplumber/pypdfium2 not installed, skipped")
+        return
+    from tools.file_manager import PdfManager
+
+    for label, size in sizes.items():
+        path = workdir / f"cv_{label}.pdf"
+        path.write_bytes(make_pdf(synthetic_cv(size)))
+        cold = PdfManager(path, cache_dir=workdir / "cache", use_cache=False)
+        cached = PdfManager(path, cache_dir=workdir / "cache")
+        cached.run()
+        yield "PdfManager.run[no cache]", label, size, cold.run
+        yield "PdfManager.run[cache hit]", label, size, cached.run
+
+
+class _JobBoardHandler(BaseHTTPRequestHandler):
+    """Serves synthetic job postings at /job/<characters>."""
+
+    def _page(self) -> bytes:
+        size = int(self.path.rsplit("/", 1)[-1])
+        return (f"<html><head><title>Data Analyst</title></head><body><h1>Data Analyst</h1>"
+                f"<p>{synthetic_job(size)}</p></body></html>").encode("utf-8")
+
+    def do_HEAD(self):
+        self.send_response(200)
+        self.send_header("Content-Type", "text/html; charset=utf-8")
+        self.send_header("Content-Length", str(len(self._page())))
+        self.end_headers()
+
+    def do_GET(self):
+        page = self._page()
+        self.send_response(200)
+        self.send_header("Content-Type", "text/html; charset=utf-8")
+        self.send_header("Content-Length", str(len(page)))
+        self.end_headers()
+        self.wfile.write(page)
+
+    def log_message(self, format, *args):
+        pass
+
+
+def scraper_cases(sizes: dict, base_url: str) -> Iterator[Case]:
+    """Scraper against the local job board server."""
+    from tools.scraper import Scraper
+
+    scraper = Scraper()
+    for label, size in sizes.items():
+        url = f"{base_url}/job/{size}"
+        yield "Scraper.is_accessible_url", label, size, lambda: scraper.is_accessible_url(url)
+        if importlib.util.find_spec("langchain_community") and importlib.util.find_spec("bs4"):
+            yield "Scraper.run", label, size, lambda: scraper.run(url)
+    if not (importlib.util.find_spec("langchain_community") and importlib.util.find_spec("bs4")):
+        print("⏭️  scraper: langchain_community/bs4 not installed, Scraper.run skipped")
+
+
+def compare(results: List[dict], baseline_path: str, threshold: float) -> int:
+    """Print the slowdown against a baseline run and return the number of regressions."""
+    baseline = {(r["case"], r["size"]): r for r in json.loads(Path(baseline_path).read_text())["results"]}
+    regressions = 0
+    print(f"\n{'case':<48} {'size':>6} {'baseline ms':>12} {'now ms':>10} {'ratio':>7}")
+    for result in results:
+        before = baseline.get((result["case"], result["size"]))
+        if before is None:
+            continue
+        ratio = result["best"] / before["best"] if before["best"] else float("inf")
+        flag = "  ⚠️ regression" if ratio > threshold else ""
+        regressions += ratio > threshold
+        print(f"{result['case']:<48} {result['size']:>6} {before['best'] * 1000:>12.3f} "
+              f"{result['best'] * 1000:>10.3f} {ratio:>6.2f}x{flag}")
+    return regressions
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--groups", default=",".join(GROUPS), help=f"Comma-separated groups among {GROUPS}")
+    parser.add_argument("--sizes", default=",".join(SIZES), help=f"Comma-separated input sizes among {list(SIZES)}")
+    parser.add_argument("--min-time", type=float, default=0.2, help="Seconds spent measuring each case")
+    parser.add_argument("--json", help="Write the results to this JSON file")
+    parser.add_argument("--compare", help="Compare with a JSON file written by a previous run")
+    parser.add_argument("--threshold", type=float, default=1.25,
+                        help="Slowdown ratio reported as a regression (exit code 1)")
+    args = parser.parse_args()
+
+    groups = [group for group in args.groups.split(",") if group]
+    sizes = {label: SIZES[label] for label in args.sizes.split(",") if label}
+
+    server = ThreadingHTTPServer(("127.0.0.1", 0), _JobBoardHandler)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    base_url = f"http://127.0.0.1:{server.server_address[1]}"
+
+    results = []
+    print(f"{'case':<48} {'size':>6} {'rounds':>7} {'best ms':>10} {'median ms':>10} {'MB/s':>9}")
+    with tempfile.TemporaryDirectory() as tmp:
+        cases = {
+            "text": lambda: text_cases(sizes),
+            "language": lambda: language_cases(sizes),
+            "render": lambda: render_cases(sizes),
+            "pdf": lambda: pdf_cases(sizes, Path(tmp)),
+            "scraper": lambda: scraper_cases(sizes, base_url),
+        }
+        for group in groups:
+            for name, label, nbytes, fn in cases[group]():
+                stats = measure(fn, args.min_time)
+                throughput = nbytes / stats["best"] / 1e6 if stats["best"] else float("inf")
+                results.append({"group": group, "case": name, "size": label, "bytes": nbytes,
+                                "throughput_mb_s": throughput, **stats})
+                print(f"{name:<48} {label:>6} {stats['rounds']:>7} {stats['best'] * 1000:>10.3f} "
+                      f"{stats['median'] * 1000:>10.3f} {throughput:>9.1f}")
+    server.shutdown()
+
+    if args.json:
+        Path(args.json).write_text(json.dumps({
+            "python": platform.python_version(),
+            "platform": platform.platform(),
+            "created_at": time.strftime("%Y-%m-%dT%H:%M:%S"),
+            "results": results,
+        }, indent=2))
+
+    if args.compare and compare(results, args.compare, args.threshold):
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
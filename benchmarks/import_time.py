@@ -0,0 +1,94 @@
+#!/usr/bin/env python3
+"""
+Cold-start import check for the application modules.
+
+Imports each entry module in a fresh interpreter with `-X importtime` and
+fails when a heavy dependency (LangChain loaders, the Groq client, PDF and
+rendering libraries) is pulled in at import time, or when the cumulative
+import time of the module exceeds the budget. Heavy dependencies must only
+be loaded on first use.
+
+Usage:
+    python benchmarks/import_time.py --budget-ms 400
+"""
+
+import argparse
+import os
+import re
+import subprocess
+import sys
+
+APP_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "app")
+
+# Modules checked for a fast import
+ENTRY_MODULES = [
+    "config",
+    "generator.generator",
+    "generator.jobs",
+    "tools.file_manager",
+    "utils.simple_pdf_generator",
+]
+
+# Dependencies that must not be imported before they are needed
+HEAVY_MODULES = {
+    "langchain_community",
+    "langchain_groq",
+    "groq",
+    "pdfplumber",
+    "pypdfium2",
+    "reportlab",
+    "fpdf",
+    "streamlit",
+}
+
+_IMPORTTIME_LINE = re.compile(r"import time:\s+(\d+)\s+\|\s+(\d+)\s+\|(\s*)(\S+)")
+
+
+def profile_import(module: str) -> dict:
+    """
+    Import `module` in a fresh interpreter and parse its import-time report.
+
+    Returns:
+        dict: cumulative microseconds per imported module name
+    """
+    env = dict(os.environ, PYTHONPATH=os.pathsep.join(filter(None, [APP_DIR, os.environ.get("PYTHONPATH")])))
+    result = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", f"import {module}"],
+        capture_output=True, text=True, env=env, cwd=APP_DIR
+    )
+    if result.returncode != 0:
+        raise RuntimeError(f"import {module} failed:\n{result.stderr[-2000:]}")
+
+    timings = {}
+    for line in result.stderr.splitlines():
+        match = _IMPORTTIME_LINE.match(line)
+        if match:
+            timings[match.group(4)] = int(match.group(2))
+    return timings
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--budget-ms", type=float, default=400.0,
+                        help="Maximum cumulative import time per entry module")
+    parser.add_argument("modules", nargs="*", default=ENTRY_MODULES, help="Modules to check")
+    args = parser.parse_args()
+
+    failures = 0
+    print(f"{'module':<30} {'import ms':>10}  heavy dependencies")
+    for module in args.modules:
+        timings = profile_import(module)
+        elapsed_ms = timings.get(module, 0) / 1000
+        heavy = sorted({name.split(".")[0] for name in timings} & HEAVY_MODULES)
+        over_budget = elapsed_ms > args.budget_ms
+        failures += bool(heavy) or over_budget
+        flag = " (over budget)" if over_budget else ""
+        print(f"{module:<30} {elapsed_ms:>10.1f}  {', '.join(heavy) or '-'}{flag}")
+
+    if failures:
+        print(f"\n{failures} module(s) failed the cold-start check")
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
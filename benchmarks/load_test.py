@@ -0,0 +1,173 @@
+#!/usr/bin/env python3
+"""
+End-to-end load test of the generation pipeline against local stubs.
+
+Runs batches of N URLs through the real Generator (Scraper, LanguageDetector,
+TextProcessor, ChatGroq structured output, rendering) with the Groq API and
+the job boards replaced by the local stubs of benchmarks/stubs.py, and
+reports throughput, latency percentiles per stage and error rates.
+
+Usage:
+    python benchmarks/load_test.py --urls 50 --batches 4 --workers 4 --latency lognormal:1.0,0.4 --error-rate 0.05
+    python benchmarks/load_test.py --scheduler --batches 4   # share one FairScheduler like the hosted app
+"""
+
+import argparse
+import contextlib
+import io
+import json
+import os
+import sys
+import tempfile
+import threading
+import time
+from collections import Counter
+from pathlib import Path
+
+BENCHMARKS_DIR = os.path.dirname(os.path.abspath(__file__))
+sys.path.append(os.path.join(BENCHMARKS_DIR, "..", "app"))
+
+from stubs import start_job_board, start_llm_stub
+
+CV = (
+    "Jane Doe\njane.doe@example.com\n\nPROFESSIONAL SUMMARY\nData analyst with 6 years of experience.\n\n"
+    "EXPERIENCE\nSenior Data Analyst, Acme Corp (2020-2024)\n- Built dashboards used by 300 people\n\n"
+    "SKILLS\nPython, SQL, Pandas, Airflow, Tableau\n"
+)
+
+STAGES = ["job", "scrape", "llm.invoke", "store.save"]
+
+
+def run_batch(batch: int, urls: list, args, destination: str, scheduler, results: list) -> None:
+    """Run one batch through a Generator and collect its outcomes and spans."""
+    from generator.generator import Generator
+
+    try:
+        generator = Generator(
+            urls,
+            cv_content=CV,
+            destination_path=destination,
+            model_name=args.model,
+            save_files=args.save,
+            max_workers=args.workers,
+            executor=scheduler.executor_for(f"batch-{batch}") if scheduler else None
+        )
+        errors = Counter()
+        succeeded = 0
+        for _, outcome in generator.iter_run():
+            if isinstance(outcome, Exception):
+                errors[type(outcome).__name__] += 1
+            else:
+                succeeded += 1
+    except Exception as e:
+        # A batch that cannot start counts every URL as failed
+        results.append({"succeeded": 0, "errors": Counter({type(e).__name__: len(urls)}), "spans": [], "tokens": 0})
+        print(f"❌ Batch {batch} failed: {e}", file=sys.stderr)
+        return
+    results.append({
+        "succeeded": succeeded,
+        "errors": errors,
+        "spans": generator.tracer.spans(),
+        "tokens": generator.usage.total.total_tokens,
+    })
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--urls", type=int, default=20, help="URLs per batch")
+    parser.add_argument("--batches", type=int, default=1, help="Batches run concurrently")
+    parser.add_argument("--workers", type=int, default=4, help="Jobs in flight per batch")
+    parser.add_argument("--scheduler", action="store_true", help="Run every batch through one shared FairScheduler")
+    parser.add_argument("--save", action="store_true", help="Render and write letters to a temporary folder")
+    parser.add_argument("--model", default="llama-3.3-70b-versatile")
+    parser.add_argument("--latency", default="lognormal:1.0,0.4", help="LLM stub latency distribution")
+    parser.add_argument("--error-rate", type=float, default=0.0, help="Share of LLM requests answered with 429")
+    parser.add_argument("--rpm", type=int, default=0, help="LLM stub requests per minute before 429")
+    parser.add_argument("--llm-url", help="Use a running LLM stub instead of starting one")
+    parser.add_argument("--board-url", help="Use a running job-board stub instead of starting one")
+    parser.add_argument("--json", help="Write the report to this JSON file")
+    parser.add_argument("--verbose", action="store_true", help="Show the pipeline output")
+    args = parser.parse_args()
+
+    llm = None
+    if not args.llm_url:
+        llm = start_llm_stub(latency=args.latency, error_rate=args.error_rate, requests_per_minute=args.rpm)
+        args.llm_url = f"http://127.0.0.1:{llm.server_address[1]}"
+    if not args.board_url:
+        board = start_job_board()
+        args.board_url = f"http://127.0.0.1:{board.server_address[1]}"
+
+    # Configuration is read when the app modules are imported
+    os.environ["GROQ_BASE_URL"] = args.llm_url
+    os.environ.setdefault("GROQ_API_KEY", "stub-key-for-load-tests")
+    os.environ["WARM_UP_MODELS"] = "false"
+    from generator.scheduler import FairScheduler
+    from utils.tracing import percentile
+
+    scheduler = FairScheduler(max_concurrency=args.workers * args.batches, per_session=args.workers) \
+        if args.scheduler else None
+
+    results = []
+    output = contextlib.nullcontext() if args.verbose else contextlib.redirect_stdout(io.StringIO())
+    with tempfile.TemporaryDirectory() as destination, output:
+        start = time.perf_counter()
+        threads = [
+            threading.Thread(target=run_batch, args=(
+                batch, [f"{args.board_url}/job/{batch}-{i}" for i in range(args.urls)],
+                args, destination, scheduler, results
+            ))
+            for batch in range(args.batches)
+        ]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        elapsed = time.perf_counter() - start
+
+    total = args.urls * args.batches
+    succeeded = sum(result["succeeded"] for result in results)
+    errors = sum((result["errors"] for result in results), Counter())
+    durations = {stage: [] for stage in STAGES}
+    for result in results:
+        for span in result["spans"]:
+            if span.name in durations and not span.error:
+                durations[span.name].append(span.duration)
+
+    report = {
+        "urls": total,
+        "succeeded": succeeded,
+        "failed": total - succeeded,
+        "error_rate": (total - succeeded) / total if total else 0.0,
+        "errors": dict(errors),
+        "elapsed": elapsed,
+        "throughput": succeeded / elapsed if elapsed else 0.0,
+        "tokens": sum(result["tokens"] for result in results),
+        "latency": {
+            stage: {
+                "count": len(values),
+                "p50": percentile(values, 50),
+                "p95": percentile(values, 95),
+                "p99": percentile(values, 99),
+                "max": max(values, default=0.0),
+            }
+            for stage, values in durations.items()
+        },
+        "llm_stub": llm.state.stats() if llm else None,
+    }
+
+    print(f"{succeeded}/{total} letters in {elapsed:.1f}s → {report['throughput']:.2f} letters/s, "
+          f"error rate {report['error_rate']:.1%} {dict(errors) or ''}")
+    if llm:
+        stats = report["llm_stub"]
+        print(f"LLM stub: {stats['requests']} requests, {stats['rate_limited']} answered 429")
+    print(f"\n{'stage':<12} {'count':>6} {'p50 (s)':>9} {'p95 (s)':>9} {'p99 (s)':>9} {'max (s)':>9}")
+    for stage, stats in report["latency"].items():
+        print(f"{stage:<12} {stats['count']:>6} {stats['p50']:>9.3f} {stats['p95']:>9.3f} "
+              f"{stats['p99']:>9.3f} {stats['max']:>9.3f}")
+
+    if args.json:
+        Path(args.json).write_text(json.dumps(report, indent=2))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,199 @@
+#!/usr/bin/env python3
+"""
+Compare the letter-generation prompt variants on input tokens and output structure.
+
+Renders every variant of Prompt.generate_motivation for sample CV/job pairs
+(or your own) and reports the prompt tokens per request and the savings
+against the "full" prompt. With --generate, letters are generated with each
+variant (against the Groq API, or the local stub with --stub) and checked
+with LetterValidator; the reported input tokens are then the model's own
+counts.
+
+Exits with status 1 when a variant saves less than --min-savings or, with
+--generate, passes the structure checks less often than "full" by more than
+--max-quality-drop, so it can gate a PROMPT_VARIANT change.
+
+Usage:
+    python benchmarks/prompt_compare.py
+    python benchmarks/prompt_compare.py --generate --stub --repeat 3
+    python benchmarks/prompt_compare.py --cv cv.txt --jobs job1.txt job2.txt --generate --model llama-3.1-8b-instant
+"""
+
+import argparse
+import json
+import os
+import sys
+from pathlib import Path
+
+BENCHMARKS_DIR = os.path.dirname(os.path.abspath(__file__))
+sys.path.append(os.path.join(BENCHMARKS_DIR, "..", "app"))
+
+CV = (
+    "Jane Doe\njane.doe@example.com | +32 470 00 00 00 | Brussels\n\n"
+    "PROFESSIONAL SUMMARY\nData analyst with 6 years of experience building reporting pipelines.\n\n"
+    "EXPERIENCE\nSenior Data Analyst, Acme Corp (2020-2024)\n- Built dashboards used by 300 people\n"
+    "- Reduced report turnaround time by 40%\nData Analyst, Globex (2018-2020)\n- Automated weekly KPIs with Airflow\n\n"
+    "EDUCATION\nMSc Statistics, University of Brussels\n\n"
+    "SKILLS\nPython, SQL, Pandas, Airflow, Tableau, Power BI, dbt, statistics\n\n"
+    "LANGUAGES\nEnglish, French, Dutch, Spanish\n"
+)
+
+JOBS = {
+    "english": "We are looking for a data analyst to join our team in Brussels. The role requires experience "
+               "with SQL and Python, and the candidate will work with the product team on reporting and "
+               "dashboards. You will own our KPI pipelines and present results to stakeholders.",
+    "french": "Nous recherchons un analyste de données pour rejoindre notre équipe à Bruxelles. Le poste exige "
+              "une expérience avec SQL et Python, et le candidat travaillera avec l'équipe produit sur les "
+              "tableaux de bord. Vous serez responsable de nos indicateurs et de leur présentation.",
+    "dutch": "Wij zoeken een data-analist om ons team in Brussel te versterken. De functie vereist ervaring met "
+             "SQL en Python, en de kandidaat werkt samen met het productteam aan rapportage en dashboards. "
+             "Je bent verantwoordelijk voor onze KPI-pijplijnen.",
+    "spanish": "Buscamos un analista de datos para unirse a nuestro equipo en Bruselas. El puesto requiere "
+               "experiencia con SQL y Python, y el candidato trabajará con el equipo de producto en informes "
+               "y paneles. Serás responsable de nuestros indicadores clave.",
+}
+
+
+def load_cases(args) -> list:
+    """(cv, job, language) cases from the command line, or the built-in samples."""
+    from utils.language_detector import LanguageDetector
+    from utils.text_processor import TextProcessor
+
+    cv = CV
+    if args.cv:
+        if args.cv.lower().endswith(".pdf"):
+            from tools.file_manager import PdfManager
+            cv = PdfManager(args.cv).run()
+        else:
+            cv = Path(args.cv).read_text(encoding="utf-8")
+    jobs = [Path(path).read_text(encoding="utf-8") for path in args.jobs] if args.jobs else list(JOBS.values())
+
+    cases = []
+    for job in jobs:
+        language, _ = LanguageDetector.detect_language(job)
+        # Same truncation as the Generator
+        truncated_cv, truncated_job = TextProcessor.prepare_for_llm(cv, job, max_total_chars=5000)
+        cases.append((truncated_cv, truncated_job, language))
+    return cases
+
+
+def prompt_tokens(prompt, inputs: dict) -> dict:
+    """Estimated tokens of a rendered prompt, in total and in its static system message."""
+    from utils.text_processor import TextProcessor
+
+    messages = prompt.invoke(inputs).to_messages()
+    system = "".join(message.content for message in messages if message.type == "system")
+    return {
+        "total": TextProcessor.estimate_tokens("".join(message.content for message in messages)),
+        "system": TextProcessor.estimate_tokens(system),
+    }
+
+
+def cell(value, spec: str) -> str:
+    """Format a table cell, "-" when the value was not measured."""
+    return format(value, spec) if value is not None else "-"
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--cv", help="CV as a PDF or text file (defaults to a sample CV)")
+    parser.add_argument("--jobs", nargs="+", help="Job posting text files (defaults to samples in 4 languages)")
+    parser.add_argument("--variants", default="full,compact", help="Comma-separated prompt variants")
+    parser.add_argument("--generate", action="store_true", help="Generate letters and check their structure")
+    parser.add_argument("--stub", action="store_true", help="Generate against the local LLM stub")
+    parser.add_argument("--model", default="llama-3.3-70b-versatile")
+    parser.add_argument("--repeat", type=int, default=1, help="Letters generated per case and variant")
+    parser.add_argument("--min-savings", type=float, default=0.15,
+                        help="Minimum share of input tokens a variant must save against 'full'")
+    parser.add_argument("--max-quality-drop", type=float, default=0.0,
+                        help="Tolerated drop of the valid-letter rate against 'full'")
+    parser.add_argument("--json", help="Write the report to this JSON file")
+    args = parser.parse_args()
+
+    if args.stub:
+        from stubs import start_llm_stub
+        llm = start_llm_stub(latency="constant:0.05")
+        os.environ["GROQ_BASE_URL"] = f"http://127.0.0.1:{llm.server_address[1]}"
+        os.environ.setdefault("GROQ_API_KEY", "stub-key-for-load-tests")
+        os.environ["WARM_UP_MODELS"] = "false"
+
+    from utils.prompts import Prompt
+    from utils.letter_validator import LetterValidator
+
+    cases = load_cases(args)
+    variants = [variant.strip() for variant in args.variants.split(",")]
+    report = {}
+    for variant in variants:
+        prompt, version = Prompt.generate_motivation(variant)
+        counts = [prompt_tokens(prompt, Prompt.letter_inputs(cv, job, language)) for cv, job, language in cases]
+        report[variant] = {
+            "version": version,
+            "estimated_input_tokens": sum(count["total"] for count in counts) / len(counts),
+            "static_system_tokens": sum(count["system"] for count in counts) / len(counts),
+        }
+
+    if args.generate:
+        from generator.generator import Generator
+        from utils.usage import extract_usage
+
+        model = Generator.build_model(args.model)
+        for variant in variants:
+            prompt, _ = Prompt.generate_motivation(variant)
+            chain = prompt | model
+            letters, input_tokens, output_tokens = [], [], []
+            for cv, job, language in cases:
+                for _ in range(args.repeat):
+                    response = chain.invoke(Prompt.letter_inputs(cv, job, language))
+                    letter = response["parsed"] if isinstance(response, dict) else response
+                    if isinstance(response, dict):
+                        usage = extract_usage(response.get("raw"), args.model)
+                        input_tokens.append(usage.input_tokens)
+                        output_tokens.append(usage.output_tokens)
+                    if letter is not None:
+                        letters.append({"content": letter.content, "language": language,
+                                        "candidate_name": cv.strip().splitlines()[0]})
+            report[variant].update(
+                letters=len(letters),
+                input_tokens=sum(input_tokens) / len(input_tokens) if input_tokens else None,
+                output_tokens=sum(output_tokens) / len(output_tokens) if output_tokens else None,
+                checks=LetterValidator.report(letters),
+            )
+
+    # Savings and quality gate against the full prompt
+    failed = []
+    baseline = report.get("full")
+    for variant, stats in report.items():
+        if baseline is None or variant == "full":
+            continue
+        key = "input_tokens" if stats.get("input_tokens") else "estimated_input_tokens"
+        stats["savings"] = 1 - stats[key] / baseline[key] if baseline.get(key) else 0.0
+        if stats["savings"] < args.min_savings:
+            failed.append(f"{variant} saves {stats['savings']:.1%} input tokens (< {args.min_savings:.0%})")
+        if args.generate and baseline["checks"]:
+            drop = baseline["checks"]["valid"] - stats["checks"].get("valid", 0.0)
+            if drop > args.max_quality_drop:
+                failed.append(f"{variant} produces {drop:.1%} fewer valid letters than full")
+
+    print(f"{len(cases)} case(s)\n")
+    print(f"{'variant':<10} {'version':<10} {'est. input':>11} {'static sys':>11} {'input':>8} {'output':>8} "
+          f"{'savings':>8} {'valid':>7}")
+    for variant, stats in report.items():
+        print(f"{variant:<10} {str(stats['version']):<10} {stats['estimated_input_tokens']:>11.0f} "
+              f"{stats['static_system_tokens']:>11.0f} {cell(stats.get('input_tokens'), '.0f'):>8} "
+              f"{cell(stats.get('output_tokens'), '.0f'):>8} {stats.get('savings', 0.0):>8.1%} "
+              f"{cell(stats.get('checks', {}).get('valid'), '.0%'):>7}")
+    if args.generate:
+        print("\nPass rate per check:")
+        for variant, stats in report.items():
+            checks = ", ".join(f"{code} {rate:.0%}" for code, rate in stats["checks"].items() if code != "valid")
+            print(f"  {variant}: {checks}")
+
+    if args.json:
+        Path(args.json).write_text(json.dumps(report, indent=2))
+    for failure in failed:
+        print(f"❌ {failure}", file=sys.stderr)
+    sys.exit(1 if failed else 0)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,82 @@
+#!/usr/bin/env python3
+"""
+Render throughput benchmark for SimplePDFGenerator.
+
+Compares letters/second when a fresh generator is built for every letter
+(the previous behaviour, where styles and templates were rebuilt per call)
+against a single generator whose render context is reused across the batch.
+
+Usage:
+    python benchmarks/render_throughput.py --letters 200
+"""
+
+import argparse
+import os
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+# Add app directory to path
+sys.path.append(os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "app"))
+
+from utils import simple_pdf_generator
+from utils.simple_pdf_generator import SimplePDFGenerator
+
+SAMPLE_LETTER = "\n\n".join([
+    "Dear Hiring Manager,",
+    "I am writing to express my interest in the Data Analyst position at your company. " * 3,
+    "In my previous role I built reporting pipelines that cut turnaround time by 40%. " * 4,
+    "I am proficient in Python, SQL and modern visualisation tooling. " * 3,
+    "Thank you for considering my application. I look forward to discussing it further.",
+    "Sincerely,",
+    "Jane Doe",
+])
+
+
+def backends() -> list:
+    """Return the render backends that can run in this environment."""
+    available = ["html"]
+    if simple_pdf_generator.HAS_REPORTLAB:
+        available.append("reportlab")
+    if simple_pdf_generator.HAS_FPDF:
+        available.append("fpdf")
+    return available
+
+
+def measure(backend: str, letters: int, output_dir: Path, shared: bool) -> float:
+    """
+    Render `letters` letters and return the throughput in letters/second.
+
+    Args:
+        backend: SimplePDFGenerator backend name
+        letters: Number of letters to render
+        output_dir: Folder receiving the rendered files
+        shared: Reuse one generator (True) or build one per letter (False)
+    """
+    generator = SimplePDFGenerator(backend)
+    start = time.perf_counter()
+    for i in range(letters):
+        if not shared:
+            generator = SimplePDFGenerator(backend)
+        generator.generate_pdf(f"Application {i}", SAMPLE_LETTER, output_dir / f"letter_{i}")
+    elapsed = time.perf_counter() - start
+    return letters / elapsed if elapsed else float("inf")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--letters", type=int, default=100, help="Letters rendered per measurement")
+    args = parser.parse_args()
+
+    print(f"{'backend':<10} {'per-letter setup':>18} {'shared context':>16} {'speedup':>8}")
+    with tempfile.TemporaryDirectory() as tmp:
+        output_dir = Path(tmp)
+        for name in backends():
+            before = measure(name, args.letters, output_dir, shared=False)
+            after = measure(name, args.letters, output_dir, shared=True)
+            print(f"{name:<10} {before:>12.1f} l/s {after:>10.1f} l/s {after / before:>7.2f}x")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,421 @@
+#!/usr/bin/env python3
+"""
+Local stand-ins for the Groq API and for job boards, for load tests.
+
+The LLM stub speaks the OpenAI/Groq chat-completions protocol used by
+ChatGroq (POST /openai/v1/chat/completions): it sleeps for a latency drawn
+from a configurable distribution, can answer 429 (randomly or above a
+requests-per-minute ceiling), and answers tool calls with arguments built
+from the requested JSON schema, so structured output parses as usual.
+
+It also implements the batch API used by `cli.py --batch`: uploaded JSONL
+request files (POST /openai/v1/files) are processed in the background once a
+batch is created (POST /openai/v1/batches), taking --batch-duration seconds,
+and their results are served as JSONL files, as by the provider.
+
+The job-board stub serves synthetic postings at /job/<id>.
+
+Point the app at the LLM stub with GROQ_BASE_URL=http://127.0.0.1:<port>.
+
+Usage:
+    python benchmarks/stubs.py --llm-port 8100 --board-port 8200 --latency lognormal:1.5,0.4 --error-rate 0.05
+"""
+
+import argparse
+import email.parser
+import email.policy
+import json
+import math
+import random
+import threading
+import time
+import uuid
+from collections import deque
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Callable, Optional
+
+LETTER_BODY = (
+    "Dear Hiring Manager,\n\n"
+    "I am writing to express my interest in this position. {filler}\n\n"
+    "In my previous role I delivered reporting pipelines and dashboards used across the company. {filler}\n\n"
+    "I am proficient in Python, SQL and modern visualisation tooling. {filler}\n\n"
+    "Thank you for considering my application. I look forward to discussing it further.\n\n"
+    "Sincerely,\nJane Doe"
+)
+
+POSTING = (
+    "We are looking for a {role} to join our team in Brussels. The role requires experience with "
+    "SQL and Python, strong communication skills and the ability to work with the product team. "
+    "Responsibilities include building dashboards, maintaining data pipelines and presenting results. "
+)
+
+ROLES = ["Data Analyst", "Data Engineer", "Backend Developer", "Product Analyst", "ML Engineer"]
+
+
+def parse_latency(spec: str) -> Callable[[], float]:
+    """
+    Build a latency sampler (seconds) from a spec.
+
+    Supported specs: "constant:S", "uniform:LOW,HIGH", "lognormal:MEDIAN,SIGMA",
+    "normal:MEAN,STDDEV" (truncated at 0).
+    """
+    kind, _, params = spec.partition(":")
+    values = [float(value) for value in params.split(",") if value]
+    if kind == "constant":
+        return lambda: values[0]
+    if kind == "uniform":
+        return lambda: random.uniform(values[0], values[1])
+    if kind == "lognormal":
+        return lambda: random.lognormvariate(math.log(values[0]), values[1])
+    if kind == "normal":
+        return lambda: max(0.0, random.gauss(values[0], values[1]))
+    raise ValueError(f"Unknown latency distribution: {spec}")
+
+
+def value_for_schema(name: str, schema: dict):
+    """Synthetic value matching a JSON schema property."""
+    kind = schema.get("type")
+    if kind == "string":
+        if name == "content":
+            return LETTER_BODY.format(filler="I enjoy turning data into decisions. " * 3)
+        if name == "title":
+            return f"Application for {random.choice(ROLES)} position"
+        return f"{name} value"
+    if kind == "integer":
+        return 1
+    if kind == "number":
+        return 1.0
+    if kind == "boolean":
+        return True
+    if kind == "array":
+        return [value_for_schema(name, schema.get("items", {}))]
+    if kind == "object":
+        return {key: value_for_schema(key, sub) for key, sub in schema.get("properties", {}).items()}
+    return None
+
+
+class LLMStubState:
+    """Configuration and counters shared by the LLM stub handler threads."""
+
+    def __init__(self, latency: str = "constant:0.2", error_rate: float = 0.0,
+                 requests_per_minute: int = 0, retry_after: float = 1.0, batch_duration: float = 2.0):
+        self.sample_latency = parse_latency(latency)
+        self.error_rate = error_rate
+        self.requests_per_minute = requests_per_minute
+        self.retry_after = retry_after
+        self.batch_duration = batch_duration
+        self.lock = threading.Lock()
+        self.starts = deque()
+        self.requests = 0
+        self.completed = 0
+        self.rate_limited = 0
+        # Batch API: uploaded and result files (id -> bytes) and batch objects (id -> dict)
+        self.files = {}
+        self.batches = {}
+        self.batch_requests = 0
+
+    def admit(self) -> bool:
+        """Count a request and decide whether it is rate limited."""
+        now = time.monotonic()
+        with self.lock:
+            self.requests += 1
+            while self.starts and now - self.starts[0] >= 60:
+                self.starts.popleft()
+            limited = random.random() < self.error_rate or (
+                self.requests_per_minute and len(self.starts) >= self.requests_per_minute
+            )
+            if limited:
+                self.rate_limited += 1
+            else:
+                self.starts.append(now)
+            return not limited
+
+    def stats(self) -> dict:
+        with self.lock:
+            return {"requests": self.requests, "completed": self.completed, "rate_limited": self.rate_limited,
+                    "batches": len(self.batches), "batch_requests": self.batch_requests}
+
+    def run_batch(self, batch: dict) -> None:
+        """
+        Process a batch in the background: every line is answered like a chat completion
+        (failing with status 500 at `error_rate`), spread over `batch_duration` seconds.
+        """
+        lines = [json.loads(line) for line in self.files[batch["input_file_id"]].splitlines() if line.strip()]
+        with self.lock:
+            batch.update(status="in_progress", in_progress_at=int(time.time()))
+            batch["request_counts"]["total"] = len(lines)
+        outputs, errors = [], []
+        for line in lines:
+            time.sleep(self.batch_duration / max(len(lines), 1))
+            if batch["status"] == "cancelling":
+                break
+            result = {"id": f"batch_req_{uuid.uuid4().hex[:12]}", "custom_id": line.get("custom_id")}
+            with self.lock:
+                self.batch_requests += 1
+                if random.random() < self.error_rate:
+                    errors.append({**result, "response": {"status_code": 500, "body": {
+                        "error": {"message": "Internal error (stub)", "type": "server_error"}}}, "error": None})
+                    batch["request_counts"]["failed"] += 1
+                else:
+                    outputs.append({**result, "response": {
+                        "status_code": 200, "body": LLMStubHandler.completion(line["body"])}, "error": None})
+                    batch["request_counts"]["completed"] += 1
+
+        with self.lock:
+            for key, results in (("output_file_id", outputs), ("error_file_id", errors)):
+                if results:
+                    file_id = f"file_{uuid.uuid4().hex[:24]}"
+                    self.files[file_id] = "".join(json.dumps(result) + "\n" for result in results).encode("utf-8")
+                    batch[key] = file_id
+            batch["status"] = "cancelled" if batch["status"] == "cancelling" else "completed"
+            batch["completed_at"] = int(time.time())
+
+
+class LLMStubHandler(BaseHTTPRequestHandler):
+    """Groq/OpenAI chat-completions endpoint."""
+
+    protocol_version = "HTTP/1.1"
+    state: LLMStubState = None
+
+    def _send_json(self, status: int, payload: dict, headers: Optional[dict] = None) -> None:
+        body = json.dumps(payload).encode("utf-8")
+        self.send_response(status)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(body)))
+        for key, value in (headers or {}).items():
+            self.send_header(key, value)
+        self.end_headers()
+        self.wfile.write(body)
+
+    def do_GET(self):
+        path = self.path.rstrip("/")
+        state = self.state
+        if path.endswith("/models"):
+            self._send_json(200, {"object": "list", "data": [{"id": "stub", "object": "model"}]})
+        elif "/batches/" in path:
+            batch = state.batches.get(path.rsplit("/", 1)[-1])
+            if batch is None:
+                self._send_json(404, {"error": {"message": "No such batch"}})
+            else:
+                with state.lock:
+                    self._send_json(200, batch)
+        elif "/files/" in path and path.endswith("/content"):
+            content = state.files.get(path.split("/files/", 1)[1].split("/", 1)[0])
+            if content is None:
+                self._send_json(404, {"error": {"message": "No such file"}})
+                return
+            self.send_response(200)
+            self.send_header("Content-Type", "application/octet-stream")
+            self.send_header("Content-Length", str(len(content)))
+            self.end_headers()
+            self.wfile.write(content)
+        else:
+            self._send_json(404, {"error": {"message": "Not found"}})
+
+    def upload_file(self, body: bytes) -> None:
+        """Store the file of a multipart upload (POST /files)."""
+        message = email.parser.BytesParser(policy=email.policy.default).parsebytes(
+            f"Content-Type: {self.headers.get('Content-Type')}\r\n\r\n".encode("latin-1") + body
+        )
+        part = next((part for part in message.iter_parts() if part.get_param("name", header="content-disposition")
+                     == "file"), None) if message.is_multipart() else None
+        if part is None:
+            self._send_json(400, {"error": {"message": "Missing file"}})
+            return
+        content = part.get_payload(decode=True)
+        file_id = f"file_{uuid.uuid4().hex[:24]}"
+        with self.state.lock:
+            self.state.files[file_id] = content
+        self._send_json(200, {"id": file_id, "object": "file", "bytes": len(content), "purpose": "batch",
+                              "filename": part.get_filename(), "created_at": int(time.time())})
+
+    def create_batch(self, request: dict) -> None:
+        """Start processing an uploaded file (POST /batches)."""
+        state = self.state
+        if request.get("input_file_id") not in state.files:
+            self._send_json(400, {"error": {"message": "Unknown input_file_id"}})
+            return
+        batch = {
+            "id": f"batch_{uuid.uuid4().hex[:24]}",
+            "object": "batch",
+            "endpoint": request.get("endpoint"),
+            "input_file_id": request["input_file_id"],
+            "completion_window": request.get("completion_window", "24h"),
+            "status": "validating",
+            "output_file_id": None,
+            "error_file_id": None,
+            "created_at": int(time.time()),
+            "request_counts": {"total": 0, "completed": 0, "failed": 0},
+        }
+        with state.lock:
+            state.batches[batch["id"]] = batch
+        threading.Thread(target=state.run_batch, args=(batch,), daemon=True).start()
+        self._send_json(200, batch)
+
+    def do_POST(self):
+        length = int(self.headers.get("Content-Length", 0))
+        body = self.rfile.read(length)
+        path = self.path.rstrip("/")
+        if path.endswith("/files"):
+            self.upload_file(body)
+            return
+        request = json.loads(body or b"{}")
+        if path.endswith("/batches"):
+            self.create_batch(request)
+            return
+        if path.endswith("/cancel") and "/batches/" in path:
+            batch = self.state.batches.get(path.rsplit("/", 2)[-2])
+            if batch is None:
+                self._send_json(404, {"error": {"message": "No such batch"}})
+                return
+            with self.state.lock:
+                if batch["status"] not in ("completed", "failed", "expired", "cancelled"):
+                    batch["status"] = "cancelling"
+                self._send_json(200, batch)
+            return
+        if not path.endswith("/chat/completions"):
+            self._send_json(404, {"error": {"message": "Not found"}})
+            return
+
+        state = self.state
+        if not state.admit():
+            self._send_json(429, {"error": {
+                "message": "Rate limit reached (stub)", "type": "tokens", "code": "rate_limit_exceeded"
+            }}, headers={"retry-after": str(state.retry_after)})
+            return
+
+        time.sleep(state.sample_latency())
+        self._send_json(200, self.completion(request))
+        with state.lock:
+            state.completed += 1
+
+    @staticmethod
+    def completion(request: dict) -> dict:
+        """Build a chat completion, answering with a tool call when tools are requested."""
+        prompt_tokens = len(json.dumps(request.get("messages", []))) // 4
+        message = {"role": "assistant", "content": None}
+        tools = request.get("tools") or []
+        if tools:
+            function = tools[0]["function"]
+            choice = request.get("tool_choice")
+            if isinstance(choice, dict):
+                wanted = choice.get("function", {}).get("name")
+                function = next((tool["function"] for tool in tools if tool["function"]["name"] == wanted), function)
+            arguments = value_for_schema("", {"type": "object", **function.get("parameters", {})})
+            message["tool_calls"] = [{
+                "id": f"call_{uuid.uuid4().hex[:12]}",
+                "type": "function",
+                "function": {"name": function["name"], "arguments": json.dumps(arguments)},
+            }]
+            finish_reason = "tool_calls"
+            completion_tokens = len(message["tool_calls"][0]["function"]["arguments"]) // 4
+        else:
+            message["content"] = LETTER_BODY.format(filler="")
+            finish_reason = "stop"
+            completion_tokens = len(message["content"]) // 4
+        return {
+            "id": f"chatcmpl-{uuid.uuid4().hex}",
+            "object": "chat.completion",
+            "created": int(time.time()),
+            "model": request.get("model", "stub"),
+            "choices": [{"index": 0, "message": message, "finish_reason": finish_reason, "logprobs": None}],
+            "usage": {
+                "prompt_tokens": prompt_tokens,
+                "completion_tokens": completion_tokens,
+                "total_tokens": prompt_tokens + completion_tokens,
+            },
+        }
+
+    def log_message(self, format, *args):
+        pass
+
+
+class JobBoardHandler(BaseHTTPRequestHandler):
+    """Synthetic job postings at /job/<id>, about 3KB each."""
+
+    protocol_version = "HTTP/1.1"
+
+    def _page(self) -> Optional[bytes]:
+        if not self.path.startswith("/job/"):
+            return None
+        job_id = self.path.rsplit("/", 1)[-1]
+        role = ROLES[hash(job_id) % len(ROLES)]
+        return (f"<html><head><title>{role}</title></head><body><h1>{role}</h1>"
+                f"<p>{POSTING.format(role=role) * 10}</p></body></html>").encode("utf-8")
+
+    def _headers(self, page: Optional[bytes]) -> None:
+        self.send_response(200 if page else 404)
+        self.send_header("Content-Type", "text/html; charset=utf-8")
+        self.send_header("Content-Length", str(len(page or b"")))
+        self.end_headers()
+
+    def do_HEAD(self):
+        self._headers(self._page())
+
+    def do_GET(self):
+        page = self._page()
+        self._headers(page)
+        if page:
+            self.wfile.write(page)
+
+    def log_message(self, format, *args):
+        pass
+
+
+def serve(handler: type, port: int = 0) -> ThreadingHTTPServer:
+    """Start a threaded server on 127.0.0.1 in a daemon thread (port 0 picks a free port)."""
+    server = ThreadingHTTPServer(("127.0.0.1", port), handler)
+    server.daemon_threads = True
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    return server
+
+
+def start_llm_stub(port: int = 0, **options) -> ThreadingHTTPServer:
+    """
+    Start the LLM stub.
+
+    Args:
+        port: Listening port, 0 for a free one
+        **options: LLMStubState options (latency, error_rate, requests_per_minute, retry_after,
+            batch_duration)
+
+    Returns:
+        ThreadingHTTPServer: The server; its counters are in `server.state`.
+    """
+    state = LLMStubState(**options)
+    handler = type("BoundLLMStubHandler", (LLMStubHandler,), {"state": state})
+    server = serve(handler, port)
+    server.state = state
+    return server
+
+
+def start_job_board(port: int = 0) -> ThreadingHTTPServer:
+    """Start the job-board stub."""
+    return serve(JobBoardHandler, port)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--llm-port", type=int, default=8100)
+    parser.add_argument("--board-port", type=int, default=8200)
+    parser.add_argument("--latency", default="lognormal:1.0,0.4", help="LLM latency distribution")
+    parser.add_argument("--error-rate", type=float, default=0.0, help="Share of LLM requests answered with 429")
+    parser.add_argument("--rpm", type=int, default=0, help="Requests per minute before answering 429 (0: unlimited)")
+    parser.add_argument("--batch-duration", type=float, default=2.0, help="Seconds the stub takes to process a batch")
+    args = parser.parse_args()
+
+    llm = start_llm_stub(args.llm_port, latency=args.latency, error_rate=args.error_rate,
+                         requests_per_minute=args.rpm, batch_duration=args.batch_duration)
+    start_job_board(args.board_port)
+    print(f"LLM stub:  GROQ_BASE_URL=http://127.0.0.1:{args.llm_port}")
+    print(f"Job board: http://127.0.0.1:{args.board_port}/job/<id>")
+    try:
+        while True:
+            time.sleep(10)
+            print(llm.state.stats())
+    except KeyboardInterrupt:
+        pass
+
+
+if __name__ == "__main__":
+    main()